@@ -0,0 +1,72 @@
+import sys
+import json
+import argparse
+from typing import Any, Optional
+from .recorder import METRICS
+
+# changes smaller than this are noise, whatever the relative change
+MIN_DELTA = {
+    'wall_ms': 5,
+    'roundtrips': 0,
+    'rss_mb': 20,
+}
+
+
+def load(path: str) -> dict[str, dict[str, Any]]:
+    with open(path) as f:
+        return json.load(f)['benchmarks']
+
+
+def compare(
+        baseline: dict[str, dict[str, Any]],
+        current: dict[str, dict[str, Any]],
+        threshold: float,
+        metrics: tuple[str, ...] = METRICS
+) -> tuple[list[tuple[str, str, Any, Any, Optional[float], bool]], int]:
+    """
+    :param threshold: allowed relative increase, 0.2 = 20%
+    :return: rows of (benchmark, metric, baseline, current, change, regressed) and the regressions count
+    """
+    rows = []
+    regressions = 0
+    for name in sorted(baseline.keys() | current.keys()):
+        for metric in metrics:
+            before = baseline.get(name, {}).get(metric)
+            after = current.get(name, {}).get(metric)
+            if before is None or after is None:
+                rows.append((name, metric, before, after, None, False))
+                continue
+
+            change = (after - before) / before if before else (0.0 if after == before else float('inf'))
+            regressed = change > threshold and after - before > MIN_DELTA[metric]
+            regressions += regressed
+            rows.append((name, metric, before, after, change, regressed))
+    return rows, regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='compares a benchmark run with a baseline, fails on regressions')
+    parser.add_argument('baseline', help='baseline json, e.g. benchmarks/baselines/chromium.json')
+    parser.add_argument('current', help='json written by the benchmark run, e.g. benchmarks/results/latest.json')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative increase, 0.2 = 20%%')
+    parser.add_argument('--metric', action='append', choices=METRICS, help='metrics to compare, all by default')
+    args = parser.parse_args(argv)
+
+    rows, regressions = compare(load(args.baseline), load(args.current), args.threshold, tuple(args.metric or METRICS))
+
+    width = max([len(row[0]) for row in rows] + [9])
+    print(f"{'benchmark':<{width}}  {'metric':<10} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, metric, before, after, change, regressed in rows:
+        if change is None:
+            status = '-' if before is None and after is None else 'new' if before is None else 'missing'
+            print(f'{name:<{width}}  {metric:<10} {str(before):>10} {str(after):>10} {status:>8}')
+            continue
+        flag = '  REGRESSION' if regressed else ''
+        print(f'{name:<{width}}  {metric:<10} {before:>10} {after:>10} {change:>+8.1%}{flag}')
+
+    print(f'\n{regressions} regressions (threshold {args.threshold:.0%})')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+
+import os
+import pytest
+import tempfile
+from pathlib import Path
+from typing import Generator
+from src.extended_pytest_playwright import create_extended_options, artifact_writer
+from src.local_site import LocalAirbnbServer, add_local_site_options
+from .recorder import BenchmarkRecorder
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+# --------------------------------------------------- FIXTURES ---------------------------------------------------------
+
+@pytest.fixture(scope='session')
+def base_url(pytestconfig: pytest.Config) -> Generator[str, None, None]:
+    # benchmarks always run against the deterministic local site
+    server = LocalAirbnbServer(
+        results=pytestconfig.getoption('--local-site-results'),
+        latency_ms=pytestconfig.getoption('--local-site-latency')
+    )
+    yield server.start()
+    server.stop()
+
+
+@pytest.fixture(scope='session')
+def recorder(pytestconfig: pytest.Config) -> Generator[BenchmarkRecorder, None, None]:
+    bench_recorder = BenchmarkRecorder(rounds=pytestconfig.getoption('--benchmark-rounds'))
+    yield bench_recorder
+    try:
+        artifact_writer.close()
+    finally:
+        # the benchmarks that passed are written even when others failed
+        bench_recorder.write(pytestconfig.getoption('--benchmark-output'))
+
+
+@pytest.fixture(scope='session')
+def video_folder() -> Generator[str, None, None]:
+    with tempfile.TemporaryDirectory(prefix='benchmark-videos-') as folder:
+        yield folder
+
+
+# ------------------------------------------------HOOKS-----------------------------------------------------------------
+def pytest_addoption(parser: pytest.Parser) -> None:
+    create_extended_options(parser)
+    add_local_site_options(parser)
+    group = parser.getgroup("benchmarks", "Benchmarks")
+    group.addoption(
+        '--benchmark-rounds',
+        action='store',
+        type=int,
+        default=5
+    )
+    group.addoption(
+        '--benchmark-output',
+        action='store',
+        default=str(ROOT / 'benchmarks' / 'results' / 'latest.json')
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # artifacts of the context benchmarks go to a throwaway folder
+    if config.getoption('--root-folder') is None:
+        config.option.root_folder = str(ROOT)
+    config.option.output = os.path.join(tempfile.gettempdir(), 'benchmark-artifacts')
+    if not config.getoption('--viewport'):
+        config.option.viewport = [[1600, 900]]
@@ -0,0 +1,88 @@
+import os
+import sys
+import json
+import time
+import platform
+from statistics import median
+from typing import Any, Callable, Optional
+from importlib.metadata import version
+from src.extended_pytest_playwright.roundtrip_profiler import count_roundtrips
+from src.extended_pytest_playwright.resources import get_process_tree_rss_mb, get_process_rss_mb
+
+# every metric is "lower is better"
+METRICS = ('wall_ms', 'roundtrips', 'rss_mb')
+
+
+def get_rss_mb() -> Optional[float]:
+    """this process plus its descendants (playwright driver, browsers, local site is a thread)"""
+    tree = get_process_tree_rss_mb(os.getpid())
+    if tree is None:
+        return None
+    return get_process_rss_mb(os.getpid()) + tree
+
+
+class BenchmarkRecorder:
+    """
+    runs each benchmark for a number of rounds and keeps the median wall time / round trips
+    and the peak rss, written as one json file per session (a baseline, or a run to compare)
+    """
+
+    def __init__(self, rounds: int):
+        self.rounds = rounds
+        self.results: dict[str, dict[str, Any]] = {}
+
+    def measure(
+            self,
+            name: str,
+            func: Callable[[], Any],
+            setup: Optional[Callable[[], Any]] = None,
+            teardown: Optional[Callable[[], Any]] = None,
+            rounds: Optional[int] = None
+    ) -> dict[str, Any]:
+        """
+        :param func: the measured code
+        :param setup: runs before every round, not measured
+        :param teardown: runs after every round, also a failing one, not measured
+        """
+        walls, roundtrips, rss = [], [], []
+        for _ in range(rounds or self.rounds):
+            if setup:
+                setup()
+            try:
+                with count_roundtrips() as profiler:
+                    started = time.perf_counter()
+                    try:
+                        func()
+                    finally:
+                        walls.append((time.perf_counter() - started) * 1000)
+                roundtrips.append(profiler.summary()['calls'])
+                rss.append(get_rss_mb())
+            finally:
+                # a failing round still closes what its setup opened (e.g. the context of FlowSession.new)
+                if teardown:
+                    teardown()
+
+        rss = [value for value in rss if value is not None]
+        result = {
+            'wall_ms': round(median(walls), 1),
+            'roundtrips': median(roundtrips),
+            'rss_mb': round(max(rss), 1) if rss else None,
+            'rounds': len(walls),
+            'wall_ms_samples': [round(value, 1) for value in walls]
+        }
+        self.results[name] = result
+        return result
+
+    def write(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'environment': {
+                    'python': platform.python_version(),
+                    'playwright': version('playwright'),
+                    'platform': sys.platform,
+                    'cpus': os.cpu_count()
+                },
+                'benchmarks': self.results
+            }, f, indent=4)
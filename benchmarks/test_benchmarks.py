@@ -0,0 +1,203 @@
+import pytest
+from pathlib import Path
+from playwright.sync_api import Browser
+from src.airbnb_manager import AirbnbManager
+from src.extended_pytest_playwright import (
+    init_context,
+    handle_artifacts,
+    artifact_writer,
+    PlaywrightPytestRunner,
+    RunTestObject,
+    RunTestBy,
+    RunMode
+)
+from pytest_configurations import configurations
+from tests.test_airbnb_flows import QUERY, TODAY, TOMORROW, LOCATION, ADULTS, CHILDREN, RESULT_TABS
+from .recorder import BenchmarkRecorder
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (tracing, video, screenshot), one mode at a time against everything off, and everything on
+ARTIFACT_MODES = [
+    ('off', 'off', 'off'),
+    ('on', 'off', 'off'),
+    ('retain-on-failure', 'off', 'off'),
+    ('off', 'on', 'off'),
+    ('off', 'retain-on-failure', 'off'),
+    ('off', 'off', 'on'),
+    ('off', 'off', 'only-on-failure'),
+    ('on', 'on', 'on'),
+]
+
+
+class FlowSession:
+    """a fresh context and manager per round, created and closed outside of the measured code"""
+
+    def __init__(self, browser: Browser, context_args: dict, base_url: str):
+        self.browser = browser
+        self.context_args = context_args
+        self.base_url = base_url
+        self.manager: AirbnbManager | None = None
+
+    def new(self) -> None:
+        context = self.browser.new_context(**self.context_args)
+        self.manager = AirbnbManager(context.new_page(), self.base_url)
+
+    def new_on_results(self) -> None:
+        self.new()
+        open_results(self.manager)
+
+    def close(self) -> None:
+        self.manager.page.context.close()
+        self.manager = None
+
+
+@pytest.fixture
+def context_args(browser_context_args: dict, pytestconfig: pytest.Config) -> dict:
+    width, height = pytestconfig.getoption('--viewport')[0]
+    args = {key: value for key, value in browser_context_args.items() if not key.startswith('record_video')}
+    return dict(**args, viewport={'width': int(width), 'height': int(height)})
+
+
+@pytest.fixture
+def flows(browser: Browser, context_args: dict, base_url: str) -> FlowSession:
+    return FlowSession(browser, context_args, base_url)
+
+
+def open_results(m: AirbnbManager) -> None:
+    # the before_each_test fixture of tests/test_airbnb_flows.py
+    m.results_page.open(QUERY)
+    m.results_page.validate_navigation_to_results_page(check_in=TODAY, check_out=TOMORROW, location=LOCATION)
+    m.results_page.assert_guests_in_url_link(adults=ADULTS, children=CHILDREN)
+
+
+def search_from_home(m: AirbnbManager) -> None:
+    # the before_each_search_bar_test fixture of tests/test_airbnb_flows.py
+    search = m.home_page.search_bar
+    m.home_page.navigate_to_homepage()
+    search.search_destination(LOCATION)
+    search.insert_dates(check_in=TODAY, check_out=TOMORROW)
+    search.add_guests(guests='adults', action='increase', quantity=ADULTS)
+    search.add_guests(guests='children', action='increase', quantity=CHILDREN)
+    search.click_search_button()
+    m.results_page.validate_navigation_to_results_page(check_in=TODAY, check_out=TOMORROW, location=LOCATION)
+
+
+def book_highest_listing(m: AirbnbManager) -> None:
+    m.results_page.get_highest_listing_flow(tabs=RESULT_TABS)
+    m.apartment_page.check_for_translation_popup()
+    m.apartment_page.validate_navigation_to_apartment_page()
+    m.apartment_page.click_reserve_button()
+    m.reservation_page.wait_for_page_to_load()
+    m.reservation_page.assert_reservation_page_url()
+    m.reservation_page.assert_adults_count_in_url(count=ADULTS)
+
+
+# ------------------------------------------------ FLOWS ---------------------------------------------------------------
+
+def test_before_each_test(recorder: BenchmarkRecorder, flows: FlowSession, browser_name: str):
+    recorder.measure(
+        f'before_each_test[{browser_name}]',
+        lambda: open_results(flows.manager),
+        setup=flows.new,
+        teardown=flows.close
+    )
+
+
+def test_search_bar_setup(recorder: BenchmarkRecorder, flows: FlowSession, browser_name: str):
+    recorder.measure(
+        f'search_bar_setup[{browser_name}]',
+        lambda: search_from_home(flows.manager),
+        setup=flows.new,
+        teardown=flows.close
+    )
+
+
+@pytest.mark.parametrize('tabs', [1, RESULT_TABS])
+def test_get_highest_score_listing(recorder: BenchmarkRecorder, flows: FlowSession, browser_name: str, tabs: int):
+    recorder.measure(
+        f'get_highest_score_listing[{browser_name}-tabs{tabs}]',
+        lambda: flows.manager.results_page.get_highest_score_listing(tabs=tabs),
+        setup=flows.new_on_results,
+        teardown=flows.close
+    )
+
+
+def test_booking_reservation(recorder: BenchmarkRecorder, flows: FlowSession, browser_name: str):
+    recorder.measure(
+        f'booking_reservation[{browser_name}]',
+        lambda: book_highest_listing(flows.manager),
+        setup=flows.new_on_results,
+        teardown=flows.close
+    )
+
+
+# ------------------------------------------------ FRAMEWORK -----------------------------------------------------------
+
+@pytest.mark.parametrize('tracing, video, screenshot', ARTIFACT_MODES)
+def test_context_lifecycle(
+        recorder: BenchmarkRecorder,
+        browser: Browser,
+        browser_name: str,
+        context_args: dict,
+        pytestconfig: pytest.Config,
+        request: pytest.FixtureRequest,
+        monkeypatch: pytest.MonkeyPatch,
+        video_folder: str,
+        tracing: str,
+        video: str,
+        screenshot: str
+):
+    monkeypatch.setattr(pytestconfig.option, 'tracing', tracing)
+    monkeypatch.setattr(pytestconfig.option, 'video', video)
+    monkeypatch.setattr(pytestconfig.option, 'screenshot', screenshot)
+
+    args = {key: value for key, value in context_args.items() if key != 'viewport'}
+    if video != 'off':
+        args['record_video_dir'] = video_folder
+
+    def lifecycle() -> None:
+        # init_context and handle_artifacts of a passed test that opened one page
+        context, pages = init_context(browser, args, pytestconfig, request, browser_name)
+        context.new_page().goto('/')
+        handle_artifacts(context, pytestconfig, request, pages, test_setup_result='passed')
+
+    recorder.measure(
+        f'context_lifecycle[{browser_name}-{tracing}-{video}-{screenshot}]',
+        lifecycle,
+        # the background writer is drained between rounds, its work is not part of the test's teardown
+        teardown=artifact_writer.flush
+    )
+
+
+class CollectOnlyRunner(PlaywrightPytestRunner):
+    """the runner of pytest_runner.py (option building, run modes, sessions), its sessions only collect"""
+
+    collect_only_args = ['--co', '-q', '-p', 'no:cacheprovider']
+
+    def _build_pytest_args(self, test_name: str) -> list[str]:
+        return super()._build_pytest_args(test_name) + self.collect_only_args
+
+    def _build_merged_pytest_args(self) -> list[str]:
+        return super()._build_merged_pytest_args() + self.collect_only_args
+
+
+@pytest.mark.parametrize('run_mode', [RunMode.SEQUENTIAL, RunMode.CONCURRENT, RunMode.MERGED])
+def test_runner_startup(
+        recorder: BenchmarkRecorder,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        run_mode: str
+):
+    # the sessions collect the suite, no browser is launched
+    monkeypatch.chdir(ROOT)
+    config = configurations.model_copy(update={'reports_folder_pattern': tmp_path / 'pytest_reports' / 'test-report'})
+    runner = CollectOnlyRunner(
+        config,
+        RunTestObject(run_by=RunTestBy.NAME, tests=['highest_rating', 'booking'], run_mode=run_mode)
+    )
+
+    def run() -> None:
+        assert runner.run_tests() == 0
+
+    recorder.measure(f'runner_startup[{run_mode}]', run)
@@ -7,6 +7,12 @@ from src.extended_pytest_playwright import (
     BrowserChannel,
     LogCli,
     RunTestBy,
+    RunMode,
+    Scheduling,
+    Workers,
+    ResourceType,
+    NetworkMode,
+    TraceDetail,
     ViewPort,
     RunTestObject
 )
@@ -25,7 +31,13 @@ configurations = PytestConfigurationsBase(
         log_cli_level=LogCli.INFO,
         browsers=[Browser.CHROMIUM, Browser.FIREFOX, Browser.WEBKIT],
         tracing=State.ON,
+        trace_detail=TraceDetail.FULL,
+        trace_chunks=False,
+        trace_retained_chunks=1,
         video=State.ON,
+        rolling_video_seconds=0,
+        rolling_video_fps=5,
+        rolling_video_width=800,
         screenshot=State.ONLY_ON_FAILURE,
         full_page_screenshot=False,
         browser_channel=None,
@@ -36,8 +48,24 @@ configurations = PytestConfigurationsBase(
         default_timeout=15 * 1000,
         ignore_https_errors=True,
         use_storage_state=False,
+        storage_state_ttl=60 * 60,
+        context_pool=False,
+        artifact_store=False,
+        profile_roundtrips=False,
+        profile_top=10,
+        navigation_metrics=False,
+        retention_max_size=None,
+        retention_max_age=None,
+        block_resources=[],
+        block_url_patterns=[],
+        network_mode=NetworkMode.LIVE,
+        local_site=False,
+        local_site_results=60,
+        local_site_latency=0,
         clipboard_permissions=True,
         workers=3,
+        min_available_memory=None,
+        scheduling=Scheduling.LOAD,
 
         # Root and Reports Folder
         root_folder=ROOT,
@@ -46,5 +74,7 @@ configurations = PytestConfigurationsBase(
 
 tests = RunTestObject(
     run_by=RunTestBy.FILE,
-    tests=["tests/test_airbnb_flows.py"]
+    tests=["tests/test_airbnb_flows.py"],
+    run_mode=RunMode.SEQUENTIAL,
+    worker_budget=None
 )
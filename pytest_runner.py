@@ -1,11 +1,12 @@
+import sys
 from src.extended_pytest_playwright import PlaywrightPytestRunner
 from pytest_configurations import configurations, tests
 
 
-def main() -> None:
+def main() -> int:
     runner = PlaywrightPytestRunner(configurations, tests)
-    runner.run_tests()
+    return runner.run_tests()
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -1,16 +1,29 @@
 from playwright.sync_api import Page
+from .utils.page_scoped import PageScoped
 from .page_objects.home_page import HomePage
 from .page_objects.results_page import ResultsPage
 from .page_objects.apartment_page import ApartmentPage
 from .page_objects.reservation_page import ReservationPage
+from .utils.urls import set_base_url
 
 
 class AirbnbManager:
 
-    def __init__(self, page: Page):
+    # page objects are built on first use, once per page
+    home_page = PageScoped(HomePage)
+    results_page = PageScoped(ResultsPage)
+    apartment_page = PageScoped(ApartmentPage)
+    reservation_page = PageScoped(ReservationPage)
+
+    def __init__(self, page: Page, base_url: str | None = None):
         self.page = page
+        if base_url:
+            set_base_url(page.context, base_url)
+
+    def prepare_session(self, username: str | None = None, password: str | None = None) -> None:
+        # the consent / login state that is cached by --use-storage-state
+        self.home_page.navigate_to_homepage()
+        self.home_page.accept_cookies_banner()
 
-        self.home_page = HomePage(page)
-        self.results_page = ResultsPage(page)
-        self.apartment_page = ApartmentPage(page)
-        self.reservation_page = ReservationPage(page)
+        if username and password:
+            self.home_page.login(username, password)
@@ -5,7 +5,13 @@ from .constants import (
     Browser,
     BrowserChannel,
     LogCli,
-    RunTestBy
+    RunTestBy,
+    RunMode,
+    Scheduling,
+    Workers,
+    ResourceType,
+    NetworkMode,
+    TraceDetail
 )
 from .plugin_methods import (
     handle_artifacts,
@@ -13,3 +19,25 @@ from .plugin_methods import (
     init_context,
     create_extended_options
 )
+from .scheduling import (
+    make_xdist_scheduler,
+    load_historical_durations,
+    get_browser_from_nodeid,
+    DurationScheduling,
+    BrowserScheduling
+)
+from .resources import (
+    calculate_auto_workers,
+    handle_memory_pressure,
+    measure_engine_rss,
+    flush_engine_rss
+)
+from .context_pool import ContextPool, context_pool
+from .storage_state import get_cached_storage_state, get_storage_state_path, file_lock
+from .network import ResourceBlocker, network_summary
+from .artifact_writer import ArtifactWriter, artifact_writer, artifact_writer_summary, finish_artifact_writer
+from .artifact_store import ArtifactStore, get_artifact_store, finish_artifact_store
+from .step_tracing import StepTracer, get_step_tracer
+from .roundtrip_profiler import RoundTripProfiler, roundtrip_summary, count_roundtrips
+from .navigation_metrics import NavigationCollector, navigation_metrics, get_navigation_collector, load_navigation_metrics
+from .rolling_video import RollingScreencast, find_ffmpeg
@@ -0,0 +1,329 @@
+
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import hashlib
+import logging
+import argparse
+import json
+import pytest
+from typing import Any, Optional
+
+ARTIFACT_STORE_FOLDER_NAME = '.artifacts'
+INDEX_FILE_NAME = 'index.sqlite'
+
+# runs indexed after this process started belong to this session (or a concurrent one) and are never pruned
+_process_started = time.time()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    run TEXT NOT NULL,
+    test TEXT NOT NULL,
+    status TEXT NOT NULL,
+    path TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    PRIMARY KEY (run, path)
+);
+CREATE INDEX IF NOT EXISTS artifacts_test ON artifacts (test);
+CREATE INDEX IF NOT EXISTS artifacts_digest ON artifacts (digest);
+"""
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """
+    content addressed store for test artifacts, shared by every run under the history folder.
+    each file is stored once as blobs/<2 chars>/<sha256>, and the file in the test artifacts folder
+    becomes a hard link to that blob, so the reports folders stay browsable while identical
+    screenshots / traces / videos take the disk space once.
+    an sqlite index maps run + test to the stored files, to find a test's artifacts across runs
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.history_folder = os.path.dirname(os.path.abspath(root))
+        self.blobs_folder = os.path.join(root, 'blobs')
+        self.index_path = os.path.join(root, INDEX_FILE_NAME)
+
+    @staticmethod
+    def log(msg: str) -> None:
+        logging.info(f'[Artifact Store] {msg}')
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(self.root, exist_ok=True)
+        # xdist workers write to the same index, sqlite serializes them
+        connection = sqlite3.connect(self.index_path, timeout=60)
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def run_id(self, run_folder: str) -> str:
+        # relative to the history folder, run folders may be nested (test-report-tests/<file>-<date>)
+        # and runs of different tests may share a folder name
+        path = os.path.abspath(run_folder)
+        relative = os.path.relpath(path, self.history_folder)
+        return path if relative.startswith(os.pardir) else relative.replace(os.sep, '/')
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blobs_folder, digest[:2], digest)
+
+    def put(self, path: str) -> str:
+        """stores the file as a blob and replaces it with a hard link to the blob, returns the digest"""
+        digest = hash_file(path)
+        blob_path = self._blob_path(digest)
+
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f'{blob_path}.{os.getpid()}.tmp'
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, blob_path)
+
+        tmp_link = f'{path}.link'
+        try:
+            os.link(blob_path, tmp_link)
+            os.replace(tmp_link, path)
+        except OSError:
+            # another filesystem or no hard links, the copy in the reports folder stays as it is
+            pass
+        return digest
+
+    def add(self, run_folder: str, folder: str, manifest: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        stores the files of one test and indexes them under the run
+
+        :param run_folder: the reports folder of the run (--output)
+        :param folder: the test artifacts folder
+        :param manifest: test, status and file names
+        :return: the manifest file entries, with digests
+        """
+        run = self.run_id(run_folder)
+        entries = []
+        rows = []
+        for name in manifest.get('files', []):
+            path = os.path.join(folder, name)
+            if not os.path.exists(path):
+                continue
+            digest = self.put(path)
+            size = os.path.getsize(path)
+            entries.append({'name': name, 'bytes': size, 'sha256': digest})
+            rows.append((run, manifest['test'], manifest['status'], os.path.relpath(path, run_folder), digest, size))
+
+        with self._connect() as connection:
+            connection.execute(
+                'INSERT OR IGNORE INTO runs (run, folder, created) VALUES (?, ?, ?)',
+                (run, os.path.abspath(run_folder), time.time())
+            )
+            connection.executemany('INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?)', rows)
+        connection.close()
+        return entries
+
+    def find(self, test: str) -> list[dict[str, Any]]:
+        """artifacts of every test whose node id contains `test`, newest run first"""
+        if not os.path.exists(self.index_path):
+            return []
+
+        connection = self._connect()
+        connection.row_factory = sqlite3.Row
+        rows = connection.execute(
+            'SELECT a.run, a.test, a.status, a.bytes, a.digest, r.folder, a.path, r.created '
+            'FROM artifacts a JOIN runs r ON a.run = r.run '
+            'WHERE instr(a.test, ?) > 0 ORDER BY r.created DESC, a.test, a.path',
+            (test,)
+        ).fetchall()
+        connection.close()
+        return [
+            {
+                'run': row['run'],
+                'test': row['test'],
+                'status': row['status'],
+                'path': os.path.join(row['folder'], row['path']),
+                'bytes': row['bytes'],
+                'sha256': row['digest']
+            } for row in rows
+        ]
+
+    def write_run_manifest(self, run_folder: str) -> Optional[str]:
+        """writes <run folder>/artifacts.json, every test of the run with its stored files"""
+        if not os.path.exists(self.index_path):
+            return None
+
+        run = self.run_id(run_folder)
+        connection = self._connect()
+        rows = connection.execute(
+            'SELECT test, status, path, bytes, digest FROM artifacts WHERE run = ? ORDER BY test, path',
+            (run,)
+        ).fetchall()
+        connection.close()
+        if not rows:
+            return None
+
+        tests: dict[str, dict[str, Any]] = {}
+        for test, status, path, size, digest in rows:
+            entry = tests.setdefault(test, {'status': status, 'files': []})
+            entry['files'].append({'path': path, 'bytes': size, 'sha256': digest})
+
+        manifest_path = os.path.join(run_folder, 'artifacts.json')
+        with open(manifest_path, 'w') as f:
+            json.dump({'run': run, 'tests': tests}, f, indent=4)
+        return manifest_path
+
+    def stored_bytes(self, connection: sqlite3.Connection) -> int:
+        row = connection.execute('SELECT SUM(bytes) FROM (SELECT DISTINCT digest, bytes FROM artifacts)').fetchone()
+        return row[0] or 0
+
+    def _remove_run(self, connection: sqlite3.Connection, run: str, folder: str) -> None:
+        # only reports folders under the history folder are ever deleted
+        if os.path.commonpath([self.history_folder, os.path.abspath(folder)]) == self.history_folder:
+            shutil.rmtree(folder, ignore_errors=True)
+            # parents left empty by a nested run folder (test-report-tests/) go too
+            parent = os.path.dirname(os.path.abspath(folder))
+            while parent != self.history_folder and os.path.isdir(parent) and not os.listdir(parent):
+                os.rmdir(parent)
+                parent = os.path.dirname(parent)
+        connection.execute('DELETE FROM artifacts WHERE run = ?', (run,))
+        connection.execute('DELETE FROM runs WHERE run = ?', (run,))
+
+    def _remove_unreferenced_blobs(self, connection: sqlite3.Connection, keep_since: float) -> int:
+        referenced = {row[0] for row in connection.execute('SELECT DISTINCT digest FROM artifacts')}
+        removed = 0
+        if not os.path.isdir(self.blobs_folder):
+            return removed
+
+        for prefix in os.listdir(self.blobs_folder):
+            prefix_folder = os.path.join(self.blobs_folder, prefix)
+            for name in os.listdir(prefix_folder):
+                blob_path = os.path.join(prefix_folder, name)
+                # a concurrent session may have stored the blob but not indexed it yet
+                if name not in referenced and os.path.getmtime(blob_path) < keep_since:
+                    os.remove(blob_path)
+                    removed += 1
+            if not os.listdir(prefix_folder):
+                os.rmdir(prefix_folder)
+        return removed
+
+    def apply_retention(
+            self,
+            max_size_mb: Optional[int] = None,
+            max_age_days: Optional[float] = None,
+            keep_since: Optional[float] = None
+    ) -> list[str]:
+        """
+        removes whole runs (the reports folder and its index rows), oldest first:
+        runs older than max_age_days, then runs until the stored blobs fit in max_size_mb.
+        runs indexed after keep_since are kept even when the budget is exceeded
+
+        :return: the removed runs
+        """
+        if not os.path.exists(self.index_path):
+            return []
+
+        keep_since = _process_started if keep_since is None else keep_since
+        removed = []
+        connection = self._connect()
+        with connection:
+            runs = connection.execute('SELECT run, folder, created FROM runs ORDER BY created').fetchall()
+            candidates = [(run, folder, created) for run, folder, created in runs if created < keep_since]
+
+            if max_age_days is not None:
+                oldest_allowed = time.time() - max_age_days * 24 * 60 * 60
+                for run, folder, created in list(candidates):
+                    if created < oldest_allowed:
+                        self._remove_run(connection, run, folder)
+                        candidates.remove((run, folder, created))
+                        removed.append(run)
+
+            if max_size_mb is not None:
+                max_bytes = max_size_mb * 1024 ** 2
+                for run, folder, _ in candidates:
+                    if self.stored_bytes(connection) <= max_bytes:
+                        break
+                    self._remove_run(connection, run, folder)
+                    removed.append(run)
+
+            blobs = self._remove_unreferenced_blobs(connection, keep_since)
+            stored_mb = self.stored_bytes(connection) / 1024 ** 2
+
+        connection.close()
+        if removed:
+            self.log(f'removed {len(removed)} runs and {blobs} blobs, {stored_mb:.1f}MB stored')
+        return removed
+
+
+_stores: dict[str, ArtifactStore] = {}
+
+
+def get_artifact_store(pytestconfig: pytest.Config) -> Optional[ArtifactStore]:
+    if not pytestconfig.getoption('--artifact-store'):
+        return None
+
+    history_folder = pytestconfig.getoption('--history-folder')
+    if not history_folder:
+        return None
+
+    root = os.path.join(history_folder, ARTIFACT_STORE_FOLDER_NAME)
+    if root not in _stores:
+        _stores[root] = ArtifactStore(root)
+    return _stores[root]
+
+
+def finish_artifact_store(config: pytest.Config) -> None:
+    """writes the run manifest and applies the retention policy, once on the controller"""
+    # xdist workers only add to the store, they are done by the time the controller session finishes
+    if hasattr(config, 'workerinput'):
+        return
+
+    store = get_artifact_store(config)
+    if store is None:
+        return
+
+    output = config.getoption('--output')
+    if output:
+        store.write_run_manifest(output)
+
+    max_size_mb = config.getoption('--retention-max-size')
+    max_age_days = config.getoption('--retention-max-age')
+    if max_size_mb is not None or max_age_days is not None:
+        store.apply_retention(max_size_mb=max_size_mb, max_age_days=max_age_days)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='find and prune stored test artifacts')
+    parser.add_argument('history_folder', help='the folder holding the run reports folders')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    find_parser = commands.add_parser('find', help='list the artifacts of a test across runs')
+    find_parser.add_argument('test', help='part of the test node id')
+
+    prune_parser = commands.add_parser('prune', help='apply the retention policy now')
+    prune_parser.add_argument('--max-size', type=int, default=None, help='MB')
+    prune_parser.add_argument('--max-age', type=float, default=None, help='days')
+
+    args = parser.parse_args(argv)
+    store = ArtifactStore(os.path.join(args.history_folder, ARTIFACT_STORE_FOLDER_NAME))
+
+    if args.command == 'find':
+        for artifact in store.find(args.test):
+            print(f"{artifact['run']}  {artifact['status']:<7} {artifact['bytes']:>10}  {artifact['path']}")
+        return 0
+
+    removed = store.apply_retention(max_size_mb=args.max_size, max_age_days=args.max_age, keep_since=time.time())
+    print(f'removed {len(removed)} runs')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
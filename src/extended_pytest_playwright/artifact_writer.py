@@ -0,0 +1,154 @@
+
+import os
+import json
+import queue
+import shutil
+import logging
+import pytest
+import threading
+from typing import Any, Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .artifact_store import ArtifactStore
+
+_STOP = object()
+# sent by every xdist worker to the controller, see finish_artifact_writer
+FAILED_JOBS_OUTPUT = 'artifact_writer_failed_jobs'
+
+
+class ArtifactWriter:
+    """
+    a per worker background writer, test teardown only hands the disk work off (writing screenshots,
+    moving videos, writing manifests). the queue is bounded, so a slow disk throttles teardown
+    instead of piling up screenshots in memory. jobs run in submission order
+    """
+
+    def __init__(self, max_queue_size: int = 64):
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.failed_jobs = 0
+        self.first_error: Optional[str] = None
+
+    @staticmethod
+    def log(msg: str) -> None:
+        logging.info(f'[Artifact Writer] {msg}')
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                job()
+            except Exception as e:
+                self.failed_jobs += 1
+                if self.first_error is None:
+                    self.first_error = f'{type(e).__name__}: {e}'
+                logging.error(f'[Artifact Writer] job failed: {e}')
+            finally:
+                self._queue.task_done()
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='artifact-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, job: Callable[[], None]) -> None:
+        self._ensure_thread()
+        self._queue.put(job)
+
+    def write_bytes(self, path: str, data: bytes) -> None:
+        def job() -> None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+        self.submit(job)
+
+    def move(self, source: str, destination: str) -> None:
+        def job() -> None:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.move(source, destination)
+        self.submit(job)
+
+    def write_manifest(
+            self,
+            folder: str,
+            manifest: dict[str, Any],
+            store: Optional['ArtifactStore'] = None,
+            run_folder: Optional[str] = None
+    ) -> None:
+        def job() -> None:
+            # jobs run in order, the files of this test are already written
+            files = manifest.get('files', [])
+            if store is not None:
+                manifest['files'] = store.add(run_folder, folder, manifest)
+            else:
+                manifest['files'] = [
+                    {'name': name, 'bytes': os.path.getsize(os.path.join(folder, name))}
+                    for name in files if os.path.exists(os.path.join(folder, name))
+                ]
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, 'manifest.json'), 'w') as f:
+                json.dump(manifest, f, indent=4)
+        self.submit(job)
+
+    def flush(self) -> None:
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._thread = None
+
+        if self.failed_jobs:
+            logging.warning(f'[Artifact Writer] {self.failed_jobs} jobs failed, first error: {self.first_error}')
+
+
+class ArtifactWriterSummary:
+    """the failed jobs of every worker, on the controller"""
+
+    def __init__(self):
+        self.failed_jobs = 0
+        self.first_error: Optional[str] = None
+
+    def add(self, failed_jobs: int, first_error: Optional[str]) -> None:
+        self.failed_jobs += failed_jobs
+        if self.first_error is None:
+            self.first_error = first_error
+
+    def add_worker_output(self, node: Any) -> None:
+        # pytest_testnodedown, a crashed worker has no output
+        if output := getattr(node, 'workeroutput', {}).get(FAILED_JOBS_OUTPUT):
+            self.add(*output)
+
+    def write_terminal_summary(self, terminalreporter: Any) -> None:
+        if not self.failed_jobs:
+            return
+
+        terminalreporter.write_sep('=', 'artifact writer', yellow=True)
+        terminalreporter.write_line(
+            f'{self.failed_jobs} artifact jobs failed, some screenshots / videos / manifests are missing '
+            f'from the report. first error: {self.first_error}'
+        )
+
+
+# xdist workers are separate processes, so a module level writer is a per worker writer
+artifact_writer = ArtifactWriter()
+artifact_writer_summary = ArtifactWriterSummary()
+
+
+def finish_artifact_writer(config: pytest.Config) -> None:
+    """pytest_sessionfinish, waits for the pending jobs and hands the failed ones to the summary"""
+    artifact_writer.close()
+    if not artifact_writer.failed_jobs:
+        return
+
+    failed_jobs = (artifact_writer.failed_jobs, artifact_writer.first_error)
+    if hasattr(config, 'workeroutput'):
+        config.workeroutput[FAILED_JOBS_OUTPUT] = failed_jobs
+    else:
+        artifact_writer_summary.add(*failed_jobs)
@@ -1,14 +1,21 @@
 from pathlib import Path
 from dataclasses import astuple
 from datetime import datetime as dt
-from pydantic import BaseModel, Field, ConfigDict, field_validator, ValidationInfo
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr, field_validator, ValidationInfo
 from .constants import (
     RunTestBy,
+    RunMode,
+    Scheduling,
+    Workers,
+    ResourceType,
+    NetworkMode,
+    TraceDetail,
     Browser,
     BrowserChannel,
     State,
     LogCli
 )
+from .resources import calculate_auto_workers, load_engine_rss
 
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -30,6 +37,8 @@ class RunTestObject(BaseModel):
     model_config = MODEL_CONFIG
     run_by: str | None = Field(default=None)
     tests: list[str] = []
+    run_mode: str = Field(default=RunMode.SEQUENTIAL)
+    worker_budget: int | None = Field(default=None, gt=0)
 
     @field_validator('run_by')
     @classmethod
@@ -39,6 +48,13 @@ class RunTestObject(BaseModel):
             assert v in args, f'{info.field_name} must be on of: {args}'
             return v
 
+    @field_validator('run_mode')
+    @classmethod
+    def check_run_mode(cls, v: str, info: ValidationInfo) -> str:
+        modes = astuple(RunMode())
+        assert v in modes, f'{info.field_name} must be on of: {modes}'
+        return v
+
 
 class PytestConfigurationsBase(BaseModel):
     model_config = MODEL_CONFIG
@@ -51,7 +67,13 @@ class PytestConfigurationsBase(BaseModel):
     # Test setup
     headed: bool
     tracing: str
+    trace_detail: str = Field(default=TraceDetail.FULL)
+    trace_chunks: bool = False
+    trace_retained_chunks: int = Field(default=1, gt=0)
     video: str
+    rolling_video_seconds: int = Field(default=0, ge=0)
+    rolling_video_fps: int = Field(default=5, gt=0)
+    rolling_video_width: int = Field(default=800, gt=0)
     screenshot: str
     full_page_screenshot: bool
     viewport: ViewPort
@@ -59,7 +81,9 @@ class PytestConfigurationsBase(BaseModel):
     browser_channel: str | None = Field(default=None)
     device: str | None = Field(default=None)
     log_cli_level: str
-    workers: int = Field(default=1, gt=0, lt=5)
+    workers: int | str = Field(default=1)
+    min_available_memory: int | None = Field(default=None, ge=0)
+    scheduling: str = Field(default=Scheduling.LOAD)
 
     # General context configurations
     ignore_https_errors: bool
@@ -67,11 +91,28 @@ class PytestConfigurationsBase(BaseModel):
     default_timeout: int = Field(default=5000, ge=2000)
     clipboard_permissions: bool
     use_storage_state: bool
+    storage_state_ttl: int = Field(default=60 * 60, gt=0)
+    context_pool: bool = False
+    artifact_store: bool = False
+    profile_roundtrips: bool = False
+    profile_top: int = Field(default=10, gt=0)
+    navigation_metrics: bool = False
+    retention_max_size: int | None = Field(default=None, gt=0)
+    retention_max_age: float | None = Field(default=None, gt=0)
+    block_resources: list[str] = []
+    block_url_patterns: list[str] = []
+    network_mode: str = Field(default=NetworkMode.LIVE)
+    har_not_found: str = Field(default='abort')
+    local_site: bool = False
+    local_site_results: int = Field(default=60, gt=0)
+    local_site_latency: int = Field(default=0, ge=0)
 
     # General
     root_folder: Path
     reports_folder_pattern: Path
 
+    _resolved_workers: int | None = PrivateAttr(default=None)
+
     @field_validator('screenshot', 'video', 'tracing')
     @classmethod
     def check_artifacts(cls, v: str, info: ValidationInfo) -> str:
@@ -88,7 +129,7 @@ class PytestConfigurationsBase(BaseModel):
     @field_validator('base_url')
     @classmethod
     def check_base_url(cls, v: str, info: ValidationInfo) -> str:
-        assert v.startswith('https://'), f'{info.field_name} must start with https://'
+        assert v.startswith(('https://', 'http://')), f'{info.field_name} must start with https:// or http://'
         return v
 
     @field_validator('browsers')
@@ -107,6 +148,51 @@ class PytestConfigurationsBase(BaseModel):
             assert v in channels, f'{info.field_name} must be on of: {channels}'
             return v
 
+    @field_validator('trace_detail')
+    @classmethod
+    def check_trace_detail(cls, v: str, info: ValidationInfo) -> str:
+        details = astuple(TraceDetail())
+        assert v in details, f'{info.field_name} must be on of: {details}'
+        return v
+
+    @field_validator('workers')
+    @classmethod
+    def check_workers(cls, v: int | str, info: ValidationInfo) -> int | str:
+        if isinstance(v, str):
+            assert v == Workers.AUTO, f'{info.field_name} must be a positive int or "{Workers.AUTO}"'
+        else:
+            assert v > 0, f'{info.field_name} must be a positive int or "{Workers.AUTO}"'
+        return v
+
+    @field_validator('scheduling')
+    @classmethod
+    def check_scheduling(cls, v: str, info: ValidationInfo) -> str:
+        schedulers = astuple(Scheduling())
+        assert v in schedulers, f'{info.field_name} must be on of: {schedulers}'
+        return v
+
+    @field_validator('block_resources')
+    @classmethod
+    def check_block_resources(cls, v: list[str], info: ValidationInfo) -> list[str]:
+        resource_types = astuple(ResourceType())
+        for resource_type in v:
+            assert resource_type in resource_types, f'{info.field_name} must be on of: {resource_types}'
+        return v
+
+    @field_validator('network_mode')
+    @classmethod
+    def check_network_mode(cls, v: str, info: ValidationInfo) -> str:
+        modes = astuple(NetworkMode())
+        assert v in modes, f'{info.field_name} must be on of: {modes}'
+        return v
+
+    @field_validator('har_not_found')
+    @classmethod
+    def check_har_not_found(cls, v: str, info: ValidationInfo) -> str:
+        args = ['abort', 'fallback']
+        assert v in args, f'{info.field_name} must be on of: {args}'
+        return v
+
     @field_validator('log_cli_level')
     @classmethod
     def check_log_cli_level(cls, v: str, info: ValidationInfo) -> str:
@@ -114,6 +200,20 @@ class PytestConfigurationsBase(BaseModel):
         assert v in log, f'{info.field_name} must be on of: {log}'
         return v
 
+    def resolve_workers(self) -> int:
+        if isinstance(self.workers, int):
+            return self.workers
+
+        # resolved once per run, so every session of the run gets the same number of workers
+        if self._resolved_workers is None:
+            self._resolved_workers = calculate_auto_workers(
+                browsers=self.browsers,
+                headed=self.headed,
+                browser_affinity=self.scheduling == Scheduling.BROWSER,
+                engine_rss=load_engine_rss(self.reports_folder_pattern.parent)
+            )
+        return self._resolved_workers
+
     def extend_reports_folder_name(self, test_name: str) -> str:
         date = dt.now().strftime('%d-%m-%Y')
         time = dt.now().strftime('%H-%M-%S')
@@ -138,18 +238,35 @@ class PytestConfigurationsBase(BaseModel):
             '--navigation-timeout', str(self.navigation_timeout),
             '--viewport', str(self.viewport.width), str(self.viewport.height),
             '--tracing', self.tracing,
+            '--trace-detail', self.trace_detail,
+            '--trace-retained-chunks', str(self.trace_retained_chunks),
             '--video', self.video,
+            '--rolling-video-seconds', str(self.rolling_video_seconds),
+            '--rolling-video-fps', str(self.rolling_video_fps),
+            '--rolling-video-width', str(self.rolling_video_width),
             '--screenshot', self.screenshot,
             '--log-cli-level', self.log_cli_level,
             '--password', self.password,
             '--username', self.username,
             '--base-url', self.base_url,
-            '-n', str(self.workers)
+            '-n', str(self.resolve_workers()),
+            '--scheduling', self.scheduling,
+            '--history-folder', str(self.reports_folder_pattern.parent),
+            '--network-mode', self.network_mode,
+            '--har-folder', str(self.root_folder / 'hars'),
+            '--har-not-found', self.har_not_found
         ]
 
         if self.headed:
             args.append('--headed')
 
+        # the engines are measured for the next runs of workers "auto"
+        if self.workers == Workers.AUTO:
+            args.append('--measure-engine-rss')
+
+        if self.min_available_memory:
+            args.extend(['--min-available-memory', str(self.min_available_memory)])
+
         if self.ignore_https_errors:
             args.append('--ignore-https-errors')
 
@@ -166,11 +283,45 @@ class PytestConfigurationsBase(BaseModel):
             args.append('--device')
 
         if self.use_storage_state:
-            args.append('--use-storage-state')
+            args.extend(['--use-storage-state', '--storage-state-ttl', str(self.storage_state_ttl)])
 
         if self.clipboard_permissions:
             args.append('--clipboard-permissions')
 
+        if self.trace_chunks:
+            args.append('--trace-chunks')
+
+        if self.context_pool:
+            args.append('--context-pool')
+
+        if self.profile_roundtrips:
+            args.extend(['--profile-roundtrips', '--profile-top', str(self.profile_top)])
+
+        if self.navigation_metrics:
+            args.append('--navigation-metrics')
+
+        if self.local_site:
+            args.extend([
+                '--local-site',
+                '--local-site-results', str(self.local_site_results),
+                '--local-site-latency', str(self.local_site_latency)
+            ])
+
+        if self.artifact_store:
+            args.append('--artifact-store')
+
+        if self.retention_max_size:
+            args.extend(['--retention-max-size', str(self.retention_max_size)])
+
+        if self.retention_max_age:
+            args.extend(['--retention-max-age', str(self.retention_max_age)])
+
+        for resource_type in self.block_resources:
+            args.extend(['--block-resource-type', resource_type])
+
+        for pattern in self.block_url_patterns:
+            args.extend(['--block-url-pattern', pattern])
+
         return args
 
     @classmethod
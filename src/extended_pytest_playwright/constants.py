@@ -36,3 +36,53 @@ class RunTestBy:
     MARK: str = '-m'
     NAME: str = '-k'
     FILE: str = 'file'
+
+
+@dataclass(frozen=True)
+class RunMode:
+    SEQUENTIAL: str = 'sequential'
+    CONCURRENT: str = 'concurrent'
+    MERGED: str = 'merged'
+
+
+@dataclass(frozen=True)
+class Scheduling:
+    LOAD: str = 'load'
+    DURATION: str = 'duration'
+    BROWSER: str = 'browser'
+
+
+@dataclass(frozen=True)
+class Workers:
+    AUTO: str = 'auto'
+
+
+@dataclass(frozen=True)
+class ResourceType:
+    DOCUMENT: str = 'document'
+    STYLESHEET: str = 'stylesheet'
+    IMAGE: str = 'image'
+    MEDIA: str = 'media'
+    FONT: str = 'font'
+    SCRIPT: str = 'script'
+    TEXTTRACK: str = 'texttrack'
+    XHR: str = 'xhr'
+    FETCH: str = 'fetch'
+    EVENTSOURCE: str = 'eventsource'
+    WEBSOCKET: str = 'websocket'
+    MANIFEST: str = 'manifest'
+    OTHER: str = 'other'
+
+
+@dataclass(frozen=True)
+class NetworkMode:
+    LIVE: str = 'live'
+    RECORD: str = 'record'
+    REPLAY: str = 'replay'
+
+
+@dataclass(frozen=True)
+class TraceDetail:
+    ACTIONS: str = 'actions'
+    SNAPSHOTS: str = 'snapshots'
+    FULL: str = 'full'
@@ -0,0 +1,128 @@
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Optional
+from playwright.sync_api import Browser, BrowserContext, Page, Error
+
+# per origin storage can only be cleared from a page that is on that origin,
+# the local storage of the context storage state (if any) is written back for that origin
+CLEAR_STORAGE_SCRIPT = """
+async (states) => {
+    try {
+        localStorage.clear();
+        sessionStorage.clear();
+        const origin = states.find(state => state.origin === location.origin);
+        for (const item of (origin ? origin.localStorage : [])) { localStorage.setItem(item.name, item.value); }
+    } catch (e) {}
+    try {
+        if (indexedDB.databases) {
+            for (const db of await indexedDB.databases()) { indexedDB.deleteDatabase(db.name); }
+        }
+    } catch (e) {}
+    try { for (const key of await caches.keys()) { await caches.delete(key); } } catch (e) {}
+}
+"""
+
+
+class ContextPool:
+    """
+    a per worker pool of warm browser contexts, one idle context per browser / context options combination
+
+    a released context is reset (pages, cookies, storage, permissions, routes) back to its storage_state
+    and handed to the next test with the same options. contexts of failed tests are closed instead of being reused
+    """
+
+    def __init__(self):
+        self._idle: dict[tuple, list[BrowserContext]] = {}
+        self._in_use: dict[BrowserContext, tuple[tuple, Callable[[Page], None], Optional[Path]]] = {}
+
+    @staticmethod
+    def log(msg: str) -> None:
+        logging.info(f'[Context Pool] {msg}')
+
+    @staticmethod
+    def make_key(browser: Browser, context_args: dict[str, Any]) -> tuple:
+        return id(browser), repr(sorted(context_args.items(), key=lambda item: item[0]))
+
+    def acquire(self, browser: Browser, context_args: dict[str, Any]) -> Optional[BrowserContext]:
+        idle = self._idle.get(self.make_key(browser, context_args), [])
+        while idle:
+            context = idle.pop()
+            if context.browser and context.browser.is_connected():
+                self.log('Reusing warm context')
+                return context
+        return None
+
+    def track(
+            self,
+            browser: Browser,
+            context_args: dict[str, Any],
+            context: BrowserContext,
+            page_handler: Callable[[Page], None]
+    ) -> None:
+        self._in_use[context] = (self.make_key(browser, context_args), page_handler, context_args.get('storage_state'))
+
+    def owns(self, context: BrowserContext) -> bool:
+        return context in self._in_use
+
+    @staticmethod
+    def load_storage_state(storage_state: Optional[Path]) -> dict[str, Any]:
+        if storage_state is None:
+            return {}
+        try:
+            return json.loads(Path(storage_state).read_text())
+        except (OSError, ValueError) as e:
+            logging.warning(f'[Context Pool] could not read the storage state {storage_state}: {e}')
+            return {}
+
+    @staticmethod
+    def reset_context(context: BrowserContext, state: Optional[dict[str, Any]] = None) -> None:
+        state = state or {}
+        for page in context.pages:
+            try:
+                page.evaluate(CLEAR_STORAGE_SCRIPT, state.get('origins', []))
+            except Error:
+                pass
+            page.close()
+
+        context.clear_cookies()
+        if state.get('cookies'):
+            context.add_cookies(state['cookies'])
+        context.clear_permissions()
+        context.unroute_all(behavior='ignoreErrors')
+        context.set_offline(False)
+        context.set_extra_http_headers({})
+
+    def release(self, context: BrowserContext, failed: bool) -> None:
+        key, page_handler, storage_state = self._in_use.pop(context)
+        context.remove_listener('page', page_handler)
+
+        if failed:
+            self.log('Closing context of a failed test')
+            context.close()
+            return
+
+        try:
+            self.reset_context(context, self.load_storage_state(storage_state))
+        except Error as e:
+            self.log(f'Could not reset context, closing it: {e}')
+            context.close()
+            return
+
+        self._idle.setdefault(key, []).append(context)
+
+    def close_all(self, browser: Optional[Browser] = None) -> None:
+        """closes the idle contexts (of one browser), before their browser is closed"""
+        for key in list(self._idle):
+            if browser is not None and key[0] != id(browser):
+                continue
+            for context in self._idle.pop(key):
+                try:
+                    context.close()
+                except Error:
+                    pass
+
+
+# xdist workers are separate processes, so a module level pool is a per worker pool
+context_pool = ContextPool()
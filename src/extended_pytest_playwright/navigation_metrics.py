@@ -0,0 +1,253 @@
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import pytest
+from glob import glob
+from statistics import median
+from typing import Any, Optional
+from weakref import WeakSet
+from playwright.sync_api import BrowserContext, Page, Error
+
+NAVIGATION_METRICS_FILE_NAME = 'navigation_metrics.json'
+
+# the columns of the per-run file, one value per navigation
+COLUMNS = (
+    'timestamp', 'test', 'browser', 'page_object', 'step', 'url',
+    'ttfb_ms', 'dom_content_loaded_ms', 'load_ms', 'lcp_ms', 'transfer_bytes', 'requests'
+)
+# repeated strings are stored once, as indexes into the column values
+DICTIONARY_COLUMNS = ('test', 'browser', 'page_object', 'step', 'url')
+
+LCP_OBSERVER_SCRIPT = """
+(() => {
+    window.__lcp = null;
+    try {
+        new PerformanceObserver((list) => {
+            const entries = list.getEntries();
+            window.__lcp = entries[entries.length - 1].startTime;
+        }).observe({type: 'largest-contentful-paint', buffered: true});
+    } catch (e) {}
+})();
+"""
+
+NAVIGATION_TIMING_SCRIPT = """
+() => {
+    const navigation = performance.getEntriesByType('navigation')[0];
+    if (!navigation) {
+        return null;
+    }
+    const resources = performance.getEntriesByType('resource');
+    return {
+        url: location.origin + location.pathname,
+        ttfb_ms: navigation.responseStart,
+        dom_content_loaded_ms: navigation.domContentLoadedEventEnd,
+        load_ms: navigation.loadEventEnd || performance.now(),
+        lcp_ms: window.__lcp,
+        transfer_bytes: (navigation.transferSize || 0) + resources.reduce((sum, r) => sum + (r.transferSize || 0), 0),
+        requests: resources.length + 1
+    };
+}
+"""
+
+# init scripts can not be removed, a pooled context gets the observer once
+_observed_contexts: WeakSet = WeakSet()
+
+
+class NavigationCollector:
+    """
+    records navigation timing, lcp, transfer size and request count of every page load of a test,
+    tagged with the page-object step that caused it (a step listener).
+    lcp is only reported by chromium, it is null for the other engines
+    """
+
+    def __init__(self, test: str, browser_name: str):
+        self.test = test
+        self.browser_name = browser_name
+        self.rows: list[dict[str, Any]] = []
+        self._steps: list[str] = []
+
+    def on_step_start(self, name: str, depth: int) -> None:
+        self._steps.append(name)
+
+    def on_step_end(self, name: str, depth: int, error: BaseException | None) -> None:
+        if self._steps:
+            self._steps.pop()
+
+    def attach(self, page: Page) -> None:
+        page.on('load', self._on_load)
+
+    def _on_load(self, page: Page) -> None:
+        try:
+            timing = page.evaluate(NAVIGATION_TIMING_SCRIPT)
+        except Error:
+            # the page navigated again or closed before it could be measured
+            return
+        if not timing:
+            return
+
+        step = self._steps[-1] if self._steps else ''
+        self.rows.append({
+            'timestamp': round(time.time(), 3),
+            'test': self.test,
+            'browser': self.browser_name,
+            'page_object': step.split('.')[0],
+            'step': step,
+            **{key: round(value) if isinstance(value, float) else value for key, value in timing.items()}
+        })
+
+
+navigation_collector_key = pytest.StashKey[NavigationCollector]()
+
+
+def init_navigation_metrics(
+        context: BrowserContext,
+        pytestconfig: pytest.Config,
+        request: pytest.FixtureRequest,
+        browser_name: str
+) -> None:
+    if not pytestconfig.getoption('--navigation-metrics'):
+        return
+
+    if context not in _observed_contexts:
+        context.add_init_script(LCP_OBSERVER_SCRIPT)
+        _observed_contexts.add(context)
+
+    request.node.stash[navigation_collector_key] = NavigationCollector(request.node.nodeid, browser_name)
+
+
+def get_navigation_collector(request: pytest.FixtureRequest) -> Optional[NavigationCollector]:
+    return request.node.stash.get(navigation_collector_key, None)
+
+
+def attach_navigation_metrics(page: Page, request: pytest.FixtureRequest) -> None:
+    collector = get_navigation_collector(request)
+    if collector:
+        collector.attach(page)
+
+
+def finish_navigation_metrics(request: pytest.FixtureRequest) -> None:
+    collector = get_navigation_collector(request)
+    if collector:
+        navigation_metrics.add_rows(collector.rows)
+
+
+def to_columns(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    columns: dict[str, Any] = {}
+    for column in COLUMNS:
+        values = [row.get(column) for row in rows]
+        if column in DICTIONARY_COLUMNS:
+            dictionary = list(dict.fromkeys(values))
+            positions = {value: index for index, value in enumerate(dictionary)}
+            columns[column] = {'dictionary': dictionary, 'indexes': [positions[value] for value in values]}
+        else:
+            columns[column] = values
+    return {'rows': len(rows), 'columns': columns}
+
+
+def from_columns(data: dict[str, Any]) -> list[dict[str, Any]]:
+    columns = {}
+    for column, values in data['columns'].items():
+        if isinstance(values, dict):
+            values = [values['dictionary'][index] for index in values['indexes']]
+        columns[column] = values
+    return [{column: values[index] for column, values in columns.items()} for index in range(data['rows'])]
+
+
+class NavigationMetrics:
+    """
+    the navigations measured by this worker. each worker writes its own part file at session end,
+    the controller merges the parts into one columnar navigation_metrics.json per run
+    """
+
+    def __init__(self):
+        self.rows: list[dict[str, Any]] = []
+
+    def add_rows(self, rows: list[dict[str, Any]]) -> None:
+        self.rows.extend(rows)
+
+    def flush(self, config: pytest.Config) -> None:
+        output = config.getoption('--output')
+        if not config.getoption('--navigation-metrics') or not output:
+            return
+
+        if self.rows:
+            worker = getattr(config, 'workerinput', {}).get('workerid', 'main')
+            os.makedirs(output, exist_ok=True)
+            with open(os.path.join(output, f'navigation_metrics.{worker}.part.json'), 'w') as f:
+                json.dump(to_columns(self.rows), f)
+            self.rows = []
+
+        if hasattr(config, 'workerinput'):
+            return
+
+        parts = sorted(glob(os.path.join(output, 'navigation_metrics.*.part.json')))
+        rows = []
+        for part in parts:
+            with open(part) as f:
+                rows.extend(from_columns(json.load(f)))
+        if not rows:
+            return
+
+        rows.sort(key=lambda row: row['timestamp'])
+        with open(os.path.join(output, NAVIGATION_METRICS_FILE_NAME), 'w') as f:
+            json.dump(to_columns(rows), f, separators=(',', ':'))
+        for part in parts:
+            os.remove(part)
+        logging.info(f'[Navigation Metrics] {len(rows)} navigations written to {NAVIGATION_METRICS_FILE_NAME}')
+
+
+navigation_metrics = NavigationMetrics()
+
+
+def load_navigation_metrics(paths: list[str]) -> list[dict[str, Any]]:
+    """reads navigation_metrics.json files, run folders or folders holding run folders"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            # run folders may be nested (test-report-tests/test_airbnb_flows.py-<date>)
+            files.extend(glob(os.path.join(path, '**', NAVIGATION_METRICS_FILE_NAME), recursive=True))
+        else:
+            files.append(path)
+
+    rows = []
+    for file in sorted(files):
+        with open(file) as f:
+            rows.extend(from_columns(json.load(f)))
+    return rows
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='median page load metrics per page object and browser')
+    parser.add_argument('paths', nargs='+', help='navigation_metrics.json files, run folders or pytest_reports')
+    args = parser.parse_args(argv)
+
+    groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for row in load_navigation_metrics(args.paths):
+        groups.setdefault((row['page_object'] or '-', row['browser']), []).append(row)
+
+    if not groups:
+        print('no navigation metrics found')
+        return 1
+
+    def middle(rows: list[dict[str, Any]], column: str) -> str:
+        values = [row[column] for row in rows if row[column] is not None]
+        return f'{median(values):.0f}' if values else '-'
+
+    width = max(len('page object'), *(len(page_object) for page_object, _ in groups))
+    print(f"{'page object':<{width}}  {'browser':<8} {'loads':>5} {'ttfb':>6} {'dcl':>6} {'load':>6} {'lcp':>6} {'KB':>7} {'reqs':>5}")
+    for (page_object, browser), rows in sorted(groups.items()):
+        kilobytes = middle([{'kb': row['transfer_bytes'] / 1024} for row in rows], 'kb')
+        print(
+            f'{page_object:<{width}}  {browser:<8} {len(rows):>5} {middle(rows, "ttfb_ms"):>6} '
+            f'{middle(rows, "dom_content_loaded_ms"):>6} {middle(rows, "load_ms"):>6} {middle(rows, "lcp_ms"):>6} '
+            f'{kilobytes:>7} {middle(rows, "requests"):>5}'
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
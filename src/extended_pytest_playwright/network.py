@@ -0,0 +1,207 @@
+
+import re
+import glob
+import fnmatch
+import logging
+import pytest
+from pathlib import Path
+from typing import Any
+from playwright.sync_api import BrowserContext, Route, Request, Response, Error
+
+NETWORK_PROPERTY = 'network'
+HAR_NAME_UNSAFE = re.compile(r'[^\w.\[\]-]')
+
+
+class ResourceBlocker:
+    """
+    aborts requests by resource type (image, font, media...) or by url glob pattern,
+    and counts what was blocked and what was transferred for the test report
+    """
+
+    def __init__(self, resource_types: list[str], url_patterns: list[str]):
+        self.resource_types = set(resource_types)
+        self.url_patterns = [re.compile(fnmatch.translate(pattern)) for pattern in url_patterns]
+        self.blocked_requests: dict[str, int] = {}
+        self.requests = 0
+        self.transferred_bytes = 0
+        # responses without content-length (chunked, compressed), the finished ones are sized at the end of the test
+        self._unsized_requests: set[Request] = set()
+        self._finished_unsized_requests: list[Request] = []
+        self.unsized_responses = 0
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.resource_types:
+            return True
+        return any(pattern.match(url) for pattern in self.url_patterns)
+
+    def handle_route(self, route: Route) -> None:
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked_requests[request.resource_type] = self.blocked_requests.get(request.resource_type, 0) + 1
+            route.abort('blockedbyclient')
+        else:
+            route.fallback()
+
+    def on_response(self, response: Response) -> None:
+        self.requests += 1
+        # content-length is part of the response event, reading it does not cost a round trip
+        length = response.headers.get('content-length')
+        if length and length.isdigit():
+            self.transferred_bytes += int(length)
+        else:
+            self._unsized_requests.add(response.request)
+
+    def on_request_finished(self, request: Request) -> None:
+        if request in self._unsized_requests:
+            self._unsized_requests.remove(request)
+            self._finished_unsized_requests.append(request)
+
+    def measure_unsized_responses(self) -> None:
+        """a round trip per finished response without content-length, at the end of the test, not while it runs"""
+        for request in self._finished_unsized_requests:
+            try:
+                self.transferred_bytes += max(request.sizes()['responseBodySize'], 0)
+            except Error:
+                self.unsized_responses += 1
+        # still loading (sizes would wait for them) or failed, the transferred bytes are then a lower bound
+        self.unsized_responses += len(self._unsized_requests)
+        self._unsized_requests.clear()
+        self._finished_unsized_requests.clear()
+
+    def attach(self, context: BrowserContext) -> None:
+        context.route('**/*', self.handle_route)
+        context.on('response', self.on_response)
+        context.on('requestfinished', self.on_request_finished)
+
+    def detach(self, context: BrowserContext) -> None:
+        context.remove_listener('response', self.on_response)
+        context.remove_listener('requestfinished', self.on_request_finished)
+        self.measure_unsized_responses()
+        try:
+            context.unroute('**/*', self.handle_route)
+        except Error:
+            pass
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            'blocked_requests': dict(self.blocked_requests),
+            'allowed_requests': self.requests,
+            'transferred_bytes': self.transferred_bytes,
+            'unsized_responses': self.unsized_responses
+        }
+
+
+resource_blocker_key = pytest.StashKey[ResourceBlocker]()
+
+
+def init_resource_blocking(context: BrowserContext, pytestconfig: pytest.Config, request: pytest.FixtureRequest) -> None:
+    resource_types = pytestconfig.getoption('--block-resource-type')
+    url_patterns = pytestconfig.getoption('--block-url-pattern')
+
+    if not (resource_types or url_patterns) or request.node.get_closest_marker('allow_resources'):
+        return
+
+    blocker = ResourceBlocker(resource_types, url_patterns)
+    blocker.attach(context)
+    request.node.stash[resource_blocker_key] = blocker
+
+
+def finish_resource_blocking(context: BrowserContext, request: pytest.FixtureRequest) -> None:
+    blocker = request.node.stash.get(resource_blocker_key, None)
+    if blocker is None:
+        return
+
+    blocker.detach(context)
+    # user properties travel from xdist workers to the controller and into report.json / report.xml
+    request.node.user_properties.append((NETWORK_PROPERTY, blocker.summary()))
+
+
+def get_har_path(request: pytest.FixtureRequest, har_folder: str, browser_name: str) -> Path:
+    # one recording per test and browser, parametrized tests get one per parameter set, so no two
+    # contexts (or xdist workers) ever write the same file. the browser is kept out of the name,
+    # a test recorded with one browser can be replayed by the others
+    name = f'{request.node.module.__name__}.{request.node.originalname}'
+    callspec = getattr(request.node, 'callspec', None)
+    if callspec is not None:
+        params = [str(value) for key, value in callspec.params.items() if key != 'browser_name']
+        if params:
+            name += '[' + '-'.join(params) + ']'
+    return Path(har_folder) / f'{HAR_NAME_UNSAFE.sub("_", name)}.{browser_name}.zip'
+
+
+def init_network_mode(
+        context: BrowserContext,
+        pytestconfig: pytest.Config,
+        request: pytest.FixtureRequest,
+        browser_name: str
+) -> None:
+    network_mode = pytestconfig.getoption('--network-mode')
+    if network_mode == 'live':
+        return
+
+    har_path = get_har_path(request, pytestconfig.getoption('--har-folder'), browser_name)
+
+    if network_mode == 'record':
+        har_path.parent.mkdir(parents=True, exist_ok=True)
+        logging.info(f'[Network] Recording HAR: {har_path}')
+        # the har is written when the context closes
+        context.route_from_har(har_path, update=True, update_content='attach', update_mode='minimal')
+        return
+
+    if not har_path.exists():
+        # a flow recorded with one browser can be replayed by the others
+        name = har_path.name.removesuffix(f'.{browser_name}.zip')
+        recordings = sorted(har_path.parent.glob(f'{glob.escape(name)}.*.zip'))
+        if not recordings:
+            pytest.fail(f'No HAR recording for this test: {har_path}, record it with --network-mode record')
+        har_path = recordings[0]
+
+    # abort: unmatched requests fail (fully offline), fallback: unmatched requests go to the network
+    not_found = pytestconfig.getoption('--har-not-found')
+    logging.info(f'[Network] Replaying HAR: {har_path} (not found: {not_found})')
+    context.route_from_har(har_path, not_found=not_found)
+
+
+class NetworkSummary:
+    """aggregates the network user property of every test, on the controller"""
+
+    def __init__(self):
+        self.tests = 0
+        self.blocked_requests: dict[str, int] = {}
+        self.allowed_requests = 0
+        self.transferred_bytes = 0
+        self.unsized_responses = 0
+
+    def add_report(self, report: pytest.TestReport) -> None:
+        if report.when != 'teardown':
+            return
+
+        for name, value in report.user_properties:
+            if name != NETWORK_PROPERTY:
+                continue
+            self.tests += 1
+            self.allowed_requests += value['allowed_requests']
+            self.transferred_bytes += value['transferred_bytes']
+            self.unsized_responses += value.get('unsized_responses', 0)
+            for resource_type, count in value['blocked_requests'].items():
+                self.blocked_requests[resource_type] = self.blocked_requests.get(resource_type, 0) + count
+
+    def write_terminal_summary(self, terminalreporter: Any) -> None:
+        if not self.tests:
+            return
+
+        blocked = sum(self.blocked_requests.values())
+        by_type = ', '.join(f'{resource_type}: {count}' for resource_type, count in sorted(self.blocked_requests.items()))
+        terminalreporter.write_sep('=', 'resource blocking')
+        terminalreporter.write_line(f'tests: {self.tests}')
+        terminalreporter.write_line(f'requests saved: {blocked} ({by_type})')
+        # responses that could not be sized are left out, the total is then a lower bound
+        at_least = 'at least ' if self.unsized_responses else ''
+        terminalreporter.write_line(
+            f'allowed requests: {self.allowed_requests}, '
+            f'transferred: {at_least}{self.transferred_bytes / 1024 ** 2:.1f} MB'
+        )
+        logging.info(f'[Resource Blocking] blocked {blocked} requests across {self.tests} tests')
+
+
+network_summary = NetworkSummary()
@@ -4,7 +4,15 @@ import pytest
 import os
 from pathlib import Path
 from playwright.sync_api import Browser, BrowserContext, Page, Error
-from typing import Optional, Literal
+from typing import Callable, Optional, Literal
+from .context_pool import context_pool
+from .artifact_writer import artifact_writer
+from .artifact_store import get_artifact_store
+from .step_tracing import start_tracing, get_step_tracer
+from .network import init_resource_blocking, finish_resource_blocking, init_network_mode
+from .roundtrip_profiler import start_roundtrip_profiling, finish_roundtrip_profiling
+from .navigation_metrics import init_navigation_metrics, attach_navigation_metrics, finish_navigation_metrics
+from .rolling_video import init_rolling_video, start_rolling_video, stop_rolling_video
 
 
 def build_artifact_test_folder(
@@ -47,18 +55,35 @@ def handle_artifacts(
         failed = request.node.rep_call.failed if hasattr(request.node, "rep_call") else True
         status = "failed" if failed else "passed"
 
+    artifact_files: list[str] = []
+
+    # stopped first, the artifact work below is not part of the test
+    profiler = finish_roundtrip_profiling(request)
+    if profiler:
+        roundtrips_path = build_artifact_test_folder(pytestconfig, request, 'roundtrips.txt', test_setup_result)
+        artifact_writer.write_bytes(roundtrips_path, profiler.table().encode())
+        artifact_files.append(os.path.basename(roundtrips_path))
+
+    finish_navigation_metrics(request)
+
     tracing_option = pytestconfig.getoption("--tracing")
     capture_trace = tracing_option in ["on", "retain-on-failure"]
     if capture_trace:
         retain_trace = tracing_option == "on" or (failed and tracing_option == "retain-on-failure")
-        if retain_trace:
+        step_tracer = get_step_tracer(request)
+        if step_tracer:
+            trace_folder = os.path.dirname(build_artifact_test_folder(pytestconfig, request, '', test_setup_result))
+            artifact_files.extend(step_tracer.finish(retain_trace, trace_folder, status))
+        elif retain_trace:
             trace_path = build_artifact_test_folder(
                 pytestconfig,
                 request,
                 f"trace_{status}.zip",
                 test_setup_result
             )
+            # the trace zip is built by the driver, this is the only artifact written in teardown
             context.tracing.stop(path=trace_path)
+            artifact_files.append(os.path.basename(trace_path))
         else:
             context.tracing.stop()
 
@@ -73,15 +98,34 @@ def handle_artifacts(
                 test_setup_result
             )
             try:
-                page.screenshot(
+                data = page.screenshot(
                     timeout=5000,
-                    path=screenshot_path,
                     full_page=pytestconfig.getoption("--full-page-screenshot"),
                 )
             except Error:
-                pass
+                continue
+            artifact_writer.write_bytes(screenshot_path, data)
+            artifact_files.append(os.path.basename(screenshot_path))
+
+    finish_resource_blocking(context, request)
+
+    screencasts = stop_rolling_video(request)
+    if failed:
+        for index, screencast in enumerate(screencasts):
+            video_path = build_artifact_test_folder(
+                pytestconfig,
+                request,
+                f"video-{status}-{index + 1}.webm",
+                test_setup_result
+            )
+            video_file = screencast.save(video_path)
+            if video_file:
+                artifact_files.append(video_file)
 
-    context.close()
+    if context_pool.owns(context):
+        context_pool.release(context, failed)
+    else:
+        context.close()
 
     video_option = pytestconfig.getoption("--video")
     preserve_video = video_option == "on" or (failed and video_option == "retain-on-failure")
@@ -97,11 +141,26 @@ def handle_artifacts(
                     f"video-{status}-{index + 1}.webm",
                     test_setup_result
                 )
-                video.save_as(path=video_path)
+                # the context is closed, the recorded file is complete and can be moved in the background
+                artifact_writer.move(video.path(), video_path)
+                artifact_files.append(os.path.basename(video_path))
             except Error:
                 # Silent catch empty videos.
                 pass
 
+    if artifact_files:
+        artifact_folder = os.path.dirname(build_artifact_test_folder(pytestconfig, request, '', test_setup_result))
+        artifact_writer.write_manifest(
+            artifact_folder,
+            {
+                'test': request.node.nodeid,
+                'status': status,
+                'files': artifact_files
+            },
+            store=get_artifact_store(pytestconfig),
+            run_folder=pytestconfig.getoption('--output')
+        )
+
 
 def init_context(
         browser: Browser,
@@ -109,9 +168,11 @@ def init_context(
         pytestconfig: pytest.Config,
         request: pytest.FixtureRequest,
         browser_name: str,
-        storage_state: Path | None = None
+        storage_state: Path | None = None,
+        page_filter: Callable[[Page], bool] | None = None
 ) -> tuple[BrowserContext, list[Page]]:
     pages: list[Page] = []
+    start_roundtrip_profiling(pytestconfig, request)
     browser_context_args = browser_context_args.copy()
     context_args_marker = next(request.node.iter_markers("browser_context_args"), None)
     additional_context_args = context_args_marker.kwargs if context_args_marker else {}
@@ -123,14 +184,38 @@ def init_context(
         "height": int(viewport_option[1])
     }
 
-    context = browser.new_context(
+    context_args = dict(
         **browser_context_args,
         storage_state=storage_state,
         viewport=viewport,
         record_video_size=viewport,
         ignore_https_errors=request.config.getoption('--ignore-https-errors')
     )
-    context.on("page", lambda page: pages.append(page))
+    context_args = init_rolling_video(context_args, pytestconfig, request, browser_name)
+
+    # videos and recorded hars are only written when their context closes, so those contexts can not be reused
+    use_pool = (
+        pytestconfig.getoption('--context-pool')
+        and pytestconfig.getoption('--video') == 'off'
+        and pytestconfig.getoption('--network-mode') != 'record'
+        and request.node.get_closest_marker('isolated_context') is None
+    )
+
+    context = context_pool.acquire(browser, context_args) if use_pool else None
+    if context is None:
+        context = browser.new_context(**context_args)
+
+    def on_page(page: Page) -> None:
+        # pages the filter rejects (helper tabs) get no screenshot, video or page load metrics
+        if page_filter and not page_filter(page):
+            return
+        pages.append(page)
+        start_rolling_video(page, pytestconfig, request)
+        attach_navigation_metrics(page, request)
+
+    context.on("page", on_page)
+    if use_pool:
+        context_pool.track(browser, context_args, context, on_page)
 
     tracing_option = pytestconfig.getoption("--tracing")
     capture_trace = tracing_option in ["on", "retain-on-failure"]
@@ -140,12 +225,9 @@ def init_context(
         except Exception as e:
             logging.error(f'something went wrong with obtaining test name: {e}')
             title = 'tracing'
-        context.tracing.start(
-            title=title,
-            screenshots=True,
-            snapshots=True,
-            sources=True,
-        )
+        start_tracing(context, pytestconfig, request, title)
+
+    init_navigation_metrics(context, pytestconfig, request, browser_name)
 
     context.set_default_timeout(timeout=int(request.config.getoption('--default-timeout')))
     context.set_default_navigation_timeout(timeout=int(request.config.getoption('--navigation-timeout')))
@@ -153,6 +235,10 @@ def init_context(
     if browser_name == "chromium" and request.config.getoption('--clipboard-permissions'):
         context.grant_permissions(['clipboard-write', 'clipboard-read'])
 
+    # blocking is routed after the har, so it is matched first and falls back to the har
+    init_network_mode(context, pytestconfig, request, browser_name)
+    init_resource_blocking(context, pytestconfig, request)
+
     return context, pages
 
 
@@ -201,12 +287,140 @@ def create_extended_options(parser: pytest.Parser) -> None:
         action='store',
         default=None
     )
+    group.addoption(
+        '--scheduling',
+        action='store',
+        default='load',
+        choices=['load', 'duration', 'browser']
+    )
+    group.addoption(
+        '--history-folder',
+        action='store',
+        default=None
+    )
+    group.addoption(
+        '--measure-engine-rss',
+        action='store_true',
+        default=False
+    )
+    group.addoption(
+        '--min-available-memory',
+        action='store',
+        type=int,
+        default=None
+    )
+    group.addoption(
+        '--context-pool',
+        action='store_true',
+        default=False
+    )
+    group.addoption(
+        '--network-mode',
+        action='store',
+        default='live',
+        choices=['live', 'record', 'replay']
+    )
+    group.addoption(
+        '--har-folder',
+        action='store',
+        default='hars'
+    )
+    group.addoption(
+        '--har-not-found',
+        action='store',
+        default='abort',
+        choices=['abort', 'fallback']
+    )
+    group.addoption(
+        '--block-resource-type',
+        action='append',
+        default=[]
+    )
+    group.addoption(
+        '--block-url-pattern',
+        action='append',
+        default=[]
+    )
+    group.addoption(
+        '--trace-detail',
+        action='store',
+        default='full',
+        choices=['actions', 'snapshots', 'full']
+    )
+    group.addoption(
+        '--trace-chunks',
+        action='store_true',
+        default=False
+    )
+    group.addoption(
+        '--trace-retained-chunks',
+        action='store',
+        type=int,
+        default=1
+    )
+    group.addoption(
+        '--rolling-video-seconds',
+        action='store',
+        type=int,
+        default=0
+    )
+    group.addoption(
+        '--rolling-video-fps',
+        action='store',
+        type=int,
+        default=5
+    )
+    group.addoption(
+        '--rolling-video-width',
+        action='store',
+        type=int,
+        default=800
+    )
+    group.addoption(
+        '--artifact-store',
+        action='store_true',
+        default=False
+    )
+    group.addoption(
+        '--retention-max-size',
+        action='store',
+        type=int,
+        default=None
+    )
+    group.addoption(
+        '--retention-max-age',
+        action='store',
+        type=float,
+        default=None
+    )
+    group.addoption(
+        '--profile-roundtrips',
+        action='store_true',
+        default=False
+    )
+    group.addoption(
+        '--profile-top',
+        action='store',
+        type=int,
+        default=10
+    )
+    group.addoption(
+        '--navigation-metrics',
+        action='store_true',
+        default=False
+    )
     group.addoption(
         '--use-storage-state',
         action='store_true',
         default=False
     )
 
+    group.addoption(
+        '--storage-state-ttl',
+        action='store',
+        type=int,
+        default=60 * 60
+    )
     group.addoption(
         '--use-pycharm-debugger-args',
         action='store_true',
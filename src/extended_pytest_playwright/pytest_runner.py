@@ -1,7 +1,11 @@
 
 from .configuration_objects import PytestConfigurationsBase, RunTestObject
+from .constants import RunMode
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 import subprocess
+import threading
+import os
 
 
 class RunnerBase:
@@ -44,16 +48,24 @@ class RunnerBase:
 
         print(bottom_border)
 
-    def run_tests(self) -> None:
+    @staticmethod
+    def combine_exit_codes(exit_codes: list[int]) -> int:
+        # first failing session decides the exit status, 0 only if every session passed
+        return next((code for code in exit_codes if code != 0), 0)
+
+    def run_tests(self) -> int:
         raise NotImplementedError
 
 
 class PlaywrightPytestRunner(RunnerBase):
 
+    merged_session_name = 'merged-session'
+
     def __init__(self, config: Any, run_test_obj: RunTestObject):
         super().__init__(config, run_test_obj)
+        self._print_lock = threading.Lock()
 
-    def _pytest_task(self, test_name: str) -> None:
+    def _build_pytest_args(self, test_name: str) -> list[str]:
         extra_args = self.config.generate_cli_args_from_configurations(test_name=test_name)
 
         if self.run_test_obj.run_by == 'file':
@@ -64,14 +76,84 @@ class PlaywrightPytestRunner(RunnerBase):
             args = ['pytest', self.run_test_obj.run_by, test_name]
 
         args.extend(extra_args)
+        return args
+
+    def _build_merged_pytest_args(self) -> list[str]:
+        tests = self.run_test_obj.tests
+        extra_args = self.config.generate_cli_args_from_configurations(test_name=self.merged_session_name)
+
+        if self.run_test_obj.run_by == 'file':
+            for test_name in tests:
+                if not test_name.endswith('.py'):
+                    raise ValueError(f'test name should be a python file: {test_name}')
+            args = ['pytest', *tests]
+        else:
+            # -k / -m accept a single expression, every selection is OR-ed into it
+            expression = ' or '.join(f'({test})' for test in tests)
+            args = ['pytest', self.run_test_obj.run_by, expression]
+
+        args.extend(extra_args)
+        return args
+
+    def _pytest_task(self, test_name: str) -> int:
+        args = self._build_pytest_args(test_name)
         self.print_pytest_cli_arguments(args)
-        subprocess.run(args=args)
+        return subprocess.run(args=args).returncode
+
+    def _concurrent_pytest_task(self, test_name: str) -> int:
+        args = self._build_pytest_args(test_name)
+        with self._print_lock:
+            self.print_pytest_cli_arguments(args)
+
+        process = subprocess.Popen(
+            args=args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            env={**os.environ, 'PYTHONUNBUFFERED': '1'}
+        )
+
+        for line in process.stdout:
+            with self._print_lock:
+                print(f'[{test_name}] {line}', end='', flush=True)
+
+        exit_code = process.wait()
+        with self._print_lock:
+            print(f'[{test_name}] pytest session finished with exit code: {exit_code}', flush=True)
+
+        return exit_code
+
+    def get_concurrent_sessions_count(self) -> int:
+        # every pytest session opens `workers` xdist workers, each one driving a single browser at a time
+        budget = self.run_test_obj.worker_budget or os.cpu_count() or 1
+        sessions = max(1, budget // self.config.resolve_workers())
+        return min(sessions, len(self.run_test_obj.tests))
+
+    def _run_sequential(self) -> list[int]:
+        return [self._pytest_task(test_name=test) for test in self.run_test_obj.tests]
+
+    def _run_concurrent(self) -> list[int]:
+        sessions = self.get_concurrent_sessions_count()
+        with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix='pytest-session') as executor:
+            return list(executor.map(self._concurrent_pytest_task, self.run_test_obj.tests))
+
+    def _run_merged(self) -> list[int]:
+        args = self._build_merged_pytest_args()
+        self.print_pytest_cli_arguments(args)
+        return [subprocess.run(args=args).returncode]
 
-    def run_tests(self) -> None:
+    def run_tests(self) -> int:
 
         if not self.run_test_obj.tests:
             error = 'tests list can not be empty, check run_tests variable in pytest_run_configurations.py file'
             raise ValueError(error)
 
-        for test in self.run_test_obj.tests:
-            self._pytest_task(test_name=test)
+        if self.run_test_obj.run_mode == RunMode.CONCURRENT:
+            exit_codes = self._run_concurrent()
+        elif self.run_test_obj.run_mode == RunMode.MERGED:
+            exit_codes = self._run_merged()
+        else:
+            exit_codes = self._run_sequential()
+
+        return self.combine_exit_codes(exit_codes)
@@ -0,0 +1,266 @@
+
+import os
+import json
+import time
+import logging
+import pytest
+from pathlib import Path
+from statistics import median
+from typing import Optional
+from playwright.sync_api import Browser as PlaywrightBrowser
+from .constants import Browser
+from .storage_state import file_lock
+
+ENGINE_RSS_FILE_NAME = 'engine_rss.jsonl'
+# one line per worker per session, load_engine_rss only uses the most recent ones
+ENGINE_RSS_MAX_LINES = 200
+
+# used until an engine was measured on this machine
+DEFAULT_ENGINE_RSS_MB = {
+    Browser.CHROMIUM: 500,
+    Browser.FIREFOX: 650,
+    Browser.WEBKIT: 450,
+}
+HEADED_RSS_FACTOR = 1.5
+MEMORY_USAGE_RATIO = 0.8
+
+# peak engine rss measured by this worker, flushed to the history file at session end
+_measured_engine_rss: dict[str, float] = {}
+
+
+def get_engine_key(browser_name: str, headed: bool) -> str:
+    return f'{browser_name}-headed' if headed else browser_name
+
+
+def get_available_memory_mb() -> Optional[float]:
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def get_process_rss_mb(pid: int) -> float:
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _read_process_cmdline(pid: int) -> list[str]:
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            return f.read().decode(errors='replace').split('\0')
+    except OSError:
+        return []
+
+
+def _get_children() -> Optional[dict[int, list[int]]]:
+    proc = Path('/proc')
+    if not proc.is_dir():
+        return None
+
+    children: dict[int, list[int]] = {}
+    for stat_file in proc.glob('[0-9]*/stat'):
+        try:
+            # the process name may contain spaces, ppid is the second field after it
+            stat = stat_file.read_text().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        children.setdefault(int(stat[1]), []).append(int(stat_file.parent.name))
+    return children
+
+
+def _subtree_rss_mb(children: dict[int, list[int]], pid: int) -> float:
+    total = 0.0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += get_process_rss_mb(current)
+        stack.extend(children.get(current, []))
+    return total
+
+
+def get_process_tree_rss_mb(pid: int) -> Optional[float]:
+    """
+    sums the rss of every descendant of pid (playwright driver + browser processes), linux only
+
+    :param pid: the root process, not included in the sum
+    :return: rss in MB or None when /proc is not available
+    """
+    children = _get_children()
+    if children is None:
+        return None
+
+    return sum(_subtree_rss_mb(children, child) for child in children.get(pid, []))
+
+
+def get_engine_rss_mb(executable_path: str, pid: Optional[int] = None) -> Optional[float]:
+    """
+    sums the rss of the browser processes launched from executable_path under pid, linux only.
+    the driver and the other engines of the worker are left out, so the value is a single engine
+
+    :param executable_path: browser.browser_type.executable_path
+    :param pid: the root process, defaults to the current one
+    :return: rss in MB or None when /proc is not available
+    """
+    children = _get_children()
+    if children is None:
+        return None
+
+    # the engine root process runs the executable (or a launcher script next to it, webkit's pw_run.sh),
+    # its helpers (renderers, content processes) are found below it
+    engine_folder = os.path.dirname(executable_path) + os.sep
+    total = 0.0
+    stack = list(children.get(pid or os.getpid(), []))
+    while stack:
+        child = stack.pop()
+        if any(arg.startswith(engine_folder) for arg in _read_process_cmdline(child)[:2]):
+            total += _subtree_rss_mb(children, child)
+        else:
+            stack.extend(children.get(child, []))
+
+    return total
+
+
+def measure_engine_rss(browser: PlaywrightBrowser, browser_name: str, pytestconfig: pytest.Config) -> None:
+    # walks /proc, only worth it when the samples feed workers "auto" (see --measure-engine-rss)
+    if not pytestconfig.getoption('--measure-engine-rss') or not pytestconfig.getoption('--history-folder'):
+        return
+
+    rss = get_engine_rss_mb(browser.browser_type.executable_path)
+    # nothing matched (e.g. a branded channel installed elsewhere), better no sample than a wrong one
+    if not rss:
+        return
+    key = get_engine_key(browser_name, pytestconfig.getoption('--headed'))
+    _measured_engine_rss[key] = max(rss, _measured_engine_rss.get(key, 0.0))
+
+
+def flush_engine_rss(history_folder: Optional[str], max_lines: int = ENGINE_RSS_MAX_LINES) -> None:
+    if not history_folder or not _measured_engine_rss:
+        return
+
+    path = Path(history_folder) / ENGINE_RSS_FILE_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # the workers flush at the same time, the lock keeps their lines when trimming
+    with file_lock(path.with_name(f'{path.name}.lock')):
+        try:
+            lines = path.read_text().splitlines()
+        except OSError:
+            lines = []
+        lines.append(json.dumps(_measured_engine_rss))
+
+        temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        temp_path.write_text('\n'.join(lines[-max_lines:]) + '\n')
+        os.replace(temp_path, path)
+    _measured_engine_rss.clear()
+
+
+def load_engine_rss(history_folder: Optional[str | Path], samples_per_engine: int = 20) -> dict[str, float]:
+    if not history_folder:
+        return {}
+
+    path = Path(history_folder) / ENGINE_RSS_FILE_NAME
+    try:
+        lines = path.read_text().splitlines()
+    except OSError:
+        return {}
+
+    samples: dict[str, list[float]] = {}
+    for line in reversed(lines):
+        try:
+            measurement = json.loads(line)
+        except ValueError:
+            continue
+        for key, rss in measurement.items():
+            values = samples.setdefault(key, [])
+            if len(values) < samples_per_engine:
+                values.append(rss)
+
+    return {key: median(values) for key, values in samples.items()}
+
+
+def calculate_auto_workers(
+        browsers: list[str],
+        headed: bool,
+        browser_affinity: bool,
+        engine_rss: dict[str, float],
+        cpu_count: Optional[int] = None,
+        available_memory_mb: Optional[float] = None
+) -> int:
+    """
+    :param browsers: the configured browsers
+    :param headed: headed engines use more memory and compete for the window server
+    :param browser_affinity: with browser scheduling a worker keeps a single engine alive,
+        otherwise a worker may end up keeping every configured engine alive
+    :param engine_rss: measured rss per engine key (see load_engine_rss)
+    :param cpu_count: defaults to os.cpu_count()
+    :param available_memory_mb: defaults to the currently available memory
+    :return: the number of xdist workers
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    if available_memory_mb is None:
+        available_memory_mb = get_available_memory_mb()
+
+    per_engine = []
+    for browser in browsers or [Browser.CHROMIUM]:
+        measured = engine_rss.get(get_engine_key(browser, headed))
+        if measured is None:
+            measured = DEFAULT_ENGINE_RSS_MB[browser] * (HEADED_RSS_FACTOR if headed else 1)
+        per_engine.append(measured)
+
+    per_worker = max(per_engine) if browser_affinity else sum(per_engine)
+    cpu_workers = max(1, cpu_count // 2) if headed else cpu_count
+
+    if available_memory_mb is None:
+        return cpu_workers
+
+    memory_workers = int(available_memory_mb * MEMORY_USAGE_RATIO // per_worker)
+    return max(1, min(cpu_workers, memory_workers))
+
+
+def wait_for_available_memory(
+        min_available_mb: Optional[int],
+        timeout: int = 120 * 1000,
+        interval: int = 1000
+) -> float:
+    """
+    holds the current worker before it opens a new context while memory is under pressure,
+    which lowers the effective concurrency of the run. gw0 (or a non xdist run) is never held,
+    so the run always makes progress
+
+    :return: the time spent waiting in milliseconds
+    """
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'master')
+    if not min_available_mb or worker in ('master', 'gw0'):
+        return 0
+
+    waited = 0
+    available = get_available_memory_mb()
+    while available is not None and available < min_available_mb and waited < timeout:
+        if waited == 0:
+            logging.info(
+                f'[Resources] {worker} waiting for memory: {available:.0f}MB available, {min_available_mb}MB required'
+            )
+        time.sleep(interval / 1000)
+        waited += interval
+        available = get_available_memory_mb()
+
+    return waited
+
+
+def handle_memory_pressure(pytestconfig: pytest.Config) -> None:
+    waited = wait_for_available_memory(pytestconfig.getoption('--min-available-memory'))
+    if waited:
+        logging.info(f'[Resources] resumed after {waited / 1000:.0f}s of memory pressure')
@@ -0,0 +1,178 @@
+
+import os
+import sys
+import glob
+import base64
+import shutil
+import logging
+import zipfile
+import subprocess
+import pytest
+from collections import deque
+from pathlib import Path
+from typing import Optional
+from playwright.sync_api import Page, Error
+from .artifact_writer import artifact_writer
+
+
+def find_ffmpeg() -> Optional[str]:
+    """ffmpeg from the PATH, or the one `playwright install` downloads for video recording"""
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg:
+        return ffmpeg
+
+    browsers_path = os.environ.get('PLAYWRIGHT_BROWSERS_PATH')
+    if not browsers_path:
+        if sys.platform == 'darwin':
+            browsers_path = str(Path.home() / 'Library' / 'Caches' / 'ms-playwright')
+        elif sys.platform == 'win32':
+            browsers_path = str(Path.home() / 'AppData' / 'Local' / 'ms-playwright')
+        else:
+            browsers_path = str(Path.home() / '.cache' / 'ms-playwright')
+
+    candidates = sorted(glob.glob(os.path.join(browsers_path, 'ffmpeg-*', 'ffmpeg-*')), reverse=True)
+    return candidates[0] if candidates else None
+
+
+class RollingScreencast:
+    """
+    keeps the last `seconds` of a page in memory, as jpeg frames from the chromium screencast,
+    and encodes them only when asked to (a failed test)
+
+    :param page: a chromium page
+    :param seconds: length of the ring buffer
+    :param fps: frames per second kept in the buffer
+    :param max_width: frames are scaled down to this width
+    """
+
+    def __init__(self, page: Page, seconds: int, fps: int, max_width: int):
+        self.page = page
+        self.seconds = seconds
+        self.fps = fps
+        # capped by frame timestamps, frames only arrive when the page changes so a count says nothing of time
+        self.frames: deque[tuple[float, bytes]] = deque()
+        self._last_timestamp = float('-inf')
+        self._cdp = page.context.new_cdp_session(page)
+        self._cdp.on('Page.screencastFrame', self._on_frame)
+        self._cdp.send('Page.startScreencast', {
+            'format': 'jpeg',
+            'quality': 80,
+            'maxWidth': max_width,
+            'maxHeight': max_width
+        })
+
+    def _on_frame(self, params: dict) -> None:
+        # chromium stops sending frames until the previous one is acknowledged
+        self._cdp.send('Page.screencastFrameAck', {'sessionId': params['sessionId']})
+
+        timestamp = params['metadata'].get('timestamp', 0.0)
+        if timestamp - self._last_timestamp < 1 / self.fps:
+            return
+        self._last_timestamp = timestamp
+        self.frames.append((timestamp, base64.b64decode(params['data'])))
+
+        # the newest frame shown before the window start is kept, it is what the window starts with
+        while len(self.frames) > 1 and self.frames[1][0] <= timestamp - self.seconds:
+            self.frames.popleft()
+
+    def stop(self) -> None:
+        try:
+            self._cdp.send('Page.stopScreencast')
+            self._cdp.detach()
+        except Error:
+            pass
+
+    def _frames_at_fixed_rate(self) -> list[bytes]:
+        # frames only arrive when the page changes, repeat them to fill the gaps of the last `seconds`
+        frames = list(self.frames)
+        window_start = frames[-1][0] - self.seconds
+        output = []
+        for index, (timestamp, data) in enumerate(frames):
+            start = max(timestamp, window_start)
+            next_timestamp = frames[index + 1][0] if index + 1 < len(frames) else start
+            output.extend([data] * max(1, round((next_timestamp - start) * self.fps)))
+        return output
+
+    def save(self, path: str) -> Optional[str]:
+        """
+        hands the encoding to the artifact writer, as webm when ffmpeg is available,
+        otherwise as a zip of jpeg frames
+
+        :return: the file name that will be written, None when nothing was captured
+        """
+        if not self.frames:
+            return None
+
+        frames = self._frames_at_fixed_rate()
+        ffmpeg = find_ffmpeg()
+        fps = self.fps
+
+        if ffmpeg:
+            def encode() -> None:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                args = [
+                    ffmpeg, '-loglevel', 'error', '-f', 'image2pipe', '-c:v', 'mjpeg', '-framerate', str(fps),
+                    '-i', '-', '-y', '-an', '-c:v', 'vp8', '-deadline', 'realtime', '-speed', '8', '-b:v', '1M',
+                    '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', path
+                ]
+                subprocess.run(args, input=b''.join(frames), check=True)
+
+            artifact_writer.submit(encode)
+            return os.path.basename(path)
+
+        frames_path = os.path.splitext(path)[0] + '.frames.zip'
+
+        def write_frames() -> None:
+            os.makedirs(os.path.dirname(frames_path), exist_ok=True)
+            with zipfile.ZipFile(frames_path, 'w') as archive:
+                for index, data in enumerate(frames):
+                    archive.writestr(f'{index:05d}.jpg', data)
+
+        artifact_writer.submit(write_frames)
+        return os.path.basename(frames_path)
+
+
+rolling_screencasts_key = pytest.StashKey[list[RollingScreencast]]()
+
+
+def is_rolling_video_enabled(pytestconfig: pytest.Config, browser_name: str) -> bool:
+    # the screencast is a chromium devtools feature, other engines keep the regular recording
+    return (
+        pytestconfig.getoption('--rolling-video-seconds') > 0
+        and pytestconfig.getoption('--video') == 'retain-on-failure'
+        and browser_name == 'chromium'
+    )
+
+
+def start_rolling_video(page: Page, pytestconfig: pytest.Config, request: pytest.FixtureRequest) -> None:
+    if rolling_screencasts_key not in request.node.stash:
+        return
+
+    try:
+        screencast = RollingScreencast(
+            page,
+            seconds=pytestconfig.getoption('--rolling-video-seconds'),
+            fps=pytestconfig.getoption('--rolling-video-fps'),
+            max_width=pytestconfig.getoption('--rolling-video-width')
+        )
+    except Error as e:
+        logging.error(f'[Rolling Video] could not start screencast: {e}')
+        return
+
+    request.node.stash[rolling_screencasts_key].append(screencast)
+
+
+def init_rolling_video(context_args: dict, pytestconfig: pytest.Config, request: pytest.FixtureRequest, browser_name: str) -> dict:
+    """drops the full video recording from the context args when the rolling buffer replaces it"""
+    if not is_rolling_video_enabled(pytestconfig, browser_name):
+        return context_args
+
+    request.node.stash[rolling_screencasts_key] = []
+    return {k: v for k, v in context_args.items() if k not in ('record_video_dir', 'record_video_size')}
+
+
+def stop_rolling_video(request: pytest.FixtureRequest) -> list[RollingScreencast]:
+    screencasts = request.node.stash.get(rolling_screencasts_key, [])
+    for screencast in screencasts:
+        screencast.stop()
+    return screencasts
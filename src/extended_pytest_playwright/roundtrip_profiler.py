@@ -0,0 +1,176 @@
+
+import os
+import sys
+import time
+import logging
+import pytest
+from pathlib import Path
+from types import FrameType
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from playwright._impl._sync_base import SyncBase
+
+ROUNDTRIPS_PROPERTY = 'roundtrips'
+
+# call sites are reported relative to the src folder, the first frame inside it is the caller
+SOURCE_ROOT = str(Path(__file__).resolve().parent.parent) + os.sep
+
+
+class RoundTripProfiler:
+    """
+    counts the blocking calls to the playwright driver made during one test (every sync api method,
+    locator.count / is_visible / get_attribute / expect... waits for one round trip or more)
+    and their latency, by api method and by the line in src/ that made them
+    """
+
+    def __init__(self, top: int):
+        self.top = top
+        self.calls: dict[tuple[str, str], list[float]] = {}
+
+    @staticmethod
+    def call_site(frame: Optional[FrameType]) -> str:
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(SOURCE_ROOT):
+                return f'{filename[len(SOURCE_ROOT):]}:{frame.f_lineno} ({frame.f_code.co_name})'
+            frame = frame.f_back
+        return '<outside src>'
+
+    def record(self, method: str, site: str, ms: float) -> None:
+        stats = self.calls.get((method, site))
+        if stats is None:
+            self.calls[(method, site)] = [1, ms, ms]
+            return
+        stats[0] += 1
+        stats[1] += ms
+        stats[2] = max(stats[2], ms)
+
+    def summary(self) -> dict[str, Any]:
+        hot = sorted(self.calls.items(), key=lambda item: item[1][1], reverse=True)[:self.top]
+        return {
+            'calls': sum(stats[0] for stats in self.calls.values()),
+            'ms': round(sum(stats[1] for stats in self.calls.values())),
+            'top': [
+                {'method': method, 'site': site, 'calls': count, 'ms': round(total), 'max_ms': round(longest)}
+                for (method, site), (count, total, longest) in hot
+            ]
+        }
+
+    def table(self) -> str:
+        summary = self.summary()
+        lines = [
+            f"round trips: {summary['calls']}, {summary['ms']} ms",
+            f"{'calls':>6} {'ms':>8} {'max ms':>7}  method / call site"
+        ]
+        for row in summary['top']:
+            lines.append(f"{row['calls']:>6} {row['ms']:>8} {row['max_ms']:>7}  {row['method']}  {row['site']}")
+        return '\n'.join(lines) + '\n'
+
+
+_active_profiler: Optional[RoundTripProfiler] = None
+_original_sync = SyncBase._sync
+
+
+def _profiled_sync(self: SyncBase, coro: Any) -> Any:
+    __tracebackhide__ = True
+    profiler = _active_profiler
+    if profiler is None:
+        return _original_sync(self, coro)
+
+    # the caller is the generated sync api method, e.g. Locator.is_visible
+    api_frame = sys._getframe(1)
+    method = f'{type(self).__name__}.{api_frame.f_code.co_name}'
+    site = profiler.call_site(api_frame.f_back)
+    started = time.perf_counter()
+    try:
+        return _original_sync(self, coro)
+    finally:
+        profiler.record(method, site, (time.perf_counter() - started) * 1000)
+
+
+roundtrip_profiler_key = pytest.StashKey[RoundTripProfiler]()
+
+
+def _install_profiler() -> None:
+    # every sync api object (context, pages, locators, expect) goes through SyncBase._sync,
+    # patched once per worker and only recording while a profiler is active
+    if SyncBase._sync is not _profiled_sync:
+        SyncBase._sync = _profiled_sync
+
+
+@contextmanager
+def count_roundtrips(top: int = 10) -> Iterator[RoundTripProfiler]:
+    """profiles the round trips of a block of code, outside of a test's profiling (benchmarks)"""
+    global _active_profiler
+
+    _install_profiler()
+    previous = _active_profiler
+    _active_profiler = RoundTripProfiler(top)
+    try:
+        yield _active_profiler
+    finally:
+        _active_profiler = previous
+
+
+def start_roundtrip_profiling(pytestconfig: pytest.Config, request: pytest.FixtureRequest) -> None:
+    global _active_profiler
+
+    if not pytestconfig.getoption('--profile-roundtrips'):
+        return
+
+    _install_profiler()
+    _active_profiler = RoundTripProfiler(pytestconfig.getoption('--profile-top'))
+    request.node.stash[roundtrip_profiler_key] = _active_profiler
+
+
+def finish_roundtrip_profiling(request: pytest.FixtureRequest) -> Optional[RoundTripProfiler]:
+    global _active_profiler
+
+    profiler = request.node.stash.get(roundtrip_profiler_key, None)
+    if profiler is None:
+        return None
+
+    _active_profiler = None
+    summary = profiler.summary()
+    logging.info(f"[Round Trips] {summary['calls']} calls, {summary['ms']} ms")
+    request.node.user_properties.append((ROUNDTRIPS_PROPERTY, summary))
+    return profiler
+
+
+class RoundTripSummary:
+    """aggregates the roundtrips user property of every test, on the controller"""
+
+    def __init__(self, top: int = 10):
+        self.top = top
+        self.tests = 0
+        self.calls = 0
+        self.ms = 0
+        self.sites: dict[tuple[str, str], list[int]] = {}
+
+    def add_report(self, report: pytest.TestReport) -> None:
+        if report.when != 'teardown':
+            return
+
+        for name, value in report.user_properties:
+            if name != ROUNDTRIPS_PROPERTY:
+                continue
+            self.tests += 1
+            self.calls += value['calls']
+            self.ms += value['ms']
+            for row in value['top']:
+                stats = self.sites.setdefault((row['method'], row['site']), [0, 0])
+                stats[0] += row['calls']
+                stats[1] += row['ms']
+
+    def write_terminal_summary(self, terminalreporter: Any) -> None:
+        if not self.tests:
+            return
+
+        terminalreporter.write_sep('=', 'playwright round trips')
+        terminalreporter.write_line(f'tests: {self.tests}, round trips: {self.calls}, {self.ms / 1000:.1f}s')
+        hot = sorted(self.sites.items(), key=lambda item: item[1][1], reverse=True)[:self.top]
+        for (method, site), (calls, ms) in hot:
+            terminalreporter.write_line(f'{calls:>6} {ms:>8} ms  {method}  {site}')
+
+
+roundtrip_summary = RoundTripSummary()
@@ -0,0 +1,284 @@
+
+import json
+import logging
+import pytest
+from pathlib import Path
+from statistics import mean
+from typing import Any, Optional
+from xdist.scheduler import LoadScheduling
+from .constants import Scheduling
+from ..utils.nodeids import get_browser_from_nodeid
+
+
+def load_historical_durations(
+        history_folder: str | Path,
+        max_reports: int = 50,
+        samples_per_test: int = 5
+) -> dict[str, float]:
+    """
+    reads the report.json files written by pytest-json-report for previous runs
+
+    :param history_folder: the folder holding the report folders, e.g. pytest_reports
+    :param max_reports: how many of the newest reports are scanned
+    :param samples_per_test: how many of the newest passed runs are averaged per nodeid
+    :return: {nodeid: average duration in seconds}
+    """
+    # report folders are named after the test name, a test file path nests them one folder deeper
+    # (test-report-tests/test_airbnb_flows.py-<date>/report.json)
+    reports = sorted(
+        Path(history_folder).rglob('report.json'),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True
+    )
+
+    samples: dict[str, list[float]] = {}
+    for report in reports[:max_reports]:
+        try:
+            data = json.loads(report.read_text())
+        except (OSError, ValueError) as e:
+            logging.warning(f'[Scheduling] could not read {report}: {e}')
+            continue
+
+        for test in data.get('tests', []):
+            # failed runs are usually cut short (or hit a timeout), they do not represent the test length
+            if test.get('outcome') != 'passed':
+                continue
+
+            durations = samples.setdefault(test['nodeid'], [])
+            if len(durations) < samples_per_test:
+                stages = ('setup', 'call', 'teardown')
+                durations.append(sum(test.get(stage, {}).get('duration', 0) for stage in stages))
+
+    return {nodeid: mean(durations) for nodeid, durations in samples.items()}
+
+
+class DurationScheduling(LoadScheduling):
+    """
+    longest processing time first (LPT) scheduling
+
+    pending items are sorted by their historical duration and every worker is topped up
+    to the 2 items xdist needs to run one, so the slow tests start first and the short
+    ones fill the gaps at the end of the run
+    """
+
+    def __init__(self, config: pytest.Config, log: Any = None, durations: Optional[dict[str, float]] = None):
+        super().__init__(config, log)
+        self.durations = durations or {}
+        # unknown tests are estimated with the average of the known ones
+        self.default_duration = mean(self.durations.values()) if self.durations else 0.0
+
+    def estimate(self, nodeid: str) -> float:
+        return self.durations.get(nodeid, self.default_duration)
+
+    def schedule(self) -> None:
+        assert self.collection_is_completed
+
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        self.pending[:] = sorted(
+            range(len(self.collection)),
+            key=lambda index: self.estimate(self.collection[index]),
+            reverse=True
+        )
+        if not self.collection:
+            return
+
+        # one item per worker per round, so the longest items land on different workers
+        for _ in range(2):
+            for node in self.nodes:
+                self._send_tests(node, 1)
+
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node: Any, duration: float = 0) -> None:
+        if node.shutting_down:
+            return
+
+        if self.pending:
+            node_pending = self.node2pending[node]
+            if len(node_pending) < 2:
+                self._send_tests(node, 2 - len(node_pending))
+        else:
+            node.shutdown()
+
+        self.log("num items waiting for node:", len(self.pending))
+
+
+class BrowserScheduling(DurationScheduling):
+    """
+    browser affinity scheduling
+
+    items are grouped by their browser_name parameter and every group is pinned to its own
+    worker(s), so a worker launches a single engine. with more workers than browsers the spare
+    workers go to the groups with the largest share of the work, with fewer workers whole groups
+    are packed onto workers longest first. inside a group items are handed out longest first
+    """
+
+    def __init__(self, config: pytest.Config, log: Any = None, durations: Optional[dict[str, float]] = None):
+        super().__init__(config, log, durations)
+        self.group2pending: dict[str | None, list[int]] = {}
+        self.node2groups: dict[Any, list[str | None]] = {}
+
+    def _weight(self, index: int) -> float:
+        # without history every item weighs the same, so the share of work is the item count
+        return self.estimate(self.collection[index]) if self.durations else 1.0
+
+    def _group_weight(self, group: str | None) -> float:
+        return sum(self._weight(index) for index in self.group2pending[group])
+
+    def _build_groups(self) -> None:
+        for index in self.pending:
+            group = get_browser_from_nodeid(self.collection[index])
+            self.group2pending.setdefault(group, []).append(index)
+
+    def _assign_groups(self, nodes: list[Any]) -> None:
+        groups = sorted(self.group2pending, key=self._group_weight, reverse=True)
+
+        if len(nodes) >= len(groups):
+            workers_per_group = {group: 1 for group in groups}
+            for _ in range(len(nodes) - len(groups)):
+                group = max(groups, key=lambda g: self._group_weight(g) / workers_per_group[g])
+                workers_per_group[group] += 1
+
+            available = iter(nodes)
+            for group, count in workers_per_group.items():
+                for _ in range(count):
+                    self.node2groups[next(available)] = [group]
+        else:
+            loads = {node: 0.0 for node in nodes}
+            for node in nodes:
+                self.node2groups[node] = []
+            for group in groups:
+                node = min(loads, key=loads.get)
+                self.node2groups[node].append(group)
+                loads[node] += self._group_weight(group)
+
+        for node, node_groups in self.node2groups.items():
+            self.log(f"node {node.gateway.id} pinned to: {node_groups}")
+
+    def _assign_orphan_groups(self) -> None:
+        # groups left without a live worker (crash / late node) go to the least loaded live worker
+        owned = {group for node_groups in self.node2groups.values() for group in node_groups}
+        live_nodes = [node for node in self.node2pending if not node.shutting_down]
+        for group, pending in self.group2pending.items():
+            if group in owned or not pending or not live_nodes:
+                continue
+            node = min(live_nodes, key=lambda n: len(self.node2pending[n]) + len(self.node2groups.get(n, [])))
+            self.node2groups.setdefault(node, []).append(group)
+
+    def _send_group_tests(self, node: Any, num: int) -> None:
+        to_send = []
+        for group in self.node2groups.get(node, []):
+            group_pending = self.group2pending[group]
+            while group_pending and len(to_send) < num:
+                to_send.append(group_pending.pop(0))
+            if len(to_send) == num:
+                break
+
+        if to_send:
+            for index in to_send:
+                self.pending.remove(index)
+            self.node2pending[node].extend(to_send)
+            node.send_runtest_some(to_send)
+
+    def _node_has_work(self, node: Any) -> bool:
+        return any(self.group2pending[group] for group in self.node2groups.get(node, []))
+
+    def schedule(self) -> None:
+        assert self.collection_is_completed
+
+        if self.collection is not None:
+            for node in self.nodes:
+                if node not in self.node2groups:
+                    # a late / re-added node helps the largest group left, without one it is shut down
+                    groups = [group for group, pending in self.group2pending.items() if pending]
+                    self.node2groups[node] = [max(groups, key=self._group_weight)] if groups else []
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        self.pending[:] = sorted(
+            range(len(self.collection)),
+            key=lambda index: self.estimate(self.collection[index]),
+            reverse=True
+        )
+        if not self.collection:
+            return
+
+        self._build_groups()
+        self._assign_groups(self.nodes)
+
+        for node in self.nodes:
+            self.check_schedule(node)
+
+    def check_schedule(self, node: Any, duration: float = 0) -> None:
+        if node.shutting_down:
+            return
+
+        # a worker only runs its last item once it has another one or is shut down,
+        # so a worker without items of its own engine is shut down instead of waiting
+        if self._node_has_work(node):
+            node_pending = self.node2pending[node]
+            if len(node_pending) < 2:
+                self._send_group_tests(node, 2 - len(node_pending))
+        else:
+            node.shutdown()
+
+        self.log("num items waiting for node:", len(self.pending))
+
+    def mark_test_pending(self, item: str) -> None:
+        index = self.collection.index(item)
+        self.pending.insert(0, index)
+        self.group2pending.setdefault(get_browser_from_nodeid(item), []).insert(0, index)
+        self._assign_orphan_groups()
+        for node in self.node2pending:
+            self.check_schedule(node)
+
+    def remove_node(self, node: Any) -> Optional[str]:
+        self.node2groups.pop(node, None)
+        pending = self.node2pending.pop(node)
+
+        crashitem = None
+        if pending:
+            crashitem = self.collection[pending.pop(0)]
+            self.pending.extend(pending)
+            for index in reversed(pending):
+                group = get_browser_from_nodeid(self.collection[index])
+                self.group2pending.setdefault(group, []).insert(0, index)
+
+        self._assign_orphan_groups()
+        for other_node in self.node2pending:
+            self.check_schedule(other_node)
+
+        return crashitem
+
+
+def make_xdist_scheduler(config: pytest.Config, log: Any) -> Optional[LoadScheduling]:
+    scheduling = config.getoption('--scheduling')
+
+    # None falls back to the xdist --dist scheduler
+    if scheduling not in (Scheduling.DURATION, Scheduling.BROWSER):
+        return None
+
+    history_folder = config.getoption('--history-folder')
+    durations = load_historical_durations(history_folder) if history_folder else {}
+    logging.info(f'[Scheduling] loaded historical durations for {len(durations)} tests')
+
+    if scheduling == Scheduling.BROWSER:
+        return BrowserScheduling(config, log, durations)
+
+    return DurationScheduling(config, log, durations)
@@ -0,0 +1,114 @@
+
+import os
+import re
+import shutil
+import logging
+import tempfile
+import pytest
+from typing import Optional
+from playwright.sync_api import BrowserContext
+from .artifact_writer import artifact_writer
+
+# tracing detail tiers, from the cheapest to the most complete
+TRACE_DETAIL_OPTIONS = {
+    'actions': dict(screenshots=False, snapshots=False, sources=False),
+    'snapshots': dict(screenshots=False, snapshots=True, sources=False),
+    'full': dict(screenshots=True, snapshots=True, sources=True),
+}
+
+
+class StepTracer:
+    """
+    splits the trace of a test into one chunk per top level page-object step (a step listener)
+
+    :param context: the traced context, tracing must already be started
+    :param retained_chunks: how many of the last chunks are kept for the report,
+        None keeps them all. with 1 the previous chunks are discarded without being written
+    """
+
+    def __init__(self, context: BrowserContext, retained_chunks: Optional[int]):
+        self.context = context
+        self.retained_chunks = retained_chunks
+        self._tmp_folder = tempfile.mkdtemp(prefix='trace-chunks-')
+        self._chunks: list[tuple[str, str]] = []
+        self._sequence = 0
+        self._current = 'setup'
+
+    @staticmethod
+    def _file_name(sequence: int, step_name: str) -> str:
+        return f'{sequence:02d}-{re.sub(r"[^A-Za-z0-9]+", "_", step_name).strip("_")}.zip'
+
+    def start(self) -> None:
+        self.context.tracing.start_chunk(title=self._current)
+
+    def _stop_current_chunk(self) -> None:
+        if self.retained_chunks == 1:
+            self.context.tracing.stop_chunk()
+            return
+
+        path = os.path.join(self._tmp_folder, self._file_name(self._sequence, self._current))
+        self.context.tracing.stop_chunk(path=path)
+        self._chunks.append((self._current, path))
+
+        # the current chunk is always kept on top of the previous ones
+        if self.retained_chunks is not None:
+            while len(self._chunks) > self.retained_chunks - 1:
+                _, oldest = self._chunks.pop(0)
+                os.remove(oldest)
+
+    def on_step_start(self, name: str, depth: int) -> None:
+        if depth != 0:
+            return
+        self._stop_current_chunk()
+        self._sequence += 1
+        self._current = name
+        self.context.tracing.start_chunk(title=name)
+
+    def on_step_end(self, name: str, depth: int, error: BaseException | None) -> None:
+        pass
+
+    def finish(self, retain: bool, folder: str, status: str) -> list[str]:
+        """
+        stops the last chunk and moves the retained ones to folder
+
+        :return: the retained file names
+        """
+        files = []
+        if retain:
+            for _, path in self._chunks:
+                name = f'trace_{status}-{os.path.basename(path)}'
+                artifact_writer.move(path, os.path.join(folder, name))
+                files.append(name)
+
+            name = f'trace_{status}-{self._file_name(self._sequence, self._current)}'
+            os.makedirs(folder, exist_ok=True)
+            self.context.tracing.stop_chunk(path=os.path.join(folder, name))
+            files.append(name)
+        else:
+            self.context.tracing.stop_chunk()
+
+        self.context.tracing.stop()
+        # the moves above run in order, the folder is removed once they are done
+        artifact_writer.submit(lambda: shutil.rmtree(self._tmp_folder, ignore_errors=True))
+        logging.info(f'[Tracing] {len(files)} trace chunks retained')
+        return files
+
+
+step_tracer_key = pytest.StashKey[StepTracer]()
+
+
+def start_tracing(context: BrowserContext, pytestconfig: pytest.Config, request: pytest.FixtureRequest, title: str) -> None:
+    context.tracing.start(title=title, **TRACE_DETAIL_OPTIONS[pytestconfig.getoption('--trace-detail')])
+
+    if not pytestconfig.getoption('--trace-chunks'):
+        return
+
+    # with tracing=on every chunk is kept, with retain-on-failure the last chunks around the failure
+    retained = None if pytestconfig.getoption('--tracing') == 'on' else pytestconfig.getoption('--trace-retained-chunks')
+    tracer = StepTracer(context, retained)
+    tracer.start()
+    request.node.stash[step_tracer_key] = tracer
+
+
+def get_step_tracer(request: pytest.FixtureRequest) -> Optional[StepTracer]:
+    return request.node.stash.get(step_tracer_key, None)
@@ -0,0 +1,114 @@
+
+import os
+import time
+import hashlib
+import logging
+import pytest
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Callable, Generator
+from playwright.sync_api import Browser, Page
+
+STORAGE_STATE_FOLDER_NAME = '.storage_state'
+
+
+def log(msg: str) -> None:
+    logging.info(f'[Storage State] {msg}')
+
+
+@contextmanager
+def file_lock(lock_path: Path, timeout: float = 180, stale_after: float = 600) -> Generator[None, None, None]:
+    """
+    a cross-platform lock between xdist workers, based on the atomic creation of the lock file
+
+    :param lock_path: the lock file
+    :param timeout: seconds to wait for the lock
+    :param stale_after: seconds after which a lock left by a dead worker is broken
+    """
+    start = time.monotonic()
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - lock_path.stat().st_mtime > stale_after:
+                    lock_path.unlink(missing_ok=True)
+                    continue
+            except FileNotFoundError:
+                continue
+
+            if time.monotonic() - start > timeout:
+                raise TimeoutError(f'could not acquire lock: {lock_path}')
+            time.sleep(0.1)
+
+    try:
+        yield
+    finally:
+        os.close(fd)
+        lock_path.unlink(missing_ok=True)
+
+
+def is_storage_state_fresh(path: Path, ttl: int) -> bool:
+    try:
+        return time.time() - path.stat().st_mtime < ttl
+    except FileNotFoundError:
+        return False
+
+
+def get_storage_state_path(pytestconfig: pytest.Config, base_url: str | None) -> Path:
+    # one state per site and user
+    username = pytestconfig.getoption('--username') or ''
+    key = hashlib.sha1(f'{base_url}|{username}'.encode()).hexdigest()[:12]
+    folder = Path(pytestconfig.getoption('--history-folder') or pytestconfig.getoption('--output'))
+    return folder / STORAGE_STATE_FOLDER_NAME / f'state-{key}.json'
+
+
+def get_cached_storage_state(
+        browser: Browser,
+        browser_context_args: dict,
+        pytestconfig: pytest.Config,
+        flow: Callable[[Page], None]
+) -> Path:
+    """
+    returns a storage state file created by running flow (login / consent) once,
+    the file is reused by every worker until its ttl expires
+
+    :param browser: used to run the flow when the cached state is missing or expired
+    :param browser_context_args: the context args of the run (base url, https errors...)
+    :param pytestconfig: pytest config
+    :param flow: brings a fresh page to the state that should be saved
+    :return: the storage state path
+    """
+    ttl = pytestconfig.getoption('--storage-state-ttl')
+    path = get_storage_state_path(pytestconfig, browser_context_args.get('base_url'))
+
+    if is_storage_state_fresh(path, ttl):
+        log(f'Using cached storage state: {path}')
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(path.with_suffix('.lock')):
+
+        # another worker may have created it while this one waited for the lock
+        if is_storage_state_fresh(path, ttl):
+            log(f'Using storage state created by another worker: {path}')
+            return path
+
+        log('Creating storage state')
+        # the flow itself is not an artifact of any test, it is never recorded
+        context_args = {k: v for k, v in browser_context_args.items() if not k.startswith('record_video')}
+        context = browser.new_context(
+            **context_args,
+            ignore_https_errors=pytestconfig.getoption('--ignore-https-errors')
+        )
+        try:
+            flow(context.new_page())
+            tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+            context.storage_state(path=tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            context.close()
+
+    log(f'Storage state saved: {path}')
+    return path
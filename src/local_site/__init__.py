@@ -0,0 +1,24 @@
+import pytest
+from .server import LocalAirbnbServer
+from .pages import get_listings, ITEMS_PER_PAGE
+
+
+def add_local_site_options(parser: pytest.Parser) -> None:
+    group = parser.getgroup("local-site", "Local Site")
+    group.addoption(
+        '--local-site',
+        action='store_true',
+        default=False
+    )
+    group.addoption(
+        '--local-site-results',
+        action='store',
+        type=int,
+        default=60
+    )
+    group.addoption(
+        '--local-site-latency',
+        action='store',
+        type=int,
+        default=0
+    )
@@ -0,0 +1,27 @@
+import sys
+import time
+import logging
+import argparse
+from .server import LocalAirbnbServer
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='serves the local stand-in airbnb site')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--results', type=int, default=60, help='listings per search')
+    parser.add_argument('--latency', type=int, default=0, help='ms added to every response')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = LocalAirbnbServer(port=args.port, results=args.results, latency_ms=args.latency)
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
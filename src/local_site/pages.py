@@ -0,0 +1,400 @@
+import json
+import math
+import hashlib
+import datetime
+from html import escape
+from dataclasses import dataclass
+from urllib.parse import quote, urlencode
+
+ITEMS_PER_PAGE = 18
+MAX_PAGES = 15
+GUEST_FAVORITE_RATING = 4.9
+GUESTS = ('adults', 'children', 'infants', 'pets')
+GUEST_FIELDS = {'adults': 'numberOfAdults', 'children': 'numberOfChildren', 'infants': 'numberOfInfants', 'pets': 'numberOfPets'}
+
+
+@dataclass(kw_only=True, frozen=True)
+class Listing:
+    id: int
+    title: str
+    rating: float | None
+    reviews: int
+
+
+def get_listings(location: str, count: int, guest_favorite: bool = False) -> list[Listing]:
+    """the same location always gets the same listings, ratings are derived from a hash of location + index"""
+    listings = []
+    for index in range(count):
+        seed = int(hashlib.sha1(f'{location.lower()}-{index}'.encode()).hexdigest(), 16)
+        reviews = seed % 400
+        # one listing out of eight is new, without a rating yet
+        rating = None if seed % 8 == 0 else round(4 + (seed >> 8) % 101 / 100, 2)
+        listings.append(Listing(id=100000 + seed % 900000, title=f'Home in {location} #{index + 1}', rating=rating, reviews=reviews))
+
+    if guest_favorite:
+        listings = [listing for listing in listings if listing.rating is not None and listing.rating >= GUEST_FAVORITE_RATING]
+    return listings
+
+
+STYLE = """
+body { font-family: sans-serif; margin: 0; }
+header { display: flex; justify-content: space-between; padding: 12px 24px; border-bottom: 1px solid #ddd; }
+#search-tabpanel { display: flex; gap: 8px; padding: 12px 24px; flex-wrap: wrap; position: relative; }
+#search-tabpanel > div, #search-tabpanel > button { border: 1px solid #ccc; border-radius: 24px; padding: 8px 16px; }
+[role="listbox"], [data-testid="calendar"], [data-testid="structured-search-input-field-guests-panel"] {
+    position: absolute; top: 64px; background: white; border: 1px solid #ccc; padding: 12px; z-index: 2;
+}
+[data-testid="calendar"] { display: flex; gap: 24px; }
+[data-testid="calendar"] button { width: 32px; height: 32px; }
+[role="option"], [role="menuitem"] { padding: 8px; cursor: pointer; }
+[data-testid="little-search"] { padding: 12px 24px; }
+.cards { display: grid; grid-template-columns: repeat(6, 1fr); gap: 16px; padding: 24px; }
+[data-testid="card-container"] { border: 1px solid #eee; padding: 8px; min-height: 80px; }
+nav { display: flex; gap: 8px; padding: 24px; }
+[role="dialog"], #login-modal, [data-testid="main-cookies-banner-container"] {
+    position: fixed; bottom: 24px; left: 24px; background: white; border: 1px solid #ccc; padding: 16px; z-index: 3;
+}
+[hidden] { display: none !important; }
+"""
+
+SEARCH_BAR_SCRIPT = """
+(() => {
+    const months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
+    const byTestId = id => document.querySelector(`[data-testid="${id}"]`);
+    const panel = document.getElementById('search-tabpanel');
+    const input = document.getElementById('bigsearch-query-location-input');
+    const listbox = panel.querySelector('[role="listbox"]');
+    const calendar = byTestId('calendar');
+    const checkInButton = byTestId('structured-search-input-field-split-dates-0');
+    const checkOutButton = byTestId('structured-search-input-field-split-dates-1');
+    const guestsButton = byTestId('structured-search-input-field-guests-button');
+    const guestsPanel = byTestId('structured-search-input-field-guests-panel');
+    const state = JSON.parse(panel.dataset.state);
+    let selecting = null;
+
+    const toggle = (button, element, open) => {
+        button.setAttribute('aria-expanded', String(open));
+        element.hidden = !open;
+    };
+    const dateText = value => {
+        if (!value) {
+            return 'Add dates';
+        }
+        const [year, month, day] = value.split('-').map(Number);
+        return `${months[month - 1]} ${day}`;
+    };
+    const render = () => {
+        checkInButton.querySelector('.value').textContent = dateText(state.checkin);
+        checkOutButton.querySelector('.value').textContent = dateText(state.checkout);
+    };
+
+    const littleSearch = byTestId('little-search');
+    if (littleSearch) {
+        littleSearch.addEventListener('click', () => {
+            littleSearch.hidden = true;
+            panel.hidden = false;
+        });
+    }
+
+    input.addEventListener('input', () => {
+        const value = input.value.trim();
+        listbox.innerHTML = '';
+        if (!value) {
+            listbox.hidden = true;
+            return;
+        }
+        for (const suffix of [', Netherlands', ' city center']) {
+            const option = document.createElement('div');
+            option.setAttribute('role', 'option');
+            option.textContent = value + suffix;
+            option.addEventListener('click', () => {
+                input.value = option.textContent;
+                listbox.hidden = true;
+            });
+            listbox.appendChild(option);
+        }
+        // suggestions arrive after a round trip on the real site
+        setTimeout(() => { listbox.hidden = false; }, 50);
+    });
+
+    checkInButton.addEventListener('click', () => {
+        selecting = 'checkin';
+        toggle(checkInButton, calendar, true);
+        checkOutButton.setAttribute('aria-expanded', 'false');
+    });
+    checkOutButton.addEventListener('click', () => {
+        selecting = 'checkout';
+        toggle(checkOutButton, calendar, true);
+        checkInButton.setAttribute('aria-expanded', 'false');
+    });
+    calendar.addEventListener('click', event => {
+        const day = event.target.closest('button[data-date]');
+        if (!day || day.disabled) {
+            return;
+        }
+        if (selecting === 'checkout' && state.checkin && day.dataset.date > state.checkin) {
+            state.checkout = day.dataset.date;
+            toggle(checkOutButton, calendar, false);
+            selecting = null;
+        } else {
+            state.checkin = day.dataset.date;
+            state.checkout = null;
+            selecting = 'checkout';
+            checkInButton.setAttribute('aria-expanded', 'false');
+            checkOutButton.setAttribute('aria-expanded', 'true');
+        }
+        render();
+    });
+
+    guestsButton.addEventListener('click', () => {
+        toggle(guestsButton, guestsPanel, guestsButton.getAttribute('aria-expanded') !== 'true');
+    });
+    guestsPanel.addEventListener('click', event => {
+        const button = event.target.closest('button[data-guest]');
+        if (!button) {
+            return;
+        }
+        const guest = button.dataset.guest;
+        state.guests[guest] = Math.max(0, state.guests[guest] + Number(button.dataset.step));
+        byTestId(`stepper-${guest}-value`).textContent = String(state.guests[guest]);
+    });
+
+    byTestId('structured-search-input-search-button').addEventListener('click', () => {
+        const location = (input.value.split(',')[0].trim() || 'Anywhere').replace(/\\b\\w/g, c => c.toUpperCase());
+        const params = new URLSearchParams();
+        params.append('refinement_paths[]', '/homes');
+        if (state.checkin && state.checkout) {
+            params.append('date_picker_type', 'calendar');
+            params.append('checkin', state.checkin);
+            params.append('checkout', state.checkout);
+        }
+        params.append('adults', String(Math.max(1, state.guests.adults)));
+        for (const guest of ['children', 'infants', 'pets']) {
+            if (state.guests[guest]) {
+                params.append(guest, String(state.guests[guest]));
+            }
+        }
+        window.location.href = `/s/${encodeURIComponent(location)}/homes?${params}`;
+    });
+
+    render();
+})();
+"""
+
+HOME_SCRIPT = """
+(() => {
+    const byTestId = id => document.querySelector(`[data-testid="${id}"]`);
+    const banner = byTestId('main-cookies-banner-container');
+    if (banner) {
+        banner.querySelector('button').addEventListener('click', () => {
+            document.cookie = 'consent=1; path=/';
+            banner.hidden = true;
+        });
+    }
+
+    const menu = document.querySelector('[role="menu"]');
+    const modal = document.getElementById('login-modal');
+    const email = modal.querySelector('input[type="email"]');
+    const password = modal.querySelector('input[type="password"]');
+    const submit = byTestId('signup-login-submit-btn');
+    byTestId('cypress-headernav-profile').addEventListener('click', () => { menu.hidden = !menu.hidden; });
+    menu.querySelector('[role="menuitem"]').addEventListener('click', () => {
+        menu.hidden = true;
+        modal.hidden = false;
+    });
+    byTestId('social-auth-button-email').addEventListener('click', () => {
+        email.hidden = false;
+        submit.hidden = false;
+    });
+    submit.addEventListener('click', () => {
+        if (password.hidden) {
+            password.hidden = false;
+            return;
+        }
+        document.cookie = 'session=1; path=/';
+        modal.hidden = true;
+        password.hidden = true;
+    });
+})();
+"""
+
+LISTING_SCRIPT = """
+(() => {
+    const popup = document.querySelector('[aria-label="Translation on"]');
+    popup.querySelector('button').addEventListener('click', () => { popup.hidden = true; });
+})();
+"""
+
+
+def document(title: str, body: str, script: str = '') -> str:
+    return (
+        f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{escape(title)}</title>'
+        f'<style>{STYLE}</style></head><body>{body}<script>{script}</script></body></html>'
+    )
+
+
+def format_date(value: str | None) -> str:
+    if not value:
+        return 'Add dates'
+    date = datetime.date.fromisoformat(value)
+    return f'{date.strftime("%b")} {date.day}'
+
+
+def render_calendar(today: datetime.date, months: int = 3) -> str:
+    html = []
+    first = today.replace(day=1)
+    for _ in range(months):
+        days = []
+        day = first
+        while day.month == first.month:
+            disabled = ' disabled' if day < today else ''
+            days.append(
+                f'<button data-testid="calendar-day-{day.strftime("%m/%d/%Y")}" data-date="{day.isoformat()}"{disabled}>'
+                f'{day.day}</button>'
+            )
+            day += datetime.timedelta(days=1)
+        html.append(f'<div><h3>{first.strftime("%B %Y")}</h3>{"".join(days)}</div>')
+        first = day
+    return f'<div data-testid="calendar" hidden>{"".join(html)}</div>'
+
+
+def render_search_bar(location: str, checkin: str | None, checkout: str | None, guests: dict[str, int], collapsed: bool) -> str:
+    state = json.dumps({'checkin': checkin, 'checkout': checkout, 'guests': guests}, separators=(',', ':'))
+    steppers = ''.join(
+        f'<div><span>{guest.title()}</span>'
+        f'<button data-testid="stepper-{guest}-decrease-button" data-guest="{guest}" data-step="-1">-</button>'
+        f'<span data-testid="stepper-{guest}-value">{guests[guest]}</span>'
+        f'<button data-testid="stepper-{guest}-increase-button" data-guest="{guest}" data-step="1">+</button></div>'
+        for guest in GUESTS
+    )
+    total_guests = sum(guests.values())
+    little_search = (
+        f'<div data-testid="little-search"><button>{escape(location)} · {format_date(checkin)} - '
+        f'{format_date(checkout)} · {total_guests} guests</button></div>'
+    ) if collapsed else ''
+
+    return (
+        f'{little_search}'
+        f'<div id="search-tabpanel" role="tabpanel" data-state="{escape(state)}"{" hidden" if collapsed else ""}>'
+        f'<input id="bigsearch-query-location-input" placeholder="Search destinations" autocomplete="off" value="{escape(location)}">'
+        f'<div role="listbox" hidden></div>'
+        f'<div role="button" data-testid="structured-search-input-field-split-dates-0" aria-expanded="false">'
+        f'<div>Check in</div><div class="value"></div></div>'
+        f'<div role="button" data-testid="structured-search-input-field-split-dates-1" aria-expanded="false">'
+        f'<div>Check out</div><div class="value"></div></div>'
+        f'{render_calendar(datetime.date.today())}'
+        f'<div role="button" data-testid="structured-search-input-field-guests-button" aria-expanded="false">Who</div>'
+        f'<div data-testid="structured-search-input-field-guests-panel" hidden>{steppers}</div>'
+        f'<button data-testid="structured-search-input-search-button">Search</button>'
+        f'</div>'
+    )
+
+
+def render_home(cookies: dict[str, str]) -> str:
+    banner = '' if cookies.get('consent') else (
+        '<div data-testid="main-cookies-banner-container"><p>We use cookies</p><button>Accept all</button></div>'
+    )
+    header = (
+        '<header><span>airbnb</span><div>'
+        '<button data-testid="cypress-headernav-profile">Menu</button>'
+        '<div role="menu" hidden><div role="menuitem">Log in</div><div role="menuitem">Sign up</div></div>'
+        '</div></header>'
+    )
+    login = (
+        '<div id="login-modal" hidden>'
+        '<button data-testid="social-auth-button-email">Continue with email</button>'
+        '<input type="email" hidden><input type="password" hidden>'
+        '<button data-testid="signup-login-submit-btn" hidden>Continue</button>'
+        '</div>'
+    )
+    guests = dict.fromkeys(GUESTS, 0)
+    body = header + render_search_bar('', None, None, guests, collapsed=False) + banner + login
+    return document('Local Airbnb', body, SEARCH_BAR_SCRIPT + HOME_SCRIPT)
+
+
+def render_results(location: str, query: dict[str, str], results: int) -> str:
+    guest_favorite = query.get('guest_favorite') == 'true'
+    listings = get_listings(location, results, guest_favorite)
+    pages = max(1, min(MAX_PAGES, math.ceil(len(listings) / ITEMS_PER_PAGE)))
+    offset = int(query.get('items_offset', 0))
+    current = min(pages, offset // ITEMS_PER_PAGE + 1)
+
+    guests = {guest: int(query.get(guest, 0)) for guest in GUESTS}
+    listing_query = urlencode({
+        key: value for key, value in query.items() if key in ('checkin', 'checkout', *GUESTS)
+    })
+
+    cards = []
+    for listing in listings[(current - 1) * ITEMS_PER_PAGE:current * ITEMS_PER_PAGE]:
+        rating = (
+            f'<span>Rating breakdown</span><span>{listing.rating} ({listing.reviews})</span>'
+            if listing.rating is not None else '<span>New</span>'
+        )
+        cards.append(
+            f'<div data-testid="card-container"><a href="/rooms/{listing.id}?{escape(listing_query)}">'
+            f'<div data-testid="listing-card-title">{escape(listing.title)}</div>'
+            f'<span>Entire home </span>{rating}</a></div>'
+        )
+
+    def page_href(number: int) -> str:
+        return f'/s/{quote(location)}/homes?{urlencode({**query, "items_offset": (number - 1) * ITEMS_PER_PAGE})}'
+
+    items = [
+        f'<button aria-current="page"><span>{number}</span></button>' if number == current
+        else f'<a href="{escape(page_href(number))}">{number}</a>'
+        for number in range(1, pages + 1)
+    ]
+    previous = f'<a aria-label="Previous" href="{escape(page_href(max(1, current - 1)))}">&lt;</a>'
+    next_disabled = 'true' if current == pages else 'false'
+    next_href = f' href="{escape(page_href(current + 1))}"' if current < pages else ''
+    pagination = (
+        f'<nav aria-label="Search results pagination">{previous}{"".join(items)}'
+        f'<a aria-label="Next" aria-disabled="{next_disabled}"{next_href}>&gt;</a></nav>'
+    ) if pages > 1 else ''
+
+    filter_query = {**query, 'guest_favorite': 'true'}
+    filter_query.pop('items_offset', None)
+    favorites = len(get_listings(location, results, guest_favorite=True))
+    filters = (
+        '<button data-testid="category-bar-filter-button">Filters</button>'
+        '<div data-testid="modal-container" hidden><div role="dialog" aria-label="Filters">'
+        '<button>Guest favorites</button>'
+        f'<a href="/s/{quote(location)}/homes?{escape(urlencode(filter_query))}"><span>Show {favorites} places</span></a>'
+        '</div></div>'
+    )
+    filters_script = """
+    (() => {
+        const modal = document.querySelector('[data-testid="modal-container"]');
+        document.querySelector('[data-testid="category-bar-filter-button"]').addEventListener('click', () => {
+            modal.hidden = false;
+        });
+    })();
+    """
+
+    body = (
+        render_search_bar(location, query.get('checkin'), query.get('checkout'), guests, collapsed=True)
+        + f'<main><span>Search results · {len(listings)} homes</span>{filters}'
+        + f'<div class="cards">{"".join(cards)}</div>{pagination}</main>'
+    )
+    return document(f'{location} - Local Airbnb', body, SEARCH_BAR_SCRIPT + filters_script)
+
+
+def render_listing(listing_id: str, query: dict[str, str]) -> str:
+    booking_query = {'checkin': query.get('checkin', ''), 'checkout': query.get('checkout', '')}
+    for guest in GUESTS:
+        booking_query[GUEST_FIELDS[guest]] = query.get(guest, '1' if guest == 'adults' else '0')
+
+    body = (
+        f'<h1>Listing {escape(listing_id)}</h1>'
+        '<div role="dialog" aria-label="Translation on"><p>Translation on</p><button aria-label="Close">x</button></div>'
+        '<div data-testid="book-it-default">'
+        f'<a href="/book/stays/{escape(listing_id)}?{escape(urlencode(booking_query))}">'
+        '<button data-testid="homes-pdp-cta-btn">Reserve</button></a>'
+        '</div>'
+    )
+    return document(f'Listing {listing_id} - Local Airbnb', body, LISTING_SCRIPT)
+
+
+def render_reservation(listing_id: str) -> str:
+    body = f'<div data-section-id="DESKTOP_TITLE"><h1>Request to book</h1></div><p>Listing {escape(listing_id)}</p>'
+    return document('Request to book - Local Airbnb', body)
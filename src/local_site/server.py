@@ -0,0 +1,157 @@
+import re
+import asyncio
+import logging
+import threading
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit, parse_qsl, unquote
+from typing import Optional
+from .pages import render_home, render_results, render_listing, render_reservation
+
+RESULTS_PATH = re.compile(r'^/s/([^/]+)(?:/homes)?/?$')
+LISTING_PATH = re.compile(r'^/(?:rooms|luxury/listing)/(\d+)$')
+RESERVATION_PATH = re.compile(r'^/book/stays/(\d+)$')
+
+
+class LocalAirbnbServer:
+    """
+    a stand-in for the airbnb pages the flows go through (home, results with pagination, listing, booking),
+    with the same data-testids / labels the page objects use. an asyncio http server running in a
+    background thread, so hundreds of contexts can hit it without a thread per connection
+
+    :param results: listings per search
+    :param latency_ms: added to every response
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, results: int = 60, latency_ms: int = 0):
+        self.host = host
+        self.port = port
+        self.results = results
+        self.latency_ms = latency_ms
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._stopping: Optional[asyncio.Event] = None
+        self._error: Optional[BaseException] = None
+        # {handler task: its connection}, closed on stop, keep-alive connections stay parked in readuntil
+        self._connections: dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    @staticmethod
+    def log(msg: str) -> None:
+        logging.info(f'[Local Site] {msg}')
+
+    def route(self, target: str, cookies: dict[str, str]) -> tuple[HTTPStatus, str]:
+        parts = urlsplit(target)
+        path = parts.path
+        query = dict(parse_qsl(parts.query))
+
+        if path == '/':
+            return HTTPStatus.OK, render_home(cookies)
+
+        if match := RESULTS_PATH.match(path):
+            return HTTPStatus.OK, render_results(unquote(match.group(1)), query, self.results)
+
+        if match := LISTING_PATH.match(path):
+            return HTTPStatus.OK, render_listing(match.group(1), query)
+
+        if match := RESERVATION_PATH.match(path):
+            return HTTPStatus.OK, render_reservation(match.group(1))
+
+        return HTTPStatus.NOT_FOUND, ''
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            # keep-alive, one request after the other on the same connection
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+
+                request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                method, target, _ = request_line.split(' ', 2)
+                headers = {}
+                for line in header_lines:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length:
+                    await reader.readexactly(length)
+
+                cookies = {key: morsel.value for key, morsel in SimpleCookie(headers.get('cookie', '')).items()}
+                status, html = self.route(target, cookies)
+                body = html.encode()
+
+                if self.latency_ms:
+                    await asyncio.sleep(self.latency_ms / 1000)
+
+                writer.write(
+                    f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+                    f'Content-Type: text/html; charset=utf-8\r\n'
+                    f'Content-Length: {len(body)}\r\n'
+                    f'Cache-Control: no-store\r\n'
+                    f'Connection: keep-alive\r\n\r\n'.encode('latin-1')
+                )
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+
+                if headers.get('connection', '').lower() == 'close':
+                    return
+        except (ConnectionError, asyncio.CancelledError):
+            # cancelled by stop, ending quietly (the stream callback logs the tasks that end with an exception)
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _serve(self) -> None:
+        self._stopping = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+
+        await self._stopping.wait()
+
+        self._server.close()
+        # the open connections keep their handlers alive, close them before the loop goes away
+        tasks = list(self._connections)
+        for task, writer in self._connections.items():
+            writer.close()
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        except Exception as e:
+            self._error = e
+        finally:
+            self._ready.set()
+            self._loop.close()
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._run, name='local-site', daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=10) or self._server is None or self._error is not None:
+            raise RuntimeError(f'Local site failed to start on {self.host}:{self.port}: {self._error}') from self._error
+        self.log(f'Serving on {self.url} (results: {self.results}, latency: {self.latency_ms}ms)')
+        return self.url
+
+    def stop(self) -> None:
+        if self._loop is None or self._stopping is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join(timeout=10)
+        self._thread = None
@@ -1,10 +1,21 @@
 import logging
+from urllib.parse import urljoin
 from playwright.sync_api import Page, Locator
 from ..utils.locators_object_base import LocatorsBase
-from ..utils.helper_methods import wait_for_result_cards_to_load
+from ..utils.steps import instrument_steps
+from ..utils.helper_methods import (
+    wait_for_result_cards_to_load,
+    get_items_offset_from_url,
+    set_items_offset_in_url
+)
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 
+PAGE_LINKS_SCRIPT = """
+elements => elements.map(element => ({text: element.textContent.trim(), href: element.getAttribute('href')}))
+"""
+
+
 class Locators(LocatorsBase):
 
     disabled_attrib = "aria-disabled"
@@ -16,11 +27,13 @@ class Locators(LocatorsBase):
         self.paginate_right_btn = self.root.get_by_label('Next')
         self.paginate_left_btn = self.root.get_by_label('Previous')
         self.current_page_btn = self.root.locator('button[aria-current="page"]')
+        self.page_items = self.root.locator('a, button')
 
     def get_page_locator_by_number(self, number: int) -> Locator:
         return self.root.locator('a').filter(has_text=str(number))
 
 
+@instrument_steps
 class PaginationBarComponent:
 
     component_name = "Pagination Bar"
@@ -87,3 +100,38 @@ class PaginationBarComponent:
 
     def is_pagination_bar_visible(self) -> bool:
         return self.locators.root.is_visible()
+
+    def get_page_links(self) -> dict[int, str | None]:
+        # numbered buttons / links of the bar in one round trip, the current page is a button without href
+        items = self.locators.page_items.evaluate_all(PAGE_LINKS_SCRIPT)
+        return {int(item['text']): item['href'] for item in items if item['text'].isdigit()}
+
+    def get_total_pages(self) -> int:
+        if not self.is_pagination_bar_visible():
+            return 1
+        links = self.get_page_links()
+        return max(links) if links else 1
+
+    def get_page_urls(self) -> list[str] | None:
+        """
+        builds the url of every results page from the offset pattern of the page 2 link
+
+        :return: urls ordered by page number, None when the pattern can not be derived
+        """
+        if not self.is_pagination_bar_visible():
+            return [self.page.url]
+
+        links = self.get_page_links()
+        total = max(links) if links else 1
+        if total == 1:
+            return [self.page.url]
+
+        template = links.get(2)
+        items_per_page = get_items_offset_from_url(template) if template else None
+        if not items_per_page:
+            self.log('Could not derive the pagination url pattern')
+            return None
+
+        self.log(f'Total pages: {total}, items per page: {items_per_page}')
+        template = urljoin(self.page.url, template)
+        return [set_items_offset_in_url(template, items_per_page * index) for index in range(total)]
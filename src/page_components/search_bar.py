@@ -1,26 +1,71 @@
 import datetime
 import logging
 from typing import Literal
+from dataclasses import dataclass
 from playwright.sync_api import Page, Locator
 from ..utils.locators_object_base import LocatorsBase
+from ..utils.steps import instrument_steps
 from ..utils.constants import DATES_DICT
+from ..utils.waits import wait_for_visible, wait_for_text, wait_for_non_empty_value
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 
+# reads the whole search bar in a single round trip
+SEARCH_BAR_STATE_SCRIPT = """
+({locationSelector, checkInSelector, checkOutSelector, stepperValueSelector, guests}) => {
+    const text = selector => {
+        const element = document.querySelector(selector);
+        return element ? element.textContent : null;
+    };
+    const location = document.querySelector(locationSelector);
+    const counts = {};
+    for (const guest of guests) {
+        const value = text(stepperValueSelector.replace('{value}', guest));
+        counts[guest] = value === null ? null : parseInt(value, 10);
+    }
+    return {
+        location: location ? location.value : null,
+        checkIn: text(checkInSelector),
+        checkOut: text(checkOutSelector),
+        guests: counts
+    };
+}
+"""
+
+
+@dataclass(kw_only=True, frozen=True)
+class SearchBarState:
+    location: str | None
+    check_in: str | None
+    check_out: str | None
+    # None when the guests panel is closed
+    adults: int | None
+    children: int | None
+    infants: int | None
+    pets: int | None
+
+
 class Locators(LocatorsBase):
     is_expended_attrib = 'aria-expanded'
     increase_css = '[data-testid="stepper-{value}-increase-button"]'
     decrease_css = '[data-testid="stepper-{value}-decrease-button"]'
+    value_css = '[data-testid="stepper-{value}-value"]'
+    # used by the locators and by SEARCH_BAR_STATE_SCRIPT
+    root_css = '#search-tabpanel'
+    search_dest_input_css = f'{root_css} #bigsearch-query-location-input'
+    check_in_css = '[data-testid="structured-search-input-field-split-dates-0"]'
+    check_out_css = '[data-testid="structured-search-input-field-split-dates-1"]'
+    guests = ('adults', 'children', 'infants', 'pets')
 
     def __init__(self, page: Page):
         super().__init__(page)
 
-        self.root = page.locator('#search-tabpanel')
+        self.root = page.locator(self.root_css)
         self.list_option = page.get_by_role('listbox').get_by_role('option')
-        self.search_dest_input = self.root.locator('#bigsearch-query-location-input')
+        self.search_dest_input = page.locator(self.search_dest_input_css)
 
-        self.check_in_btn = self.get_data_test_id_locator("structured-search-input-field-split-dates-0")
-        self.check_out_btn = self.get_data_test_id_locator("structured-search-input-field-split-dates-1")
+        self.check_in_btn = page.locator(self.check_in_css)
+        self.check_out_btn = page.locator(self.check_out_css)
 
         self.guests_btn = self.get_data_test_id_locator("structured-search-input-field-guests-button")
         self.guests_listbox = self.get_data_test_id_locator("structured-search-input-field-guests-panel")
@@ -34,11 +79,14 @@ class Locators(LocatorsBase):
         return self.page.locator(f'[data-testid="calendar-day-{m}/{d}/{date.year}"]')
 
     def get_guests_count_locator(self, value: str) -> Locator:
-        return self.page.locator(f'[data-testid="stepper-{value}-value"]')
+        return self.page.locator(self.value_css.format(value=value))
 
 
+@instrument_steps
 class SearchBarComponent:
 
+    component_name = "Search Bar"
+
     def __init__(self, page: Page):
         self.page = page
         self.locators = Locators(page)
@@ -65,16 +113,7 @@ class SearchBarComponent:
         option_locator.click()
 
         self.log("Asserting input")
-        intervals = 1000
-        elapsed_time = 0
-        timeout = 15 * 1000
-        while self.locators.search_dest_input.get_attribute('value') == '':
-
-            if timeout == elapsed_time:
-                raise PlaywrightTimeoutError
-
-            self.page.wait_for_timeout(intervals)
-            elapsed_time += intervals
+        wait_for_non_empty_value(self.locators.search_dest_input, timeout=15 * 1000)
 
     def insert_dates(self, check_in: datetime.datetime, check_out: datetime.datetime) -> bool:
         """
@@ -98,9 +137,11 @@ class SearchBarComponent:
         self.is_button_pressed(self.locators.check_in_btn, name="check-in")
 
         checkin_locator = self.locators.get_date_btn_locator(check_in)
-        self.page.wait_for_timeout(1000)
         checkout_locator = self.locators.get_date_btn_locator(check_out)
 
+        # the calendar is rendered once the check-in day is visible
+        wait_for_visible(checkin_locator)
+
         if checkin_locator.is_enabled() and checkout_locator.is_enabled():
             checkin_locator.click()
             checkout_locator.click()
@@ -124,14 +165,20 @@ class SearchBarComponent:
         match action:
             case 'increase':
                 locator = self.page.locator(self.locators.increase_css.format(value=guests))
+                step = 1
             case 'decrease':
                 locator = self.page.locator(self.locators.decrease_css.format(value=guests))
+                step = -1
             case _:
                 raise Exception(f'No such action: {action}')
 
+        count_locator = self.locators.get_guests_count_locator(guests)
+        count = int(count_locator.text_content())
+
         for _ in range(quantity):
             locator.click()
-            self.page.wait_for_timeout(500)
+            count += step
+            wait_for_text(count_locator, str(count))
 
     def click_search_button(self) -> None:
         self.log("Clicking Search Button")
@@ -148,21 +195,39 @@ class SearchBarComponent:
         else:
             self.log('Search bar expanded')
             self.locators.little_search_bar.click()
-            self.page.wait_for_timeout(1000)
+            wait_for_visible(self.locators.root)
             return True
 
+    def get_state(self) -> SearchBarState:
+        # document.querySelector does not wait, the locator reads it replaces did
+        wait_for_visible(self.locators.root)
+        state = self.page.evaluate(SEARCH_BAR_STATE_SCRIPT, {
+            'locationSelector': self.locators.search_dest_input_css,
+            'checkInSelector': self.locators.check_in_css,
+            'checkOutSelector': self.locators.check_out_css,
+            'stepperValueSelector': self.locators.value_css,
+            'guests': list(self.locators.guests)
+        })
+        return SearchBarState(
+            location=state['location'],
+            check_in=state['checkIn'],
+            check_out=state['checkOut'],
+            **state['guests']
+        )
+
     def get_guests_count(self, guest: str) -> int:
         text = self.locators.get_guests_count_locator(guest).text_content()
         return int(text)
 
     def assert_search_location(self, value: str) -> None:
         self.log(f'Asserting location to be: {value}')
-        input_value = self.locators.search_dest_input.get_attribute('value')
-        assert value.lower() in input_value.lower()
+        state = self.get_state()
+        assert state.location is not None and value.lower() in state.location.lower()
 
     def assert_search_dates(self, check_in: datetime.datetime, check_out: datetime.datetime) -> None:
-        in_text = self.locators.check_in_btn.text_content()
-        out_text = self.locators.check_out_btn.text_content()
+        state = self.get_state()
+        in_text = state.check_in or ''
+        out_text = state.check_out or ''
 
         in_date = f'{DATES_DICT.get(check_in.strftime("%B"))} {check_in.day}'
         out_date = f'{DATES_DICT.get(check_out.strftime("%B"))} {check_out.day}'
@@ -186,7 +251,10 @@ class SearchBarComponent:
             raise ValueError('Adults count can not be 0')
 
         self.locators.guests_btn.click()
-        assert self.get_guests_count('adults') == adults
-        assert self.get_guests_count('children') == children
-        assert self.get_guests_count('infants') == infants
-        assert self.get_guests_count('pets') == pets
+        wait_for_visible(self.locators.guests_listbox)
+
+        state = self.get_state()
+        assert state.adults == adults
+        assert state.children == children
+        assert state.infants == infants
+        assert state.pets == pets
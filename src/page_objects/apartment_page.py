@@ -1,10 +1,44 @@
 import logging
+from dataclasses import dataclass
 from playwright.sync_api import Page
 from ..page_components.search_bar import SearchBarComponent
 from ..utils.locators_object_base import LocatorsBase
+from ..utils.steps import instrument_steps
+from ..utils.page_scoped import PageScoped
+from ..utils.urls import absolute_url
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 
+# visibility follows playwright's definition: a non-empty box and not visibility:hidden
+BUTTONS_STATE_SCRIPT = """
+buttons => buttons.map(button => {
+    const box = button.getBoundingClientRect();
+    return {
+        visible: box.width > 0 && box.height > 0 && getComputedStyle(button).visibility !== 'hidden',
+        enabled: !button.disabled && button.getAttribute('aria-disabled') !== 'true',
+        text: button.textContent.trim()
+    };
+})
+"""
+
+
+@dataclass(kw_only=True, frozen=True)
+class ButtonState:
+    index: int
+    visible: bool
+    enabled: bool
+    text: str
+
+
+@dataclass(kw_only=True, frozen=True)
+class BookingWidgetState:
+    reserve_buttons: list[ButtonState]
+
+    @property
+    def clickable_reserve_button(self) -> ButtonState | None:
+        return next((btn for btn in self.reserve_buttons if btn.visible and btn.enabled), None)
+
+
 class Locators(LocatorsBase):
 
     def __init__(self, page: Page):
@@ -15,13 +49,15 @@ class Locators(LocatorsBase):
         self.reserve_btn = page.locator('[data-testid="book-it-default"]').locator('[data-testid="homes-pdp-cta-btn"]')
 
 
+@instrument_steps
 class ApartmentPage:
 
     page_name = "Apartment Page"
+    listing_paths = ('/room', '/luxury')
+    search_bar = PageScoped(SearchBarComponent)
 
     def __init__(self, page: Page):
         self.page = page
-        self.search_bar = SearchBarComponent(page)
         self.locators = Locators(page)
 
     @staticmethod
@@ -40,14 +76,17 @@ class ApartmentPage:
 
     def validate_navigation_to_apartment_page(self) -> None:
         self.log('Asserting navigation to apartment page')
-        room = "https://www.airbnb.com/room"
-        luxury = "https://www.airbnb.com/luxury"
         current = self.page.url
-        assert current.startswith(room) or current.startswith(luxury)
+        assert any(current.startswith(absolute_url(self.page, path)) for path in self.listing_paths)
+
+    def get_booking_widget_state(self) -> BookingWidgetState:
+        buttons = self.locators.reserve_btn.evaluate_all(BUTTONS_STATE_SCRIPT)
+        return BookingWidgetState(
+            reserve_buttons=[ButtonState(index=index, **button) for index, button in enumerate(buttons)]
+        )
 
     def click_reserve_button(self) -> None:
         self.log('Clicking Reserve button')
-        for btn in self.locators.reserve_btn.all():
-            if btn.is_visible() and btn.is_enabled():
-                btn.click()
-                return
+        btn = self.get_booking_widget_state().clickable_reserve_button
+        if btn:
+            self.locators.reserve_btn.nth(btn.index).click()
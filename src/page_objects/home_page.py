@@ -1,16 +1,43 @@
 import logging
 from playwright.sync_api import Page, expect
 from ..page_components.search_bar import SearchBarComponent
+from ..utils.locators_object_base import LocatorsBase
+from ..utils.steps import instrument_steps
+from ..utils.page_scoped import PageScoped
+from ..utils.urls import absolute_url
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 
+class Locators(LocatorsBase):
+
+    def __init__(self, page: Page):
+        super().__init__(page)
+
+        self.cookies_banner = self.get_data_test_id_locator("main-cookies-banner-container")
+        self.accept_cookies_btn = self.cookies_banner.get_by_role('button', name='Accept all')
+
+        self.profile_menu_btn = self.get_data_test_id_locator("cypress-headernav-profile")
+        self.login_menu_item = page.get_by_role('menuitem').filter(has_text='Log in')
+        self.continue_with_email_btn = self.get_data_test_id_locator("social-auth-button-email")
+        self.email_input = page.locator('input[type="email"]')
+        self.password_input = page.locator('input[type="password"]')
+        self.login_submit_btn = self.get_data_test_id_locator("signup-login-submit-btn")
+
+
+@instrument_steps
 class HomePage:
 
     page_name = "Home Page"
-    url = 'https://www.airbnb.com/'
+    path = '/'
+    search_bar = PageScoped(SearchBarComponent)
 
     def __init__(self, page: Page):
         self.page = page
-        self.search_bar = SearchBarComponent(page)
+        self.locators = Locators(page)
+
+    @property
+    def url(self) -> str:
+        return absolute_url(self.page, self.path)
 
     @staticmethod
     def log(msg: str) -> None:
@@ -18,7 +45,29 @@ class HomePage:
 
     def navigate_to_homepage(self) -> None:
         self.log("Navigating to airbnb homepage")
-        self.page.goto('/', wait_until="load")
+        self.page.goto(self.url, wait_until="load")
 
         self.log("Asserting page url")
         expect(self.page).to_have_url(self.url)
+
+    def accept_cookies_banner(self, timeout: int = 3000) -> None:
+        self.log('Waiting for cookies banner')
+        try:
+            self.locators.accept_cookies_btn.wait_for(state='visible', timeout=timeout)
+        except PlaywrightTimeoutError:
+            return
+
+        self.log('Accepting cookies')
+        self.locators.accept_cookies_btn.click()
+        self.locators.cookies_banner.wait_for(state='hidden')
+
+    def login(self, username: str, password: str) -> None:
+        self.log(f'Logging in as: {username}')
+        self.locators.profile_menu_btn.click()
+        self.locators.login_menu_item.click()
+        self.locators.continue_with_email_btn.click()
+        self.locators.email_input.fill(username)
+        self.locators.login_submit_btn.click()
+        self.locators.password_input.fill(password)
+        self.locators.login_submit_btn.click()
+        self.locators.password_input.wait_for(state='hidden')
@@ -1,6 +1,8 @@
 import logging
 from playwright.sync_api import Page
 from ..utils.locators_object_base import LocatorsBase
+from ..utils.steps import instrument_steps
+from ..utils.urls import absolute_url
 
 
 class Locators(LocatorsBase):
@@ -10,16 +12,21 @@ class Locators(LocatorsBase):
         self.confirm_title = page.locator('[data-section-id="DESKTOP_TITLE"]')
 
 
+@instrument_steps
 class ReservationPage:
 
     page_name = "Reservation Page"
-    url = 'https://www.airbnb.com/book'
+    path = '/book'
     adults_url_string = "numberOfAdults={count}"
 
     def __init__(self, page: Page):
         self.page = page
         self.locators = Locators(page)
 
+    @property
+    def url(self) -> str:
+        return absolute_url(self.page, self.path)
+
     @staticmethod
     def log(msg: str) -> None:
         logging.info(f'[Reservation Page] {msg}')
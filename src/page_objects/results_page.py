@@ -1,24 +1,62 @@
 import re
 import logging
+import contextlib
 import datetime
-from playwright.sync_api import Page, Locator
+from typing import Iterator
+from urllib.parse import quote, urlencode
+from playwright.sync_api import Page
 from ..page_components.search_bar import SearchBarComponent
 from ..page_components.pagination_bar import PaginationBarComponent
 from ..utils.locators_object_base import LocatorsBase
+from ..utils.steps import instrument_steps
+from ..utils.page_scoped import PageScoped
+from ..utils.urls import absolute_url
+from ..utils.background_tabs import open_background_tab
 from dataclasses import dataclass
-from ..utils.helper_methods import (
-    wait_for_result_cards_to_load,
-    extract_link_from_result_card,
-    extract_rating_from_result_card
-)
+from ..utils.helper_methods import wait_for_result_cards_to_load, extract_result_cards
+from ..utils.listing_queries import top_k, stop_when
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class CardInfo:
-    locator: Locator
     page_number: int
+    index: int
     rating: float
     url: str
+    title: str | None = None
+
+
+@dataclass(kw_only=True, frozen=True)
+class SearchQuery:
+    location: str
+    check_in: datetime.datetime
+    check_out: datetime.datetime
+    adults: int = 1
+    children: int = 0
+    infants: int = 0
+    pets: int = 0
+    time_format = "%Y-%m-%d"
+
+    def to_url(self) -> str:
+        """the results url the search bar would navigate to, relative to the base url"""
+        if self.adults < 1:
+            raise ValueError('Adults count can not be lower than 1')
+
+        # date_picker_type, checkin and checkout are kept together, see ResultsPage.url_dates_string
+        params = [
+            ('refinement_paths[]', '/homes'),
+            ('date_picker_type', 'calendar'),
+            ('checkin', self.check_in.strftime(self.time_format)),
+            ('checkout', self.check_out.strftime(self.time_format)),
+            ('adults', self.adults),
+        ]
+        params.extend((name, count) for name, count in [
+            ('children', self.children),
+            ('infants', self.infants),
+            ('pets', self.pets)
+        ] if count)
+
+        return f'/s/{quote(self.location.title())}/homes?{urlencode(params)}'
 
 
 class Locators(LocatorsBase):
@@ -36,17 +74,19 @@ class Locators(LocatorsBase):
         self.card_container = self.get_data_test_id_locator("card-container")
 
 
+@instrument_steps
 class ResultsPage:
     page_name = "Results Page"
-    location_url = 'https://www.airbnb.com/s/{location}'
+    location_path = '/s/{location}'
     url_dates_string = 'calendar&checkin={checkin}&checkout={checkout}'
     time_format = "%Y-%m-%d"
+    max_rating = 5.0
+    search_bar = PageScoped(SearchBarComponent)
+    pagination_bar = PageScoped(PaginationBarComponent)
 
     def __init__(self, page: Page):
         self.page = page
         self.locators = Locators(page)
-        self.search_bar = SearchBarComponent(page)
-        self.pagination_bar = PaginationBarComponent(page)
 
     @staticmethod
     def log(msg: str) -> None:
@@ -92,7 +132,7 @@ class ResultsPage:
 
         current_url = self.page.url
 
-        assert self.location_url.format(location=location.title()) in current_url
+        assert absolute_url(self.page, self.location_path.format(location=location.title())) in current_url
 
         url_dates = self.url_dates_string.format(
             checkin=check_in.strftime(self.time_format),
@@ -101,6 +141,13 @@ class ResultsPage:
 
         assert url_dates in current_url
 
+    def open(self, query: SearchQuery) -> None:
+        """fast path: navigates straight to the results of a search, without the search bar UI"""
+        url = absolute_url(self.page, query.to_url())
+        self.log(f'Opening results: {url}')
+        self.page.goto(url, wait_until="load")
+        wait_for_result_cards_to_load(self.page, self.page_name)
+
     def check_for_results_count(self) -> int | None:
         self.locators.results_header.wait_for(state='visible')
         text = self.locators.results_header.text_content().split(" ")
@@ -115,43 +162,19 @@ class ResultsPage:
         self.locators.show_filter_btn.click()
         wait_for_result_cards_to_load(self.page, self.page_name)
 
-    def get_highest_score_listing(self) -> list[CardInfo]:
+    @staticmethod
+    def _extract_page_cards(locators: Locators) -> list[dict]:
+        cards = extract_result_cards(locators.card_container)
+        if not cards:
+            raise Exception('There are no listing cards...')
+        return cards
 
-        highest_score = []
+    def _iter_result_pages(self) -> Iterator[tuple[int, list[dict]]]:
         current_page = 1
 
         while True:
 
-            card_li = self.locators.card_container.all()
-            if not card_li:
-                raise Exception('There are no listing cards...')
-
-            for card in card_li:
-
-                rating = extract_rating_from_result_card(card)
-                if rating is None:
-                    continue
-
-                if not highest_score or rating == highest_score[0].rating:
-                    highest_score.append(
-                        CardInfo(
-                            locator=card,
-                            rating=rating,
-                            page_number=current_page,
-                            url=extract_link_from_result_card(card)
-                        )
-                    )
-
-                elif rating > highest_score[0].rating:
-                    highest_score.clear()
-                    highest_score.append(
-                        CardInfo(
-                            locator=card,
-                            rating=rating,
-                            page_number=current_page,
-                            url=extract_link_from_result_card(card)
-                        )
-                    )
+            yield current_page, self._extract_page_cards(self.locators)
 
             if not self.pagination_bar.is_pagination_bar_visible():
                 break
@@ -161,20 +184,96 @@ class ResultsPage:
             else:
                 current_page += 1
 
+    def _iter_result_pages_in_tabs(self, tabs: int) -> Iterator[tuple[int, list[dict]]]:
+        urls = self.pagination_bar.get_page_urls()
+        if urls is None:
+            yield from self._iter_result_pages()
+            return
+
+        # the current page is the first results page
+        yield 1, self._extract_page_cards(self.locators)
+
+        for start in range(1, len(urls), tabs):
+            batch = urls[start:start + tabs]
+            self.log(f'Scanning pages {start + 1}-{start + len(batch)} in {len(batch)} tabs')
+
+            # navigations are only committed here, so every tab keeps loading while the others are read
+            # helper tabs, the test artifacts and page load metrics only cover the test's own pages
+            opened_tabs = []
+            for url in batch:
+                tab = open_background_tab(self.page.context)
+                opened_tabs.append(tab)
+                tab.goto(url, wait_until='commit')
+
+            try:
+                for offset, tab in enumerate(opened_tabs):
+                    wait_for_result_cards_to_load(tab, self.page_name)
+                    yield start + offset + 1, self._extract_page_cards(Locators(tab))
+            finally:
+                for tab in opened_tabs:
+                    tab.close()
+
+    def iter_listings(self, tabs: int = 1) -> Iterator[CardInfo]:
+        """
+        yields the listings page by page, the next page is only loaded when the
+        current one is consumed, so stopping the iteration stops the pagination
+
+        :param tabs: 1 paginates through the results, more than 1 opens the results pages
+            in that many sibling tabs at once (see _iter_result_pages_in_tabs)
+        """
+        pages = self._iter_result_pages_in_tabs(tabs) if tabs > 1 else self._iter_result_pages()
+
+        with contextlib.closing(pages):
+            for page_number, cards in pages:
+                for card in cards:
+                    if card['rating'] is None or card['url'] is None:
+                        continue
+                    yield CardInfo(
+                        page_number=page_number,
+                        index=card['index'],
+                        rating=card['rating'],
+                        url=card['url'],
+                        title=card['title']
+                    )
+
+    def get_highest_score_listing(self, tabs: int = 1) -> list[CardInfo]:
+        """
+        :param tabs: see iter_listings
+        :return: all the listings sharing the highest rating
+        """
+        highest_score = []
+
+        for listing in self.iter_listings(tabs):
+
+            if highest_score and listing.rating < highest_score[0].rating:
+                continue
+
+            if highest_score and listing.rating > highest_score[0].rating:
+                highest_score.clear()
+
+            highest_score.append(listing)
+
         return highest_score
 
+    def get_first_highest_score_listing(self, tabs: int = 1) -> CardInfo | None:
+        # a listing with the maximum rating can not be beaten, no need to paginate any further
+        # closed right away when stopping early, so the scan tabs are closed before the test moves on
+        with contextlib.closing(self.iter_listings(tabs)) as listings:
+            highest = top_k(stop_when(listings, lambda listing: listing.rating >= self.max_rating), 1)
+        return highest[0] if highest else None
+
     def navigate_to_card_page(self, card_info: CardInfo) -> None:
         self.log(f'Navigating to card page: {card_info.url}')
         self.page.goto(card_info.url)
         self.page.wait_for_load_state(state="load")
 
-    def get_highest_listing_flow(self) -> None:
+    def get_highest_listing_flow(self, tabs: int = 1) -> None:
         self.filter_results_by_highest_rate()
-        results_li = self.get_highest_score_listing()
+        highest = self.get_first_highest_score_listing(tabs=tabs)
 
-        if not results_li:
+        if not highest:
             raise Exception(f'[{self.page_name}] Something went wrong, no results were found')
 
         # navigating to the first highest rating card
         self.log('Navigating to highest rating listing')
-        self.navigate_to_card_page(results_li[0])
+        self.navigate_to_card_page(highest)
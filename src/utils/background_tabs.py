@@ -0,0 +1,24 @@
+from weakref import WeakKeyDictionary, WeakSet
+from playwright.sync_api import BrowserContext, Page
+
+# {context: tabs being opened}, the context "page" event fires while new_page is still running
+_opening: WeakKeyDictionary[BrowserContext, int] = WeakKeyDictionary()
+_background_tabs: WeakSet[Page] = WeakSet()
+
+
+def open_background_tab(context: BrowserContext) -> Page:
+    """
+    opens a helper tab (e.g. a results page scanned in parallel), which is not a page of the test:
+    no screenshot, video or page load metrics are kept for it (see is_background_tab)
+    """
+    _opening[context] = _opening.get(context, 0) + 1
+    try:
+        tab = context.new_page()
+    finally:
+        _opening[context] -= 1
+    _background_tabs.add(tab)
+    return tab
+
+
+def is_background_tab(page: Page) -> bool:
+    return page in _background_tabs or _opening.get(page.context, 0) > 0
@@ -1,19 +1,42 @@
+import json
+import base64
 import logging
+from urllib.parse import urlsplit, urlunsplit, parse_qs, urlencode, urljoin
 from playwright.sync_api import Page, Locator
+from .waits import wait_for_visible, wait_for_stable_count
+from .urls import DEFAULT_BASE_URL, get_base_url
 
+RESULT_CARD_SELECTOR = '[data-testid="card-container"]'
 
-def wait_for_result_cards_to_load(page: Page, page_name: str, timeout: int = 500) -> None:
+
+def wait_for_result_cards_to_load(page: Page, page_name: str) -> None:
     logging.info(f'[{page_name}] Waiting for results to load')
-    card = page.locator('[data-testid="card-container"]')
-    card.first.wait_for(state='visible')
+    wait_for_visible(page.locator(RESULT_CARD_SELECTOR).first)
 
-    # minor timeout so the pagination won't be too fast
-    page.wait_for_timeout(timeout)
+    # the cards are rendered in batches, wait until no more cards are being added
+    wait_for_stable_count(page, RESULT_CARD_SELECTOR)
 
 
-def extract_rating_from_result_card(card: Locator) -> float | None:
-    card.wait_for(state='visible')
-    text = card.text_content().split("breakdown")[-1].split(" ")[0]
+# reads every card of the page in a single round trip
+RESULT_CARDS_SCRIPT = """
+cards => cards.map((card, index) => {
+    const link = card.querySelector('a');
+    const title = card.querySelector('[data-testid="listing-card-title"]');
+    return {
+        index: index,
+        text: card.textContent,
+        href: link ? link.getAttribute('href') : null,
+        title: title ? title.textContent : null
+    };
+})
+"""
+
+
+def parse_rating_from_card_text(text: str | None) -> float | None:
+    if not text:
+        return
+
+    text = text.split("breakdown")[-1].split(" ")[0]
 
     try:
         rating = float(text)
@@ -23,7 +46,74 @@ def extract_rating_from_result_card(card: Locator) -> float | None:
     return rating
 
 
+def build_listing_link(href: str, base_url: str = DEFAULT_BASE_URL) -> str:
+    return urljoin(base_url, href)
+
+
+def extract_rating_from_result_card(card: Locator) -> float | None:
+    card.wait_for(state='visible')
+    return parse_rating_from_card_text(card.text_content())
+
+
 def extract_link_from_result_card(card: Locator) -> str:
     card.wait_for(state='visible')
     link = card.locator('a').first.get_attribute('href')
-    return f'https://airbnb.com{link}'
+    return build_listing_link(link, get_base_url(card.page))
+
+
+def extract_result_cards(cards: Locator) -> list[dict]:
+    """
+    bulk version of extract_rating_from_result_card / extract_link_from_result_card
+
+    :param cards: a locator matching all the result cards of the page
+    :return: [{'index': int, 'rating': float | None, 'url': str | None, 'title': str | None}, ...]
+    """
+    base_url = get_base_url(cards.page)
+    return [
+        {
+            'index': card['index'],
+            'rating': parse_rating_from_card_text(card['text']),
+            'url': build_listing_link(card['href'], base_url) if card['href'] else None,
+            'title': card['title'].strip() if card['title'] else None
+        }
+        for card in cards.evaluate_all(RESULT_CARDS_SCRIPT)
+    ]
+
+
+def _decode_cursor(cursor: str) -> dict | None:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        return
+
+
+def get_items_offset_from_url(url: str) -> int | None:
+    """reads the results offset of a pagination link, from items_offset or from the base64 json cursor"""
+    query = parse_qs(urlsplit(url).query)
+
+    if 'items_offset' in query:
+        return int(query['items_offset'][0])
+
+    if 'cursor' in query:
+        cursor = _decode_cursor(query['cursor'][0])
+        if cursor and 'items_offset' in cursor:
+            return int(cursor['items_offset'])
+
+    return
+
+
+def set_items_offset_in_url(url: str, offset: int) -> str:
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+
+    if 'items_offset' in query:
+        query['items_offset'] = [str(offset)]
+
+    if 'cursor' in query:
+        cursor = _decode_cursor(query['cursor'][0])
+        if cursor is not None:
+            cursor['items_offset'] = offset
+            encoded = base64.b64encode(json.dumps(cursor, separators=(',', ':')).encode()).decode()
+            query['cursor'] = [encoded]
+
+    return urlunsplit(parts._replace(query=urlencode(query, doseq=True)))
@@ -0,0 +1,29 @@
+import heapq
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar('T')
+
+
+def top_k(listings: Iterable[T], k: int, key: Callable[[T], Any] = attrgetter('rating')) -> list[T]:
+    # ties keep their page order, like a stable sort
+    return heapq.nlargest(k, listings, key=key)
+
+
+def first_matching(listings: Iterable[T], predicate: Callable[[T], bool]) -> T | None:
+    return next((listing for listing in listings if predicate(listing)), None)
+
+
+def stop_when(listings: Iterable[T], predicate: Callable[[T], bool]) -> Iterator[T]:
+    """
+    yields listings up to and including the first one matching predicate, then stops consuming.
+    a generator source is closed when stopping, its cleanup (e.g. closing tabs) runs right away
+    """
+    try:
+        for listing in listings:
+            yield listing
+            if predicate(listing):
+                return
+    finally:
+        if close := getattr(listings, 'close', None):
+            close()
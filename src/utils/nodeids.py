@@ -0,0 +1,11 @@
+import re
+
+# the browser_name parameter values of pytest-playwright
+BROWSER_NAMES = ('chromium', 'firefox', 'webkit')
+BROWSER_ID_PATTERN = re.compile(rf'[\[_-]({"|".join(BROWSER_NAMES)})(?=[\]-]|$)')
+
+
+def get_browser_from_nodeid(nodeid: str) -> str | None:
+    # pytest-playwright ids: test[chromium], renamed by conftest to test_chromium
+    match = BROWSER_ID_PATTERN.search(nodeid)
+    return match.group(1) if match else None
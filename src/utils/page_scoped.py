@@ -0,0 +1,33 @@
+from typing import Any, Generic, TypeVar
+from playwright.sync_api import Page
+
+T = TypeVar('T')
+
+# {class: instance} kept on the page itself, the instances hold their page so a cache keyed by the page
+# (even a weak one) would keep every page alive. on the page, page and instances are collected together
+INSTANCES_ATTRIBUTE = '_page_scoped_instances'
+
+
+def get_page_scoped(page: Page, cls: type[T]) -> T:
+    """returns the single instance of cls (a page object / component taking a Page) for page"""
+    instances = vars(page).setdefault(INSTANCES_ATTRIBUTE, {})
+    if cls not in instances:
+        instances[cls] = cls(page)
+    return instances[cls]
+
+
+class PageScoped(Generic[T]):
+    """
+    a descriptor for page objects and components, built on first access and shared by every owner
+    on the same page, so HomePage, ResultsPage and ApartmentPage use one SearchBarComponent
+
+    the owner needs a `page` attribute
+    """
+
+    def __init__(self, cls: type[T]):
+        self.cls = cls
+
+    def __get__(self, instance: Any, owner: type | None = None) -> T:
+        if instance is None:
+            return self
+        return get_page_scoped(instance.page, self.cls)
@@ -0,0 +1,108 @@
+import sys
+import math
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Any, Iterator, Optional
+from .nodeids import get_browser_from_nodeid
+
+STEPS_PROPERTY = 'steps'
+
+
+class StepTimer:
+    """
+    step listener, builds the timing tree of the page-object steps of one test:
+    [{"name", "ms", "status", "children": [...]}], a step called from another step is its child
+    """
+
+    def __init__(self):
+        self.steps: list[dict[str, Any]] = []
+        self._open: list[tuple[dict[str, Any], float]] = []
+
+    def on_step_start(self, name: str, depth: int) -> None:
+        node = {'name': name, 'ms': 0, 'status': 'passed', 'children': []}
+        siblings = self._open[-1][0]['children'] if self._open else self.steps
+        siblings.append(node)
+        self._open.append((node, time.perf_counter()))
+
+    def on_step_end(self, name: str, depth: int, error: BaseException | None) -> None:
+        if not self._open:
+            return
+
+        node, started = self._open.pop()
+        node['ms'] = round((time.perf_counter() - started) * 1000)
+        if error is not None:
+            node['status'] = 'failed'
+
+
+def _walk(steps: list[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    for node in steps:
+        yield node
+        yield from _walk(node.get('children', []))
+
+
+def percentile(values: list[float], percent: float) -> float:
+    # nearest rank, there are only a handful of samples per step
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def load_step_durations(paths: list[str]) -> dict[tuple[str, str], list[float]]:
+    """
+    reads the steps user property from report.json files (or folders holding run folders)
+
+    :return: (step name, browser) -> durations in ms, failed steps excluded
+    """
+    reports: list[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            # run folders may be nested (test-report-tests/test_airbnb_flows.py-<date>)
+            reports.extend(path.rglob('report.json'))
+        else:
+            reports.append(path)
+
+    durations: dict[tuple[str, str], list[float]] = {}
+    for report in reports:
+        try:
+            data = json.loads(report.read_text())
+        except (OSError, ValueError):
+            continue
+
+        for test in data.get('tests', []):
+            browser = get_browser_from_nodeid(test['nodeid']) or '-'
+            for user_property in test.get('user_properties', []):
+                for node in _walk(user_property.get(STEPS_PROPERTY, [])):
+                    if node['status'] == 'passed':
+                        durations.setdefault((node['name'], browser), []).append(node['ms'])
+
+    return durations
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='p50 / p95 of page-object steps across runs')
+    parser.add_argument('paths', nargs='+', help='report.json files, run folders or pytest_reports')
+    parser.add_argument('--by-browser', action='store_true', help='one row per step and browser')
+    args = parser.parse_args(argv)
+
+    durations = load_step_durations(args.paths)
+    if not args.by_browser:
+        merged: dict[tuple[str, str], list[float]] = {}
+        for (name, _), values in durations.items():
+            merged.setdefault((name, 'all'), []).extend(values)
+        durations = merged
+
+    if not durations:
+        print('no step timings found')
+        return 1
+
+    rows = sorted(durations.items(), key=lambda item: percentile(item[1], 95), reverse=True)
+    width = max(len(name) for name, _ in durations)
+    print(f"{'step':<{width}}  {'browser':<8} {'count':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for (name, browser), values in rows:
+        print(f'{name:<{width}}  {browser:<8} {len(values):>6} {percentile(values, 50):>8.0f} {percentile(values, 95):>8.0f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import inspect
+import logging
+import functools
+from typing import Any, Callable, Protocol, TypeVar
+
+T = TypeVar('T')
+
+
+class StepListener(Protocol):
+
+    def on_step_start(self, name: str, depth: int) -> None:
+        ...
+
+    def on_step_end(self, name: str, depth: int, error: BaseException | None) -> None:
+        ...
+
+
+_listeners: list[StepListener] = []
+# names of the steps currently running, a step called from another step is nested under it
+_stack: list[str] = []
+
+
+def add_step_listener(listener: StepListener) -> None:
+    _listeners.append(listener)
+
+
+def remove_step_listener(listener: StepListener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _notify(method: str, *args: Any) -> None:
+    for listener in list(_listeners):
+        try:
+            getattr(listener, method)(*args)
+        except Exception as e:
+            # a broken listener (tracing, timing...) must never fail the test itself
+            logging.error(f'[Steps] {type(listener).__name__}.{method} failed: {e}')
+
+
+def step(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            depth = len(_stack)
+            _stack.append(name)
+            _notify('on_step_start', name, depth)
+            error = None
+            try:
+                return func(*args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                _stack.pop()
+                _notify('on_step_end', name, depth, error)
+
+        wrapper.step_name = name
+        return wrapper
+
+    return decorator
+
+
+def instrument_steps(cls: type[T]) -> type[T]:
+    """
+    class decorator, turns every public method of a page object / component into a step
+    named "<page_name or component_name>.<method>". generators are left as is, they return
+    before their work is done
+    """
+    owner = getattr(cls, 'page_name', None) or getattr(cls, 'component_name', None) or cls.__name__
+
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith('_') or not inspect.isfunction(value) or inspect.isgeneratorfunction(value):
+            continue
+        setattr(cls, attr, step(f'{owner}.{attr}')(value))
+
+    return cls
@@ -0,0 +1,21 @@
+from weakref import WeakKeyDictionary
+from urllib.parse import urljoin
+from playwright.sync_api import BrowserContext, Page
+
+DEFAULT_BASE_URL = 'https://www.airbnb.com/'
+
+# {context: base url}, every page / tab of a context targets the same site
+_base_urls: WeakKeyDictionary[BrowserContext, str] = WeakKeyDictionary()
+
+
+def set_base_url(context: BrowserContext, base_url: str) -> None:
+    _base_urls[context] = base_url
+
+
+def get_base_url(page: Page) -> str:
+    return _base_urls.get(page.context, DEFAULT_BASE_URL)
+
+
+def absolute_url(page: Page, path: str) -> str:
+    """a site path (/s/Amsterdam, /book...) on the site the page's context targets"""
+    return urljoin(get_base_url(page), path)
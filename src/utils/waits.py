@@ -0,0 +1,125 @@
+import time
+import itertools
+import pytest
+from contextlib import contextmanager, suppress
+from typing import Any, Generator
+from playwright.sync_api import Page, Locator, expect, Error as PlaywrightError
+
+WAITS_PROPERTY = 'waits'
+
+# true once the selector matches stopped changing for quiet_ms, polled in the page. the state is kept per
+# wait (token), so a wait never inherits the quiet time of a previous one on the same window (client side
+# pagination), and the first / last matched elements are compared too, a re-rendered list of the same size
+# counts as a change
+STABLE_COUNT_SCRIPT = """
+([selector, quietMs, token]) => {
+    const matches = document.querySelectorAll(selector);
+    const count = matches.length;
+    const first = matches[0] || null;
+    const last = matches[count - 1] || null;
+    const now = performance.now();
+    const state = window.__stableCounts || (window.__stableCounts = {});
+    const entry = state[token];
+    if (!entry || entry.count !== count || entry.first !== first || entry.last !== last) {
+        state[token] = {count: count, first: first, last: last, since: now};
+        return false;
+    }
+    if (count > 0 && now - entry.since >= quietMs) {
+        delete state[token];
+        return true;
+    }
+    return false;
+}
+"""
+# the script only removes its entry on success
+CLEAR_STABLE_COUNT_SCRIPT = 'token => { if (window.__stableCounts) delete window.__stableCounts[token]; }'
+_wait_tokens = itertools.count()
+
+
+class WaitTracker:
+    """the time a test spends blocked in condition waits"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.condition_ms = 0.0
+        self.condition_waits = 0
+
+    @contextmanager
+    def track_condition(self) -> Generator[None, None, None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.condition_ms += (time.perf_counter() - start) * 1000
+            self.condition_waits += 1
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            'condition_ms': round(self.condition_ms),
+            'condition_waits': self.condition_waits
+        }
+
+
+# tests run one at a time in a worker process, a single tracker per worker is enough
+wait_tracker = WaitTracker()
+
+
+def wait_for_visible(locator: Locator, timeout: float | None = None) -> None:
+    with wait_tracker.track_condition():
+        locator.wait_for(state='visible', timeout=timeout)
+
+
+def wait_for_text(locator: Locator, text: str, timeout: float | None = None) -> None:
+    with wait_tracker.track_condition():
+        expect(locator).to_have_text(text, timeout=timeout)
+
+
+def wait_for_non_empty_value(locator: Locator, timeout: float | None = None) -> None:
+    with wait_tracker.track_condition():
+        expect(locator).not_to_have_value('', timeout=timeout)
+
+
+def wait_for_stable_count(page: Page, selector: str, quiet_ms: int = 200, timeout: float | None = None) -> None:
+    """waits until at least one element matches selector and the matches stopped changing for quiet_ms"""
+    token = next(_wait_tokens)
+    with wait_tracker.track_condition():
+        try:
+            page.wait_for_function(STABLE_COUNT_SCRIPT, arg=[selector, quiet_ms, token], polling=50, timeout=timeout)
+        except PlaywrightError:
+            # a timed out wait leaves its entry on the window, nothing to clear when the page is gone
+            with suppress(PlaywrightError):
+                page.evaluate(CLEAR_STABLE_COUNT_SCRIPT, token)
+            raise
+
+
+class WaitsSummary:
+    """aggregates the waits user property of every test, on the controller"""
+
+    def __init__(self):
+        self.tests = 0
+        self.condition_ms = 0
+        self.condition_waits = 0
+
+    def add_report(self, report: pytest.TestReport) -> None:
+        if report.when != 'teardown':
+            return
+
+        for name, value in report.user_properties:
+            if name != WAITS_PROPERTY:
+                continue
+            self.tests += 1
+            self.condition_ms += value['condition_ms']
+            self.condition_waits += value['condition_waits']
+
+    def write_terminal_summary(self, terminalreporter: Any) -> None:
+        if not self.tests:
+            return
+
+        terminalreporter.write_sep('=', 'sleep budget')
+        terminalreporter.write_line(f'tests: {self.tests}')
+        terminalreporter.write_line(f'blocked in condition waits: {self.condition_ms / 1000:.1f}s ({self.condition_waits} waits)')
+
+
+waits_summary = WaitsSummary()
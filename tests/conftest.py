@@ -4,8 +4,32 @@ from playwright.sync_api import BrowserContext, Browser
 from typing import Generator
 from pathlib import Path
 import importlib
-from src.extended_pytest_playwright import create_extended_options, init_context, handle_artifacts
+from src.extended_pytest_playwright import (
+    create_extended_options,
+    init_context,
+    handle_artifacts,
+    make_xdist_scheduler,
+    handle_memory_pressure,
+    measure_engine_rss,
+    flush_engine_rss,
+    get_cached_storage_state,
+    network_summary,
+    roundtrip_summary,
+    artifact_writer,
+    artifact_writer_summary,
+    finish_artifact_writer,
+    context_pool,
+    finish_artifact_store,
+    get_step_tracer,
+    get_navigation_collector,
+    navigation_metrics
+)
 from src.airbnb_manager import AirbnbManager
+from src.local_site import LocalAirbnbServer, add_local_site_options
+from src.utils.background_tabs import is_background_tab
+from src.utils.waits import wait_tracker, waits_summary, WAITS_PROPERTY
+from src.utils.steps import add_step_listener, remove_step_listener
+from src.utils.step_timing import StepTimer, STEPS_PROPERTY
 
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -13,6 +37,52 @@ ROOT = Path(__file__).resolve().parent.parent
 
 # --------------------------------------------------- FIXTURES ---------------------------------------------------------
 
+@pytest.fixture(scope='session')
+def base_url(pytestconfig: pytest.Config) -> Generator[str | None, None, None]:
+    # overrides pytest-base-url, with --local-site every worker serves its own stand-in site
+    if not pytestconfig.getoption('--local-site'):
+        yield pytestconfig.getoption('base_url')
+        return
+
+    server = LocalAirbnbServer(
+        results=pytestconfig.getoption('--local-site-results'),
+        latency_ms=pytestconfig.getoption('--local-site-latency')
+    )
+    yield server.start()
+    server.stop()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def flush_artifacts(browser_context_args: dict) -> Generator[None, None, None]:
+    # torn down before browser_context_args, whose artifacts folder holds the raw videos being moved
+    yield
+    artifact_writer.flush()
+
+
+@pytest.fixture(scope='session')
+def pooled_contexts(browser: Browser) -> Generator[None, None, None]:
+    # torn down before the browser, so the warm contexts of --context-pool are closed cleanly
+    yield
+    context_pool.close_all(browser)
+
+
+@pytest.fixture(scope='session')
+def storage_state(
+        browser: Browser,
+        browser_context_args: dict,
+        pytestconfig: pytest.Config
+) -> Path:
+    username = pytestconfig.getoption('--username')
+    password = pytestconfig.getoption('--password')
+
+    return get_cached_storage_state(
+        browser=browser,
+        browser_context_args=browser_context_args,
+        pytestconfig=pytestconfig,
+        flow=lambda page: AirbnbManager(page, browser_context_args.get('base_url')).prepare_session(username, password)
+    )
+
+
 @pytest.fixture
 def extended_context(
         browser: Browser,
@@ -22,16 +92,35 @@ def extended_context(
         browser_name: str
 ) -> Generator[BrowserContext, None, None]:
 
+    handle_memory_pressure(pytestconfig)
+
+    if pytestconfig.getoption('--context-pool'):
+        request.getfixturevalue('pooled_contexts')
+
+    use_storage_state = pytestconfig.getoption('--use-storage-state')
+
     context, pages = init_context(
         browser=browser,
         browser_context_args=browser_context_args,
         pytestconfig=pytestconfig,
         request=request,
-        browser_name=browser_name
+        browser_name=browser_name,
+        storage_state=request.getfixturevalue('storage_state') if use_storage_state else None,
+        page_filter=lambda page: not is_background_tab(page)
     )
 
+    # page-object steps mark the trace chunk boundaries and tag the measured page loads
+    step_listeners = [listener for listener in (get_step_tracer(request), get_navigation_collector(request)) if listener]
+    for listener in step_listeners:
+        add_step_listener(listener)
+
     yield context
 
+    for listener in step_listeners:
+        remove_step_listener(listener)
+
+    measure_engine_rss(browser, browser_name, pytestconfig)
+
     handle_artifacts(
         context=context,
         pytestconfig=pytestconfig,
@@ -43,15 +132,53 @@ def extended_context(
 @pytest.fixture
 def get_manager(
         extended_context: BrowserContext,
-        request: pytest.FixtureRequest
+        request: pytest.FixtureRequest,
+        base_url: str | None
 ) -> Generator[AirbnbManager, None, None]:
     page = extended_context.new_page()
-    yield AirbnbManager(page)
+    wait_tracker.reset()
+    step_timer = StepTimer()
+    add_step_listener(step_timer)
+
+    yield AirbnbManager(page, base_url)
+
+    remove_step_listener(step_timer)
+    request.node.user_properties.append((WAITS_PROPERTY, wait_tracker.summary()))
+    request.node.user_properties.append((STEPS_PROPERTY, step_timer.steps))
 
 
 # ------------------------------------------------HOOKS-----------------------------------------------------------------
 def pytest_addoption(parser: pytest.Parser) -> None:
     create_extended_options(parser)
+    add_local_site_options(parser)
+
+
+def pytest_xdist_make_scheduler(config: pytest.Config, log):
+    return make_xdist_scheduler(config, log)
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    finish_artifact_writer(session.config)
+    flush_engine_rss(session.config.getoption('--history-folder'))
+    navigation_metrics.flush(session.config)
+    finish_artifact_store(session.config)
+
+
+def pytest_testnodedown(node, error) -> None:
+    artifact_writer_summary.add_worker_output(node)
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    network_summary.add_report(report)
+    waits_summary.add_report(report)
+    roundtrip_summary.add_report(report)
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    network_summary.write_terminal_summary(terminalreporter)
+    waits_summary.write_terminal_summary(terminalreporter)
+    roundtrip_summary.write_terminal_summary(terminalreporter)
+    artifact_writer_summary.write_terminal_summary(terminalreporter)
 
 
 def pytest_itemcollected(item: pytest.Item) -> None:
@@ -1,17 +1,31 @@
 import logging
 import pytest
 from datetime import datetime, timedelta
+from src.page_objects.results_page import SearchQuery
 
 TODAY = datetime.now()
 TOMORROW = TODAY + timedelta(days=1)
 LOCATION = 'Amsterdam'
 ADULTS = 2
 CHILDREN = 1
+RESULT_TABS = 4
+QUERY = SearchQuery(location=LOCATION, check_in=TODAY, check_out=TOMORROW, adults=ADULTS, children=CHILDREN)
 
 
 @pytest.fixture(scope='function')
 def before_each_test(get_manager):
 
+    m = get_manager
+    m.results_page.open(QUERY)
+
+    m.results_page.validate_navigation_to_results_page(check_in=TODAY, check_out=TOMORROW, location=LOCATION)
+    m.results_page.assert_guests_in_url_link(adults=ADULTS, children=CHILDREN)
+
+
+@pytest.fixture(scope='function')
+def before_each_search_bar_test(get_manager):
+    # the search bar UI path, for the tests that cover the home page search bar itself
+
     m = get_manager
     search = m.home_page.search_bar
 
@@ -28,10 +42,10 @@ def before_each_test(get_manager):
 
 def test_get_highest_rating_page(before_each_test, get_manager):
     m = get_manager
-    m.results_page.get_highest_listing_flow()
+    m.results_page.get_highest_listing_flow(tabs=RESULT_TABS)
 
 
-def test_confirm_booking_details(before_each_test, get_manager):
+def test_confirm_booking_details(before_each_search_bar_test, get_manager):
     m = get_manager
     search = m.results_page.search_bar
 
@@ -80,7 +94,7 @@ def test_change_booking_dates(before_each_test, get_manager):
 def test_booking_reservation(before_each_test, get_manager):
     m = get_manager
 
-    m.results_page.get_highest_listing_flow()
+    m.results_page.get_highest_listing_flow(tabs=RESULT_TABS)
     m.apartment_page.check_for_translation_popup()
     m.apartment_page.validate_navigation_to_apartment_page()
     m.apartment_page.click_reserve_button()
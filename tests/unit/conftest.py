@@ -0,0 +1,10 @@
+import pytest
+from typing import Generator
+
+
+# ------------------------------------------------ FIXTURES ------------------------------------------------------------
+
+@pytest.fixture(scope='session', autouse=True)
+def flush_artifacts() -> Generator[None, None, None]:
+    # overrides the e2e one, unit tests do not launch playwright
+    yield
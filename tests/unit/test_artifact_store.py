@@ -0,0 +1,121 @@
+import os
+import time
+import sqlite3
+import pytest
+from pathlib import Path
+from src.extended_pytest_playwright.artifact_store import ArtifactStore, ARTIFACT_STORE_FOLDER_NAME
+
+DAY = 24 * 60 * 60
+
+
+@pytest.fixture
+def history(tmp_path: Path) -> Path:
+    return tmp_path / 'pytest_reports'
+
+
+@pytest.fixture
+def store(history: Path) -> ArtifactStore:
+    return ArtifactStore(str(history / ARTIFACT_STORE_FOLDER_NAME))
+
+
+def add_test_artifacts(store: ArtifactStore, run_folder: Path, test: str, files: dict[str, bytes]) -> Path:
+    folder = run_folder / test.replace('::', '-')
+    folder.mkdir(parents=True, exist_ok=True)
+    for name, data in files.items():
+        (folder / name).write_bytes(data)
+    store.add(str(run_folder), str(folder), {'test': test, 'status': 'failed', 'files': list(files)})
+    return folder
+
+
+def set_run_created(store: ArtifactStore, run_folder: Path, created: float) -> None:
+    with sqlite3.connect(store.index_path) as connection:
+        connection.execute('UPDATE runs SET created = ? WHERE run = ?', (created, store.run_id(str(run_folder))))
+    connection.close()
+
+
+def blob_count(store: ArtifactStore) -> int:
+    return sum(len(files) for _, _, files in os.walk(store.blobs_folder))
+
+
+# ------------------------------------------------ DEDUP ---------------------------------------------------------------
+
+def test_identical_files_are_stored_once(store: ArtifactStore, history: Path):
+    first = add_test_artifacts(store, history / 'test-report-a', 'test_a', {'screenshot.png': b'same'})
+    second = add_test_artifacts(store, history / 'test-report-b', 'test_b', {'screenshot.png': b'same'})
+
+    assert blob_count(store) == 1
+    # both report files are hard links to the blob, still readable in place
+    assert os.stat(first / 'screenshot.png').st_ino == os.stat(second / 'screenshot.png').st_ino
+    assert (second / 'screenshot.png').read_bytes() == b'same'
+
+
+# ------------------------------------------------ INDEX ---------------------------------------------------------------
+
+def test_nested_runs_sharing_a_folder_name_are_indexed_apart(store: ArtifactStore, history: Path):
+    flows = history / 'test-report-tests' / 'test_airbnb_flows.py-18-10-2026_10-00-00'
+    other = history / 'test-report-other' / 'test_airbnb_flows.py-18-10-2026_10-00-00'
+    folder = add_test_artifacts(store, flows, 'tests/test_airbnb_flows.py::test_a', {'trace.zip': b'a'})
+    add_test_artifacts(store, other, 'tests/test_other.py::test_a', {'trace.zip': b'b'})
+
+    found = store.find('test_airbnb_flows.py::test_a')
+
+    assert [artifact['run'] for artifact in found] == ['test-report-tests/test_airbnb_flows.py-18-10-2026_10-00-00']
+    assert found[0]['path'] == str(folder / 'trace.zip')
+    assert len(store.find('::test_a')) == 2
+
+
+def test_run_manifest_lists_the_tests_of_the_run(store: ArtifactStore, history: Path):
+    run_folder = history / 'test-report-run'
+    add_test_artifacts(store, run_folder, 'test_a', {'screenshot.png': b'a', 'trace.zip': b'b'})
+
+    manifest_path = store.write_run_manifest(str(run_folder))
+
+    assert manifest_path == str(run_folder / 'artifacts.json')
+    assert '"test_a"' in Path(manifest_path).read_text()
+
+
+# ------------------------------------------------ RETENTION -----------------------------------------------------------
+
+def test_old_runs_are_removed_with_their_empty_parents_and_blobs(store: ArtifactStore, history: Path):
+    old = history / 'test-report-tests' / 'test_airbnb_flows.py-01-10-2026_10-00-00'
+    recent = history / 'test-report-recent'
+    add_test_artifacts(store, old, 'test_a', {'video.webm': b'old'})
+    add_test_artifacts(store, recent, 'test_a', {'video.webm': b'recent'})
+    set_run_created(store, old, time.time() - 30 * DAY)
+    set_run_created(store, recent, time.time() - DAY)
+
+    removed = store.apply_retention(max_age_days=14, keep_since=time.time())
+
+    assert removed == [store.run_id(str(old))]
+    assert not (history / 'test-report-tests').exists()
+    assert recent.exists()
+    assert blob_count(store) == 1
+
+
+def test_oldest_runs_are_removed_until_the_size_budget_fits(store: ArtifactStore, history: Path):
+    runs = [history / f'test-report-{index}' for index in range(3)]
+    for index, run_folder in enumerate(runs):
+        add_test_artifacts(store, run_folder, 'test_a', {'trace.zip': bytes([index]) * 600 * 1024})
+        set_run_created(store, run_folder, time.time() - (3 - index) * DAY)
+
+    removed = store.apply_retention(max_size_mb=1, keep_since=time.time())
+
+    assert removed == [store.run_id(str(runs[0])), store.run_id(str(runs[1]))]
+    assert [run_folder.exists() for run_folder in runs] == [False, False, True]
+
+
+def test_runs_of_the_current_session_are_kept(store: ArtifactStore, history: Path):
+    run_folder = history / 'test-report-current'
+    add_test_artifacts(store, run_folder, 'test_a', {'trace.zip': b'x' * 2 * 1024 ** 2})
+
+    assert store.apply_retention(max_size_mb=1, max_age_days=0.001, keep_since=0) == []
+    assert run_folder.exists()
+
+
+def test_folders_outside_the_history_folder_are_never_deleted(store: ArtifactStore, tmp_path: Path):
+    outside = tmp_path / 'elsewhere' / 'test-report-run'
+    add_test_artifacts(store, outside, 'test_a', {'trace.zip': b'x'})
+    set_run_created(store, outside, time.time() - 30 * DAY)
+
+    assert store.apply_retention(max_age_days=14, keep_since=time.time()) == [str(outside)]
+    assert outside.exists()
@@ -0,0 +1,69 @@
+import time
+import threading
+from pathlib import Path
+from src.extended_pytest_playwright.artifact_writer import ArtifactWriter, ArtifactWriterSummary
+
+
+class FakeNode:
+    def __init__(self, workeroutput: dict):
+        self.workeroutput = workeroutput
+
+
+class FakeTerminalReporter:
+    def __init__(self):
+        self.lines: list[str] = []
+
+    def write_sep(self, sep: str, title: str, **markup: bool) -> None:
+        self.lines.append(title)
+
+    def write_line(self, line: str) -> None:
+        self.lines.append(line)
+
+
+def test_jobs_run_in_submission_order_off_the_caller_thread():
+    writer = ArtifactWriter()
+    ran = []
+    for index in range(20):
+        writer.submit(lambda index=index: ran.append((index, threading.current_thread().name)))
+    writer.close()
+
+    assert [index for index, _ in ran] == list(range(20))
+    assert {thread for _, thread in ran} == {'artifact-writer'}
+
+
+def test_flush_waits_for_the_pending_jobs(tmp_path: Path):
+    writer = ArtifactWriter()
+    writer.submit(lambda: time.sleep(0.1))
+    writer.write_bytes(str(tmp_path / 'test' / 'screenshot.png'), b'png')
+    writer.move(str(tmp_path / 'test' / 'screenshot.png'), str(tmp_path / 'moved' / 'screenshot.png'))
+
+    writer.flush()
+
+    assert (tmp_path / 'moved' / 'screenshot.png').read_bytes() == b'png'
+    writer.close()
+
+
+def test_a_failing_job_is_counted_and_the_next_jobs_still_run(tmp_path: Path):
+    writer = ArtifactWriter()
+    writer.move(str(tmp_path / 'missing.webm'), str(tmp_path / 'test' / 'video.webm'))
+    writer.submit(lambda: 1 / 0)
+    writer.write_bytes(str(tmp_path / 'screenshot.png'), b'png')
+    writer.close()
+
+    assert writer.failed_jobs == 2
+    assert writer.first_error.startswith('FileNotFoundError')
+    assert (tmp_path / 'screenshot.png').exists()
+
+
+def test_summary_reports_the_failed_jobs_of_every_worker():
+    summary = ArtifactWriterSummary()
+    summary.add_worker_output(FakeNode({'artifact_writer_failed_jobs': (2, 'OSError: disk full')}))
+    summary.add_worker_output(FakeNode({'artifact_writer_failed_jobs': (1, 'ValueError: other')}))
+    summary.add_worker_output(FakeNode({}))
+    terminalreporter = FakeTerminalReporter()
+
+    summary.write_terminal_summary(terminalreporter)
+
+    assert terminalreporter.lines[0] == 'artifact writer'
+    assert terminalreporter.lines[1].startswith('3 artifact jobs failed')
+    assert terminalreporter.lines[1].endswith('first error: OSError: disk full')
@@ -0,0 +1,30 @@
+from typing import Any, Callable
+from src.utils.background_tabs import open_background_tab, is_background_tab
+
+
+class FakePage:
+    def __init__(self, context: 'FakeContext'):
+        self.context = context
+
+
+class FakeContext:
+    def __init__(self, on_page: Callable[[Any], None]):
+        self.on_page = on_page
+
+    def new_page(self) -> FakePage:
+        # like playwright, the context "page" event fires before new_page returns
+        page = FakePage(self)
+        self.on_page(page)
+        return page
+
+
+def test_background_tab_is_known_in_the_page_event():
+    seen = []
+    context = FakeContext(lambda page: seen.append(is_background_tab(page)))
+
+    tab = open_background_tab(context)
+    page = context.new_page()
+
+    assert seen == [True, False]
+    assert is_background_tab(tab)
+    assert not is_background_tab(page)
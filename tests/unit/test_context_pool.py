@@ -0,0 +1,118 @@
+import json
+from typing import Any
+from pathlib import Path
+from src.extended_pytest_playwright.context_pool import ContextPool
+
+
+class FakeBrowser:
+    def is_connected(self) -> bool:
+        return True
+
+
+class FakePage:
+    def __init__(self):
+        self.evaluated: list[tuple[str, Any]] = []
+        self.closed = False
+
+    def evaluate(self, script: str, arg: Any = None) -> None:
+        self.evaluated.append((script, arg))
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, browser: FakeBrowser):
+        self.browser = browser
+        self.pages: list[FakePage] = []
+        self.cookies: list[dict[str, Any]] = []
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+    def remove_listener(self, event: str, handler: Any) -> None:
+        pass
+
+    def clear_cookies(self) -> None:
+        self.cookies = []
+
+    def add_cookies(self, cookies: list[dict[str, Any]]) -> None:
+        self.cookies.extend(cookies)
+
+    def clear_permissions(self) -> None:
+        pass
+
+    def unroute_all(self, behavior: str) -> None:
+        pass
+
+    def set_offline(self, offline: bool) -> None:
+        pass
+
+    def set_extra_http_headers(self, headers: dict[str, str]) -> None:
+        pass
+
+
+def release_new_context(pool: ContextPool, browser: FakeBrowser, context_args: dict[str, Any]) -> FakeContext:
+    context = FakeContext(browser)
+    pool.track(browser, context_args, context, lambda page: None)
+    pool.release(context, failed=False)
+    return context
+
+
+def test_released_context_is_reused_for_the_same_options():
+    pool = ContextPool()
+    browser = FakeBrowser()
+    context = release_new_context(pool, browser, {'locale': 'en-US'})
+
+    assert pool.acquire(browser, {'locale': 'de-DE'}) is None
+    assert pool.acquire(browser, {'locale': 'en-US'}) is context
+
+
+def test_context_of_a_failed_test_is_closed():
+    pool = ContextPool()
+    browser = FakeBrowser()
+    context = FakeContext(browser)
+    pool.track(browser, {}, context, lambda page: None)
+
+    pool.release(context, failed=True)
+
+    assert context.closed
+    assert pool.acquire(browser, {}) is None
+
+
+def test_close_all_closes_the_idle_contexts_of_one_browser():
+    pool = ContextPool()
+    chromium, firefox = FakeBrowser(), FakeBrowser()
+    chromium_context = release_new_context(pool, chromium, {})
+    firefox_context = release_new_context(pool, firefox, {})
+
+    pool.close_all(chromium)
+
+    assert chromium_context.closed and not firefox_context.closed
+    assert pool.acquire(chromium, {}) is None
+    assert pool.acquire(firefox, {}) is firefox_context
+
+
+def test_reset_restores_the_storage_state(tmp_path: Path):
+    state = {
+        'cookies': [{'name': 'consent', 'value': 'yes', 'domain': '.airbnb.com', 'path': '/'}],
+        'origins': [{'origin': 'https://www.airbnb.com', 'localStorage': [{'name': 'seen', 'value': '1'}]}]
+    }
+    storage_state = tmp_path / 'state.json'
+    storage_state.write_text(json.dumps(state))
+
+    pool = ContextPool()
+    browser = FakeBrowser()
+    context = FakeContext(browser)
+    page = FakePage()
+    context.pages.append(page)
+    context.cookies.append({'name': 'session', 'value': 'from-the-test'})
+    pool.track(browser, {'storage_state': storage_state}, context, lambda p: None)
+
+    pool.release(context, failed=False)
+
+    assert context.cookies == state['cookies']
+    assert page.evaluated[0][1] == state['origins']
+    assert page.closed
+    assert pool.acquire(browser, {'storage_state': storage_state}) is context
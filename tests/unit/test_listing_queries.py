@@ -0,0 +1,29 @@
+from typing import Iterator
+from src.utils.listing_queries import top_k, stop_when
+
+
+class Listing:
+    def __init__(self, rating: float):
+        self.rating = rating
+
+
+def test_stop_when_closes_its_source_when_stopping():
+    cleaned_up = []
+
+    def listings() -> Iterator[Listing]:
+        try:
+            for rating in (4.5, 5.0, 4.9, 4.8):
+                yield Listing(rating)
+        finally:
+            cleaned_up.append(True)
+
+    highest = top_k(stop_when(listings(), lambda listing: listing.rating >= 5), 1)
+
+    assert [listing.rating for listing in highest] == [5.0]
+    assert cleaned_up == [True]
+
+
+def test_stop_when_accepts_any_iterable():
+    listings = [Listing(rating) for rating in (4.5, 5.0, 4.9)]
+
+    assert [listing.rating for listing in stop_when(listings, lambda listing: listing.rating >= 5)] == [4.5, 5.0]
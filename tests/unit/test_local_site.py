@@ -0,0 +1,37 @@
+import gc
+import logging
+import socket
+import pytest
+import warnings
+import http.client
+from urllib.parse import urlsplit
+from src.local_site import LocalAirbnbServer
+
+
+def test_stop_closes_keep_alive_connections(caplog: pytest.LogCaptureFixture):
+    server = LocalAirbnbServer()
+    url = urlsplit(server.start())
+    connection = http.client.HTTPConnection(url.hostname, url.port)
+    connection.request('GET', '/')
+    assert connection.getresponse().read()
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        server.stop()
+        gc.collect()
+
+    assert server._thread is None
+    assert not server._connections
+    assert not caught
+    assert not [record for record in caplog.records if record.levelno >= logging.WARNING]
+    connection.close()
+
+
+def test_start_raises_when_the_port_is_taken():
+    with socket.socket() as taken:
+        taken.bind(('127.0.0.1', 0))
+        taken.listen()
+        server = LocalAirbnbServer(port=taken.getsockname()[1])
+
+        with pytest.raises(RuntimeError, match='failed to start'):
+            server.start()
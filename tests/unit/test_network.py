@@ -0,0 +1,83 @@
+from typing import Any
+from playwright.sync_api import Error
+from src.extended_pytest_playwright.network import ResourceBlocker, NetworkSummary, NETWORK_PROPERTY
+
+
+class FakeRequest:
+    def __init__(self, body_size: int | None):
+        self.body_size = body_size
+
+    def sizes(self) -> dict[str, int]:
+        if self.body_size is None:
+            raise Error('Target page, context or browser has been closed')
+        return {'responseBodySize': self.body_size}
+
+
+class FakeResponse:
+    def __init__(self, headers: dict[str, str], body_size: int | None = None):
+        self.headers = headers
+        self.request = FakeRequest(body_size)
+
+
+class FakeContext:
+    def remove_listener(self, event: str, handler: Any) -> None:
+        pass
+
+    def unroute(self, url: str, handler: Any) -> None:
+        pass
+
+
+class FakeReport:
+    when = 'teardown'
+
+    def __init__(self, summary: dict[str, Any]):
+        self.user_properties = [(NETWORK_PROPERTY, summary)]
+
+
+class FakeTerminalReporter:
+    def __init__(self):
+        self.lines: list[str] = []
+
+    def write_sep(self, sep: str, title: str) -> None:
+        self.lines.append(title)
+
+    def write_line(self, line: str) -> None:
+        self.lines.append(line)
+
+
+def test_responses_without_content_length_are_sized_at_the_end():
+    blocker = ResourceBlocker([], [])
+    blocker.on_response(FakeResponse({'content-length': '1000'}))
+    chunked = FakeResponse({'transfer-encoding': 'chunked'}, body_size=3000)
+    blocker.on_response(chunked)
+    blocker.on_request_finished(chunked.request)
+
+    assert blocker.transferred_bytes == 1000
+
+    blocker.detach(FakeContext())
+
+    assert blocker.summary() == {
+        'blocked_requests': {},
+        'allowed_requests': 2,
+        'transferred_bytes': 4000,
+        'unsized_responses': 0
+    }
+
+
+def test_summary_is_a_lower_bound_when_a_response_could_not_be_sized():
+    blocker = ResourceBlocker(['image'], [])
+    blocker.on_response(FakeResponse({'content-length': str(1024 ** 2)}))
+    # one gone before it could be sized, one still loading
+    gone = FakeResponse({})
+    blocker.on_response(gone)
+    blocker.on_request_finished(gone.request)
+    blocker.on_response(FakeResponse({}, body_size=10))
+    blocker.detach(FakeContext())
+    summary = NetworkSummary()
+    summary.add_report(FakeReport(blocker.summary()))
+    terminalreporter = FakeTerminalReporter()
+
+    summary.write_terminal_summary(terminalreporter)
+
+    assert summary.unsized_responses == 2
+    assert terminalreporter.lines[-1] == 'allowed requests: 3, transferred: at least 1.0 MB'
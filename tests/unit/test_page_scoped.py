@@ -0,0 +1,39 @@
+import gc
+import weakref
+from src.utils.page_scoped import PageScoped, get_page_scoped
+
+
+class FakePage:
+    pass
+
+
+class Component:
+    def __init__(self, page: FakePage):
+        self.page = page
+
+
+class PageObject:
+    component = PageScoped(Component)
+
+    def __init__(self, page: FakePage):
+        self.page = page
+
+
+def test_page_objects_share_one_instance_per_page():
+    page = FakePage()
+
+    assert PageObject(page).component is PageObject(page).component
+    assert get_page_scoped(page, Component) is PageObject(page).component
+    assert PageObject(FakePage()).component is not PageObject(page).component
+
+
+def test_pages_are_collected_with_their_instances():
+    pages = []
+    for _ in range(100):
+        page = FakePage()
+        assert PageObject(page).component.page is page
+        pages.append(weakref.ref(page))
+    del page
+    gc.collect()
+
+    assert not any(page() for page in pages)
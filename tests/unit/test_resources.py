@@ -0,0 +1,99 @@
+import os
+import sys
+import shutil
+import pytest
+import subprocess
+from pathlib import Path
+from typing import Any, Generator
+from src.extended_pytest_playwright import resources
+from src.extended_pytest_playwright.resources import (
+    get_engine_rss_mb,
+    get_process_tree_rss_mb,
+    calculate_auto_workers,
+    measure_engine_rss,
+    flush_engine_rss,
+    load_engine_rss,
+    ENGINE_RSS_FILE_NAME
+)
+
+pytestmark = pytest.mark.skipif(not Path('/proc').is_dir(), reason='reads /proc')
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Generator[Path, None, None]:
+    # a copy of the python executable in its own folder stands in for a browser executable
+    executable = tmp_path / 'engine' / 'browser'
+    executable.parent.mkdir()
+    shutil.copy(sys.executable, executable)
+    process = subprocess.Popen([str(executable), '-c', 'import time; time.sleep(30)'])
+    yield executable
+    process.kill()
+    process.wait()
+
+
+def test_engine_rss_only_counts_the_engine_processes(engine: Path, tmp_path: Path):
+    other = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    try:
+        engine_rss = get_engine_rss_mb(str(engine))
+        tree_rss = get_process_tree_rss_mb(os.getpid())
+    finally:
+        other.kill()
+        other.wait()
+
+    assert 0 < engine_rss < tree_rss
+    assert get_engine_rss_mb(str(tmp_path / 'missing' / 'browser')) == 0
+
+
+@pytest.mark.parametrize('browser_affinity, expected', [(True, 4), (False, 2)])
+def test_auto_workers_per_worker_memory(browser_affinity: bool, expected: int):
+    workers = calculate_auto_workers(
+        browsers=['chromium', 'firefox'],
+        headed=False,
+        browser_affinity=browser_affinity,
+        engine_rss={'chromium': 500, 'firefox': 500},
+        cpu_count=8,
+        available_memory_mb=2500
+    )
+
+    assert workers == expected
+
+
+class FakeConfig:
+    def __init__(self, **options: Any):
+        self.options = options
+
+    def getoption(self, name: str) -> Any:
+        return self.options.get(name.lstrip('-').replace('-', '_'))
+
+
+class FakeBrowser:
+    class browser_type:
+        executable_path = '/opt/engines/chromium/chrome'
+
+
+@pytest.mark.parametrize('options', [
+    {'history_folder': 'pytest_reports'},
+    {'measure_engine_rss': True}
+])
+def test_engine_rss_is_only_measured_for_workers_auto(options: dict, monkeypatch: pytest.MonkeyPatch):
+    def fail(executable_path: str) -> float:
+        raise AssertionError('the processes were scanned')
+
+    monkeypatch.setattr(resources, 'get_engine_rss_mb', fail)
+
+    measure_engine_rss(FakeBrowser(), 'chromium', FakeConfig(**options))
+
+    assert not resources._measured_engine_rss
+
+
+def test_flush_engine_rss_keeps_the_last_lines(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(resources, 'get_engine_rss_mb', lambda executable_path: 100.0)
+    config = FakeConfig(history_folder=str(tmp_path), measure_engine_rss=True)
+
+    for _ in range(5):
+        measure_engine_rss(FakeBrowser(), 'chromium', config)
+        flush_engine_rss(str(tmp_path), max_lines=3)
+
+    assert len((tmp_path / ENGINE_RSS_FILE_NAME).read_text().splitlines()) == 3
+    assert load_engine_rss(tmp_path) == {'chromium': 100.0}
+    assert not list(tmp_path.glob('*.lock')) and not list(tmp_path.glob('*.tmp'))
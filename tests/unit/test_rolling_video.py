@@ -0,0 +1,63 @@
+import base64
+from typing import Any, Callable
+from src.extended_pytest_playwright.rolling_video import RollingScreencast
+
+
+class FakeCDPSession:
+    def __init__(self):
+        self.handlers: dict[str, Callable[[dict], None]] = {}
+
+    def on(self, event: str, handler: Callable[[dict], None]) -> None:
+        self.handlers[event] = handler
+
+    def send(self, method: str, params: Any = None) -> None:
+        pass
+
+    def frame(self, timestamp: float, data: bytes) -> None:
+        self.handlers['Page.screencastFrame']({
+            'sessionId': 1,
+            'metadata': {'timestamp': timestamp},
+            'data': base64.b64encode(data).decode()
+        })
+
+
+class FakeContext:
+    def __init__(self):
+        self.cdp = FakeCDPSession()
+
+    def new_cdp_session(self, page: Any) -> FakeCDPSession:
+        return self.cdp
+
+
+class FakePage:
+    def __init__(self):
+        self.context = FakeContext()
+
+
+def test_buffer_keeps_the_last_seconds_by_timestamp():
+    page = FakePage()
+    screencast = RollingScreencast(page, seconds=2, fps=5, max_width=800)
+
+    # a still page (one frame at 0s) and then a burst of changes
+    page.context.cdp.frame(0.0, b'still')
+    for index in range(20):
+        page.context.cdp.frame(10.0 + index * 0.2, f'burst-{index}'.encode())
+
+    frames = screencast._frames_at_fixed_rate()
+
+    # the last 2 seconds at 5 fps, plus the last frame itself
+    assert len(frames) == 11
+    assert frames[-1] == b'burst-19'
+    assert b'still' not in frames
+
+
+def test_a_long_still_frame_is_cut_at_the_window_start():
+    page = FakePage()
+    screencast = RollingScreencast(page, seconds=2, fps=5, max_width=800)
+
+    page.context.cdp.frame(0.0, b'still')
+    page.context.cdp.frame(30.0, b'changed')
+
+    frames = screencast._frames_at_fixed_rate()
+
+    assert frames == [b'still'] * 10 + [b'changed']
@@ -0,0 +1,254 @@
+import json
+import pytest
+from pathlib import Path
+from typing import Any, Optional
+from src.extended_pytest_playwright.scheduling import DurationScheduling, BrowserScheduling, load_historical_durations
+
+
+class FakeConfig:
+    def __init__(self, workers: int):
+        self.workers = workers
+
+    def getvalue(self, name: str) -> Any:
+        assert name == 'tx'
+        return [f'{self.workers}*popen']
+
+    def getoption(self, name: str) -> Any:
+        return None
+
+
+class FakeGateway:
+    def __init__(self, gateway_id: str):
+        self.id = gateway_id
+
+
+class FakeNode:
+    def __init__(self, gateway_id: str):
+        self.gateway = FakeGateway(gateway_id)
+        self.shutting_down = False
+        self.sent: list[int] = []
+
+    def send_runtest_some(self, indices: list[int]) -> None:
+        self.sent.extend(indices)
+
+    def shutdown(self) -> None:
+        self.shutting_down = True
+
+
+def start_scheduler(
+        scheduler_class: type,
+        nodeids: list[str],
+        workers: int,
+        durations: Optional[dict[str, float]] = None
+) -> tuple[Any, list[FakeNode]]:
+    scheduler = scheduler_class(FakeConfig(workers), durations=durations)
+    nodes = [FakeNode(f'gw{index}') for index in range(workers)]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, nodeids)
+    scheduler.schedule()
+    return scheduler, nodes
+
+
+def run_to_completion(scheduler: Any, nodes: list[FakeNode]) -> dict[str, list[str]]:
+    """completes the items the way xdist workers do, returns the nodeids run by each worker"""
+    ran = {node.gateway.id: [] for node in nodes}
+    while any(scheduler.node2pending[node] for node in nodes):
+        for node in nodes:
+            pending = scheduler.node2pending[node]
+            # a worker runs its last item only once it got another one or was shut down
+            if len(pending) > 1 or (pending and node.shutting_down):
+                index = pending[0]
+                ran[node.gateway.id].append(scheduler.collection[index])
+                scheduler.mark_test_complete(node, index)
+    return ran
+
+
+def names(scheduler: Any, indices: list[int]) -> list[str]:
+    return [scheduler.collection[index] for index in indices]
+
+
+def write_report(folder: Path, tests: list[dict[str, Any]]) -> None:
+    folder.mkdir(parents=True)
+    (folder / 'report.json').write_text(json.dumps({'tests': tests}))
+
+
+def report_test(nodeid: str, call: float, outcome: str = 'passed') -> dict[str, Any]:
+    return {
+        'nodeid': nodeid,
+        'outcome': outcome,
+        'setup': {'duration': 0.5},
+        'call': {'duration': call},
+        'teardown': {'duration': 0.5}
+    }
+
+
+# ------------------------------------------------ HISTORY -------------------------------------------------------------
+
+def test_load_historical_durations_finds_nested_report_folders(tmp_path: Path):
+    # test_name "tests/test_airbnb_flows.py" nests the run folder under test-report-tests/
+    write_report(
+        tmp_path / 'test-report-tests' / 'test_airbnb_flows.py-18-10-2026_10-00-00',
+        [report_test('tests/test_a.py::test_a', call=4), report_test('tests/test_a.py::test_b', call=1)]
+    )
+    write_report(tmp_path / 'test-report-merged-18-10-2026_11-00-00', [report_test('tests/test_a.py::test_a', call=2)])
+
+    assert load_historical_durations(tmp_path) == {
+        'tests/test_a.py::test_a': 4.0,
+        'tests/test_a.py::test_b': 2.0
+    }
+
+
+def test_load_historical_durations_skips_failed_tests(tmp_path: Path):
+    write_report(tmp_path / 'test-report-run', [report_test('tests/test_a.py::test_a', call=9, outcome='failed')])
+
+    assert load_historical_durations(tmp_path) == {}
+
+
+def test_load_historical_durations_without_history(tmp_path: Path):
+    assert load_historical_durations(tmp_path / 'missing') == {}
+
+
+# ------------------------------------------------ DURATION SCHEDULING -------------------------------------------------
+
+def test_duration_scheduling_sends_longest_first():
+    nodeids = ['t_short', 't_longest', 't_long', 't_medium']
+    durations = {'t_short': 1, 't_longest': 5, 't_long': 3, 't_medium': 2}
+
+    scheduler, (first, second) = start_scheduler(DurationScheduling, nodeids, workers=2, durations=durations)
+
+    # one item per worker per round, the two longest start on different workers
+    assert names(scheduler, first.sent) == ['t_longest', 't_medium']
+    assert names(scheduler, second.sent) == ['t_long', 't_short']
+
+
+def test_duration_scheduling_estimates_unknown_tests_with_the_average():
+    nodeids = ['t_new', 't_slow', 't_fast']
+    durations = {'t_slow': 10, 't_fast': 2}
+
+    scheduler, (node,) = start_scheduler(DurationScheduling, nodeids, workers=1, durations=durations)
+
+    assert scheduler.estimate('t_new') == 6
+    assert names(scheduler, node.sent + scheduler.pending) == ['t_slow', 't_new', 't_fast']
+
+
+def test_duration_scheduling_without_history_keeps_collection_order():
+    nodeids = [f't_{index}' for index in range(4)]
+
+    scheduler, (first, second) = start_scheduler(DurationScheduling, nodeids, workers=2)
+
+    assert names(scheduler, first.sent) == ['t_0', 't_2']
+    assert names(scheduler, second.sent) == ['t_1', 't_3']
+
+
+@pytest.mark.parametrize('workers', [1, 2, 3])
+def test_duration_scheduling_runs_every_item_once(workers: int):
+    nodeids = [f't_{index}' for index in range(7)]
+    durations = {nodeid: index for index, nodeid in enumerate(nodeids)}
+
+    scheduler, nodes = start_scheduler(DurationScheduling, nodeids, workers=workers, durations=durations)
+    ran = run_to_completion(scheduler, nodes)
+
+    assert sorted(nodeid for items in ran.values() for nodeid in items) == sorted(nodeids)
+    assert all(node.shutting_down for node in nodes)
+    assert not scheduler.pending
+
+
+# ------------------------------------------------ BROWSER SCHEDULING --------------------------------------------------
+
+def browser_nodeids(tests: int, browsers: tuple[str, ...]) -> list[str]:
+    # the conftest renames test[chromium] to test_chromium
+    return [f'tests/test_a.py::test_{index}_{browser}' for index in range(tests) for browser in browsers]
+
+
+def browsers_run_by(ran: dict[str, list[str]]) -> dict[str, set[str]]:
+    return {worker: {nodeid.rsplit('_', 1)[1] for nodeid in items} for worker, items in ran.items()}
+
+
+def test_browser_scheduling_pins_one_browser_per_worker():
+    nodeids = browser_nodeids(4, ('chromium', 'firefox', 'webkit'))
+
+    scheduler, nodes = start_scheduler(BrowserScheduling, nodeids, workers=3)
+    ran = run_to_completion(scheduler, nodes)
+
+    assert sorted(browsers_run_by(ran).values(), key=sorted) == [{'chromium'}, {'firefox'}, {'webkit'}]
+    assert sorted(nodeid for items in ran.values() for nodeid in items) == sorted(nodeids)
+    assert all(node.shutting_down for node in nodes)
+
+
+def test_browser_scheduling_gives_spare_workers_to_the_largest_group():
+    nodeids = browser_nodeids(4, ('chromium', 'firefox'))
+    durations = {nodeid: 10 if nodeid.endswith('chromium') else 1 for nodeid in nodeids}
+
+    scheduler, nodes = start_scheduler(BrowserScheduling, nodeids, workers=3, durations=durations)
+
+    assert sorted(groups for groups in scheduler.node2groups.values()) == [['chromium'], ['chromium'], ['firefox']]
+
+    ran = run_to_completion(scheduler, nodes)
+    assert sorted(nodeid for items in ran.values() for nodeid in items) == sorted(nodeids)
+
+
+def test_browser_scheduling_packs_whole_groups_with_fewer_workers():
+    nodeids = browser_nodeids(3, ('chromium', 'firefox', 'webkit'))
+
+    scheduler, nodes = start_scheduler(BrowserScheduling, nodeids, workers=2)
+    ran = run_to_completion(scheduler, nodes)
+
+    runs = browsers_run_by(ran)
+    # every browser runs on a single worker
+    assert sorted(len(browsers) for browsers in runs.values()) == [1, 2]
+    assert set.union(*runs.values()) == {'chromium', 'firefox', 'webkit'}
+
+
+def test_browser_scheduling_sends_longest_first_inside_a_group():
+    nodeids = browser_nodeids(3, ('chromium',))
+    durations = {nodeid: index for index, nodeid in enumerate(nodeids)}
+
+    scheduler, nodes = start_scheduler(BrowserScheduling, nodeids, workers=1, durations=durations)
+    ran = run_to_completion(scheduler, nodes)
+
+    assert ran['gw0'] == list(reversed(nodeids))
+
+
+def test_browser_scheduling_reassigns_the_group_of_a_crashed_worker():
+    nodeids = browser_nodeids(3, ('chromium', 'firefox'))
+
+    scheduler, nodes = start_scheduler(BrowserScheduling, nodeids, workers=2)
+    crashed = next(node for node in nodes if scheduler.node2groups[node] == ['firefox'])
+    survivor = next(node for node in nodes if node is not crashed)
+
+    crash_item = scheduler.remove_node(crashed)
+    nodes.remove(crashed)
+    ran = run_to_completion(scheduler, nodes)
+
+    assert crash_item is not None
+    assert set(ran[survivor.gateway.id]) == set(nodeids) - {crash_item}
+    assert survivor.shutting_down
+
+
+def test_browser_scheduling_shuts_down_a_late_node_without_work():
+    nodeids = browser_nodeids(2, ('chromium',))
+
+    scheduler, (node,) = start_scheduler(BrowserScheduling, nodeids, workers=1)
+    assert names(scheduler, node.sent) == nodeids
+
+    late = FakeNode('gw1')
+    scheduler.add_node(late)
+    scheduler.add_node_collection(late, nodeids)
+    scheduler.schedule()
+
+    assert late.shutting_down and not late.sent
+
+
+def test_browser_scheduling_gives_a_late_node_the_largest_group_left():
+    nodeids = browser_nodeids(4, ('chromium',)) + browser_nodeids(1, ('firefox',))
+
+    scheduler, _ = start_scheduler(BrowserScheduling, nodeids, workers=1)
+
+    late = FakeNode('gw1')
+    scheduler.add_node(late)
+    scheduler.add_node_collection(late, nodeids)
+    scheduler.schedule()
+
+    assert scheduler.node2groups[late] == ['chromium']
+    assert not late.shutting_down and late.sent
@@ -0,0 +1,36 @@
+import json
+from pathlib import Path
+from src.utils.step_timing import StepTimer, load_step_durations, percentile, STEPS_PROPERTY
+
+
+def test_step_timer_nests_inner_steps():
+    timer = StepTimer()
+    timer.on_step_start('ResultsPage.open', 0)
+    timer.on_step_start('ResultsPage.wait', 1)
+    timer.on_step_end('ResultsPage.wait', 1, None)
+    timer.on_step_end('ResultsPage.open', 0, ValueError())
+
+    assert [step['name'] for step in timer.steps] == ['ResultsPage.open']
+    assert timer.steps[0]['status'] == 'failed'
+    assert [step['name'] for step in timer.steps[0]['children']] == ['ResultsPage.wait']
+
+
+def test_load_step_durations_from_nested_run_folders(tmp_path: Path):
+    run_folder = tmp_path / 'test-report-tests' / 'test_airbnb_flows.py-18-10-2026_10-00-00'
+    run_folder.mkdir(parents=True)
+    steps = [{'name': 'ResultsPage.open', 'ms': 120, 'status': 'passed', 'children': [
+        {'name': 'ResultsPage.wait', 'ms': 80, 'status': 'passed', 'children': []}
+    ]}]
+    (run_folder / 'report.json').write_text(json.dumps({'tests': [
+        {'nodeid': 'tests/test_airbnb_flows.py::test_a_chromium', 'user_properties': [{STEPS_PROPERTY: steps}]}
+    ]}))
+
+    assert load_step_durations([str(tmp_path)]) == {
+        ('ResultsPage.open', 'chromium'): [120],
+        ('ResultsPage.wait', 'chromium'): [80]
+    }
+
+
+def test_percentile_nearest_rank():
+    assert percentile([10, 20, 30, 40], 50) == 20
+    assert percentile([10, 20, 30, 40], 95) == 40
@@ -0,0 +1,25 @@
+import pytest
+from typing import Any
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from src.utils.waits import wait_for_stable_count, CLEAR_STABLE_COUNT_SCRIPT
+
+
+class FakePage:
+    def __init__(self):
+        self.evaluated: list[tuple[str, Any]] = []
+
+    def wait_for_function(self, expression: str, arg: Any, polling: int, timeout: float | None) -> None:
+        self.token = arg[2]
+        raise PlaywrightTimeoutError('Timeout 10ms exceeded.')
+
+    def evaluate(self, expression: str, arg: Any) -> None:
+        self.evaluated.append((expression, arg))
+
+
+def test_a_timed_out_wait_clears_its_state():
+    page = FakePage()
+
+    with pytest.raises(PlaywrightTimeoutError):
+        wait_for_stable_count(page, '[itemprop="itemListElement"]', timeout=10)
+
+    assert page.evaluated == [(CLEAR_STABLE_COUNT_SCRIPT, page.token)]